@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status as fast_status, Query
 from core.auth import get_current_user_or_ak
 from core.db import DB
+from core.async_db import ADB
 from core.models.base import DATA_STATUS
 from core.models.article import Article,ArticleBase
 from sqlalchemy import and_, or_, desc
 from .base import success_response, error_response
 from core.config import cfg
-from apis.base import format_search_kw
+from apis.base import format_search_kw, order_by_relevance, keyset_paginate, next_cursor
 from core.print import print_warning, print_info, print_error, print_success
-from core.cache import clear_cache_pattern
+from core.cache import clear_cache_pattern, count_cache
 from tools.fix import fix_article
 router = APIRouter(prefix=f"/articles", tags=["文章管理"])
 
@@ -28,6 +29,10 @@ async def clean_orphan_articles(
         deleted_count = session.query(Article)\
             .filter(~Article.mp_id.in_(subquery))\
             .delete(synchronize_session=False)
+        from core.content_store import STORE
+        from core.feed_stats import FEED_STATS
+        STORE.prune(session.connection())
+        FEED_STATS.prune(session.connection())
         
         session.commit()
         
@@ -35,6 +40,7 @@ async def clean_orphan_articles(
         clear_cache_pattern("articles_list")
         clear_cache_pattern("home_page")
         clear_cache_pattern("tag_detail")
+        count_cache.invalidate()
         
         return success_response({
             "message": "清理无效文章成功",
@@ -104,6 +110,7 @@ async def clean_duplicate(
     try:
         from tools.clean import clean_duplicate_articles
         (msg, deleted_count) =clean_duplicate_articles()
+        count_cache.invalidate()
         return success_response({
             "message": msg,
             "deleted_count": deleted_count
@@ -127,12 +134,11 @@ async def get_articles(
     search: str = Query(None),
     mp_id: str = Query(None),
     has_content:bool=Query(False),
+    cursor: str = Query(None, description="分页游标，传入后忽略offset"),
+    sort: str = Query("publish_time", description="排序方式: publish_time, relevance（仅搜索时有效）"),
     current_user: dict = Depends(get_current_user_or_ak)
 ):
-    session = DB.get_session()
-    try:
-      
-        
+    def _load(session):
         # 构建查询条件
         query = session.query(ArticleBase)
         if has_content:
@@ -147,17 +153,30 @@ async def get_articles(
             query = query.filter(
                format_search_kw(search)
             )
-        
-        # 获取总数
-        total = query.count()
-        query= query.order_by(Article.publish_time.desc()).offset(offset).limit(limit)
+    
+        # 获取总数（带缓存，未筛选时可按配置使用估算值）
+        estimate_func = None
+        if not (status or mp_id or search) and cfg.get("cache.count.estimate", False):
+            # 在当前会话的连接上估算，不占用同步引擎
+            estimate_func = lambda: DB.estimate_active_articles(session.connection())
+        total = count_cache.get_or_count("articles", {"status": status, "mp_id": mp_id, "search": search},
+                                         query.count, mp_ids=mp_id, estimate_func=estimate_func)
+        ranked = order_by_relevance(query, search) if search and sort == "relevance" else None
+        if ranked is not None:
+            # 按相关度排序时不支持游标分页
+            query = ranked.offset(offset)
+        else:
+            query = keyset_paginate(query, cursor)
+            if not cursor:
+                query = query.offset(offset)
+        query = query.limit(limit)
         # query= query.order_by(Article.id.desc()).offset(offset).limit(limit)
         # 分页查询（按发布时间降序）
         articles = query.all()
-        
+    
         # 打印生成的 SQL 语句（包含分页参数）
         print_warning(query.statement.compile(compile_kwargs={"literal_binds": True}))
-                       
+                   
         # 查询公众号名称
         from core.models.feed import Feed
         mp_names = {}
@@ -165,19 +184,31 @@ async def get_articles(
             if article.mp_id and article.mp_id not in mp_names:
                 feed = session.query(Feed).filter(Feed.id == article.mp_id).first()
                 mp_names[article.mp_id] = feed.mp_name if feed else "未知公众号"
-        
+    
+        # 正文存放在 article_contents，需要时一次性加载
+        if has_content:
+            from core.content_store import load_bodies
+            load_bodies(articles)
+    
         # 合并公众号名称到文章列表
         article_list = []
         for article in articles:
-            article_dict = article.__dict__
+            article_dict = {k: v for k, v in article.__dict__.items() if k != "_bodies"}
+            if has_content:
+                article_dict["content"], article_dict["content_html"] = article.content, article.content_html
             article_dict["mp_name"] = mp_names.get(article.mp_id, "未知公众号")
             article_list.append(article_dict)
-        
+    
         from .base import success_response
         return success_response({
             "list": article_list,
-            "total": total
+            "total": total,
+            "next_cursor": next_cursor(articles, limit) if ranked is None else None
         })
+
+    try:
+        # 在异步会话上执行查询，不阻塞事件循环
+        return await ADB.run_sync(_load)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -262,7 +293,7 @@ async def get_next_article(
     session = DB.get_session()
     try:
         # 获取当前文章的发布时间
-        current_article = session.query(Article).filter(Article.id == article_id).first()
+        current_article = session.query(Article).filter(Article.id == article_id).options(Article.brief()).first()
         if not current_article:
             raise HTTPException(
                 status_code=fast_status.HTTP_404_NOT_FOUND,
@@ -308,7 +339,7 @@ async def get_prev_article(
     session = DB.get_session()
     try:
         # 获取当前文章的发布时间
-        current_article = session.query(Article).filter(Article.id == article_id).first()
+        current_article = session.query(Article).filter(Article.id == article_id).options(Article.brief()).first()
         if not current_article:
             raise HTTPException(
                 status_code=fast_status.HTTP_404_NOT_FOUND,
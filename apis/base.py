@@ -25,6 +25,68 @@ def error_response(code: int, message: str, data=None):
 from sqlalchemy import and_,or_
 from core.models import Article
 def format_search_kw(keyword: str):
+    """
+    关键词搜索条件：已建立全文索引时检索标题、摘要和正文，否则回退为标题 LIKE 匹配
+    多个关键词用空格、-、| 分隔，任一匹配即可
+    """
+    from core.search import SEARCH
+    if SEARCH.available():
+        return SEARCH.condition(keyword)
     words = keyword.replace("-"," ").replace("|"," ").split(" ")
     rule = or_(*[Article.title.like(f"%{w}%") for w in words])
-    return rule
\ No newline at end of file
+    return rule
+
+def order_by_relevance(query, keyword: str):
+    """按搜索相关度排序，未建立全文索引时返回None，由调用方使用默认排序"""
+    from core.search import SEARCH
+    if not SEARCH.available():
+        return None
+    return SEARCH.order_by_rank(query, keyword)
+
+def encode_cursor(publish_time: int, article_id: str) -> str:
+    """将 (publish_time, id) 编码为分页游标"""
+    import base64, json
+    raw = json.dumps([publish_time, article_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """解析分页游标，返回 (publish_time, id)，游标无效时返回400"""
+    import base64, json
+    from fastapi import HTTPException
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        publish_time, article_id = json.loads(raw)
+        return int(publish_time), str(article_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response(code=40001, message="无效的分页游标")
+        )
+
+def keyset_paginate(query, cursor: str = None, desc: bool = True):
+    """
+    按 (publish_time, id) 排序，并从游标位置继续查询
+    配合 (mp_id, status, publish_time, id) 索引，翻页耗时与页码无关
+    publish_time 为空的文章无法用游标定位，游标分页和偏移分页都不返回这些文章，两种翻页结果一致
+    """
+    query = query.filter(Article.publish_time.isnot(None))
+    if desc:
+        query = query.order_by(Article.publish_time.desc(), Article.id.desc())
+    else:
+        query = query.order_by(Article.publish_time.asc(), Article.id.asc())
+    if cursor:
+        publish_time, article_id = decode_cursor(cursor)
+        if desc:
+            query = query.filter(Article.publish_time <= publish_time,
+                                 or_(Article.publish_time < publish_time, Article.id < article_id))
+        else:
+            query = query.filter(Article.publish_time >= publish_time,
+                                 or_(Article.publish_time > publish_time, Article.id > article_id))
+    return query
+
+def next_cursor(articles: list, limit: int):
+    """最后一页返回None，否则返回下一页游标"""
+    if len(articles) < limit or not articles:
+        return None
+    last = articles[-1]
+    return encode_cursor(last.publish_time, last.id)
\ No newline at end of file
@@ -329,28 +329,44 @@ async def get_feeds(
     子节点从父节点拉取公众号数据
     
     需要级联认证
+    响应格式与 success_response 相同，公众号按批流式读取并逐条输出，内存占用与公众号数量无关
     """
-    session = DB.get_session()
+    from fastapi.responses import StreamingResponse
+    from sqlalchemy import select
+    from core.db import stream_batches
+    t = Feed.__table__
+    query = select(t.c.id, t.c.faker_id, t.c.mp_name, t.c.mp_cover, t.c.mp_intro, t.c.status,
+                   t.c.created_at, t.c.updated_at)
     try:
-        feeds = session.query(Feed).all()
-        
-        feed_list = []
-        for feed in feeds:
-            feed_list.append({
-                "id": feed.id,
-                "faker_id": feed.faker_id,
-                "mp_name": feed.mp_name,
-                "mp_cover": feed.mp_cover,
-                "mp_intro": feed.mp_intro,
-                "status": feed.status,
-                "created_at": feed.created_at.isoformat() if feed.created_at else None,
-                "updated_at": feed.updated_at.isoformat() if feed.updated_at else None
-            })
-        
-        return success_response(feed_list)
+        conn = DB.get_engine().connect()
     except Exception as e:
         return error_response(code=500, message=str(e))
 
+    def _generate():
+        try:
+            yield '{"code": 0, "message": "success", "data": ['
+            first = True
+            for rows in stream_batches(query, batch_size=500, conn=conn):
+                chunk = []
+                for feed in rows:
+                    chunk.append(json.dumps({
+                        "id": feed.id,
+                        "faker_id": feed.faker_id,
+                        "mp_name": feed.mp_name,
+                        "mp_cover": feed.mp_cover,
+                        "mp_intro": feed.mp_intro,
+                        "status": feed.status,
+                        "created_at": feed.created_at.isoformat() if feed.created_at else None,
+                        "updated_at": feed.updated_at.isoformat() if feed.updated_at else None
+                    }, ensure_ascii=False))
+                yield ("" if first else ",") + ",".join(chunk)
+                first = False
+            yield "]}"
+        finally:
+            conn.close()
+
+    return StreamingResponse(_generate(), media_type="application/json")
+
 
 @router.get("/message-tasks", summary="获取父节点消息任务")
 async def get_message_tasks(
@@ -712,7 +728,6 @@ async def upload_articles(
         allocation_id: 任务分配ID
         articles: 文章列表
     """
-    from core.models.article import Article
     from core.models.cascade_task_allocation import CascadeTaskAllocation
     
     session = DB.get_session()
@@ -725,36 +740,24 @@ async def upload_articles(
         if not allocation:
             return error_response(code=404, message="分配记录不存在")
         
-        # 保存文章到数据库
-        new_count = 0
-        for article_data in req.articles:
-            # 检查文章是否已存在
-            existing = session.query(Article).filter(
-                Article.id == article_data.get("id")
-            ).first()
-            
-            if not existing:
-                # 创建新文章
-                article = Article(
-                    id=article_data.get("id"),
-                    mp_id=article_data.get("mp_id"),
-                    title=article_data.get("title"),
-                    pic_url=article_data.get("pic_url"),
-                    url=article_data.get("url"),
-                    description=article_data.get("description"),
-                    content=article_data.get("content"),
-                    status=article_data.get("status", 1),
-                    publish_time=article_data.get("publish_time"),
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                session.add(article)
-                new_count += 1
-            else:
-                # 更新现有文章
-                existing.title = article_data.get("title", existing.title)
-                existing.content = article_data.get("content", existing.content)
-                existing.updated_at = datetime.utcnow()
+        # 批量保存文章到数据库，已存在的文章更新标题和内容
+        now = datetime.utcnow()
+        rows = [{
+            "id": article_data.get("id"),
+            "mp_id": article_data.get("mp_id"),
+            "title": article_data.get("title"),
+            "pic_url": article_data.get("pic_url"),
+            "url": article_data.get("url"),
+            "description": article_data.get("description"),
+            "content": article_data.get("content"),
+            "status": article_data.get("status", 1),
+            "publish_time": article_data.get("publish_time"),
+            "created_at": now,
+            "updated_at": now
+        } for article_data in req.articles]
+        result = DB.upsert_articles(rows, update_fields=("title", "content", "updated_at"), prefix_id=False,
+                                    keep_status=True)
+        new_count = len(result["inserted"])
         
         # 更新分配记录的文章统计
         allocation.article_count = len(req.articles)
@@ -856,13 +859,14 @@ async def dispatch_tasks(
             query = query.filter(MessageTask.id == task_id)
         tasks = query.all()
         
+        from core.tag_feeds import TASK_FEEDS
+        members = TASK_FEEDS.feed_map(session, [task.id for task in tasks])
         task_info = []
         for task in tasks:
-            mps_list = json.loads(task.mps_id) if task.mps_id else []
             task_info.append({
                 "id": task.id,
                 "name": task.name,
-                "mp_count": len(mps_list)
+                "mp_count": len(members[task.id])
             })
         
         # 执行分发
@@ -1010,8 +1014,7 @@ async def get_feed_status(
     - 最后执行的任务状态和执行节点
     """
     from core.models.cascade_task_allocation import CascadeTaskAllocation
-    from core.models.article import Article
-    from sqlalchemy import func
+    from core.feed_stats import FEED_STATS
     
     session = DB.get_session()
     try:
@@ -1025,20 +1028,14 @@ async def get_feed_status(
         
         # 再分页
         feeds = query.limit(limit).offset(offset).all()
+        stats = FEED_STATS.get_many(session, [feed.id for feed in feeds])
         
         feed_status_list = []
         for feed in feeds:
-            # 获取文章数量
-            article_count = session.query(Article).filter(
-                Article.mp_id == feed.id
-            ).count()
-            
-            # 获取最近一篇文章的时间和来源节点
-            latest_article = session.query(Article).filter(
-                Article.mp_id == feed.id
-            ).order_by(Article.created_at.desc()).first()
-            
-            latest_article_time = latest_article.created_at.isoformat() if latest_article and latest_article.created_at else None
+            # 文章数量和最近一次采集到文章的时间
+            article_count = stats[feed.id]["article_count"]
+            last_gather_at = stats[feed.id]["last_gather_at"]
+            latest_article_time = datetime.fromtimestamp(last_gather_at).isoformat() if last_gather_at else None
             
             # 获取该公众号相关的最近完成的任务分配（包含节点信息）
             recent_allocation = session.query(CascadeTaskAllocation).filter(
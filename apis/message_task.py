@@ -196,10 +196,11 @@ async def run_message_task(
         if not tasks:
             raise HTTPException(status_code=404, detail="Message task not found or has been deactivated")
         else:
-            import json
+            from core.tag_feeds import TASK_FEEDS
+            session = DB.get_session()
             for task in tasks:
                 try:
-                    ids=json.loads(task.mps_id)
+                    ids=[{"id": feed.id, "mp_name": feed.mp_name} for feed in TASK_FEEDS.feeds(session, task.id)]
                     count+=len(ids)
                     mps['count']=count
                     mps['list'].append(ids)
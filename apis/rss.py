@@ -1,14 +1,26 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, Request,Response
 from fastapi import status
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from starlette.datastructures import URL
 from core.db import DB
-from core.rss import RSS
+from core.async_db import ADB
+from core.content_store import load_bodies
+from core.tag_feeds import TAG_FEEDS
+from sqlalchemy import false
+from core.rss import RSS, RSS_FLIGHTS
+from core.rss_version import data_version
+from core.rss_prewarm import RSS_PREWARM
 from core.models.feed import Feed
 import json
+import hashlib
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
 from .base import success_response, error_response
 from core.auth import get_current_user
 from core.config import cfg
-from apis.base import format_search_kw
+from apis.base import format_search_kw, keyset_paginate, next_cursor, decode_cursor
 from core.print import print_error,print_success
 def verify_rss_access(current_user: dict = Depends(get_current_user)):
     """
@@ -26,6 +38,76 @@ def verify_rss_access(current_user: dict = Depends(get_current_user)):
         )
     return current_user
 
+# 全文输出时每批加载正文的文章数
+RSS_BODY_BATCH = 10
+
+def _render_options() -> tuple:
+    """影响输出内容的 RSS 配置，计入 ETag"""
+    return tuple(cfg.get(f"rss.{key}", None) for key in
+                 ("full_context", "add_cover", "cdata", "local", "title", "description", "cover"))
+
+def _validators(etag: str, last_modified: int, headers: dict = None) -> dict:
+    """响应头加上 ETag / Last-Modified"""
+    result = dict(headers or {})
+    result["ETag"] = etag
+    result["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    return result
+
+def _last_modified(version, etag: str, cached: dict = None) -> int:
+    """
+    Last-Modified 取缓存记录的时间，数据版本变化时取最大更新时间；
+    删除文章只改变文章数、不改变更新时间，此时用当前时间（至少比缓存记录晚1秒），保证 Last-Modified 随版本变大
+    """
+    if cached and cached.get("etag") == etag:
+        return cached["last_modified"]
+    if cached and version.last_modified <= cached.get("last_modified", 0):
+        return max(int(time.time()), cached["last_modified"] + 1)
+    return version.last_modified
+
+def _not_modified(request: Request, etag: str, last_modified: int, check_date: bool = True) -> bool:
+    """
+    条件请求命中（If-None-Match 优先，其次 If-Modified-Since）时返回True
+    check_date 为False（缓存不是当前版本生成的，Last-Modified 不可靠）时不按 If-Modified-Since 返回304
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and check_date:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _cache_response(request: Request, rss: RSS, content: str, headers: dict = None, media_type: str = None) -> Response:
+    """输出缓存文件，客户端支持压缩时直接输出生成时写入的预压缩文件"""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    encoding = rss.accept_encoding(request.headers.get("accept-encoding"))
+    data = rss.get_cache_encoded(encoding) if encoding else None
+    if data is not None:
+        headers["Content-Encoding"] = encoding
+        return Response(content=data, media_type=media_type or rss.get_type(), headers=headers)
+    return Response(content=content, media_type=media_type or rss.get_type(), headers=headers)
+
+class _FlightResponse(StreamingResponse):
+    """
+    输出结束（含中途断开）时结束合并，成功时已由 on_complete 标记（done 以第一次调用为准）；
+    在 __call__ 的 finally 中结束，客户端在开始输出前断开、生成器没有执行时等待方也不必等到超时
+    """
+    def __init__(self, content, flight=None, **kwargs):
+        super().__init__(content, **kwargs)
+        self.flight = flight
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.flight is not None:
+                self.flight.done(False)
+
 router = APIRouter(prefix="/rss",tags=["Rss"])
 feed_router = APIRouter(prefix="/feed",tags=["Feed"])
 
@@ -63,14 +145,9 @@ async def get_rss_feeds(
     rss=RSS(name=f'all_{limit}_{offset}')
     rss_xml=rss.get_cache()
     if rss_xml is not None  and is_update==False:
-         return Response(
-            content=rss_xml,
-            media_type="application/xml"
-        )
-    session = DB.get_session()
+         return _cache_response(request, rss, rss_xml, media_type="application/xml")
     try:
-        total = session.query(Feed).count()
-        feeds = session.query(Feed).order_by(Feed.created_at.desc()).limit(limit).offset(offset).all()
+        feeds = await ADB.run_sync(lambda session: session.query(Feed).order_by(Feed.created_at.desc()).limit(limit).offset(offset).all())
         rss_domain=cfg.get("rss.base_url",request.base_url)
         # 转换为RSS格式数据
         from datetime import datetime, timezone, timedelta
@@ -102,10 +179,34 @@ async def get_rss_feeds(
             )
         )
 
+def _load_article_content(session, article_id: str):
+    """从数据库读取文章正文，格式与 RSS.cache_content 缓存的内容一致"""
+    from core.models.article import Article
+    row = session.query(Article, Feed).join(Feed, Feed.id == Article.mp_id, isouter=True)\
+        .filter(Article.id == article_id).options(Article.lite()).first()
+    if row is None:
+        return None
+    article, feed = row
+    load_bodies([article])
+    return {
+        "id": article.id,
+        "title": article.title,
+        "content": article.content,
+        "publish_time": article.publish_time,
+        "mp_id": article.mp_id,
+        "pic_url": article.pic_url,
+        "mp_name": feed.mp_name if feed else ""
+    }
+
 @router.get("/content/{content_id}", summary="获取缓存的文章内容")
 async def get_rss_feed(content_id: str):
     rss = RSS()
     content = rss.get_cached_content(content_id)
+    if content is None:
+        # 非全文模式生成RSS时不加载正文、不写缓存，这里按需从数据库读取并缓存
+        content = await ADB.run_sync(_load_article_content, content_id)
+        if content is not None and content["content"]:
+            rss.cache_content(content_id, dict(content))
       
     if content is None:
         raise HTTPException(
@@ -171,6 +272,173 @@ async def update_rss_feeds(
 
 
 
+def _feed_name(tag_id, feed_id, limit: int, offset: int, cursor: str = None, kw: str = "") -> str:
+    """订阅缓存名，同一名称的请求共用缓存文件"""
+    if cursor:
+        name=f'{tag_id}_{feed_id}_{limit}_c{cursor}'
+    else:
+        name=f'{tag_id}_{feed_id}_{limit}_{offset}'
+    if kw:
+        # 搜索结果单独缓存，关键词可能包含路径字符，以摘要命名
+        name+="_k"+hashlib.md5(kw.encode("utf-8")).hexdigest()[:12]
+    return name
+
+def _load_feed(session, feed_id, tag_id, kw: str, cursor: str, offset: int, limit: int, rss_domain: str):
+    """查询订阅信息和一页文章，返回 (feed, [(feed, article), ...])，公众号不存在时feed为None"""
+    from core.models.article import Article
+    from core.models.tags import Tags
+    # 查询公众号信息
+    feed = session.query(Feed)
+    query=session.query(Feed, Article).join(Article, Feed.id == Article.mp_id).options(Article.lite())
+    if feed_id not in ["all",None]:
+        feed=feed.filter(Feed.id == feed_id).first()
+        query=query.filter(Article.mp_id==feed_id)
+    else:
+        feed=Feed()
+        feed.mp_name=cfg.get("rss.title","WeRss") or "WeRss"
+        feed.mp_intro=cfg.get("rss.description") or "WeRss高效订阅我的公众号"
+        feed.mp_cover=cfg.get("rss.cover") or f"{rss_domain}static/logo.svg"
+        #如果传入了tag_id就加载tag对应的订阅信息
+        if tag_id is not None:
+            tags=session.query(Tags).filter(Tags.id == tag_id).first()
+            if tags:
+                tag_filter=TAG_FEEDS.article_filter(session, tag_id)
+                query=query.filter(tag_filter if tag_filter is not None else false())
+                feed.mp_name = tags.name
+                feed.mp_intro = tags.intro
+                feed.mp_cover = f'{rss_domain}{tags.cover}'
+    if not feed:
+        return None, []
+    # 查询文章列表
+    # articles = query.order_by(Article.publish_time.desc()).limit(limit).offset(offset).all()
+    if kw!="":
+        query=query.filter(format_search_kw(kw))
+    query=keyset_paginate(query, cursor)
+    if not cursor:
+        query=query.offset(offset)
+    rows=query.limit(limit).all()
+    return feed, rows
+
+def _feed_item(_feed, article, rss_domain: str) -> dict:
+    """条目字段，正文由 _feed_items 按需填入，version 为片段缓存使用的文章版本"""
+    from datetime import datetime, timezone, timedelta
+    cst = timezone(timedelta(hours=8))
+    return {
+        "id": str(article.id),
+        "title": article.title or "",
+        "link":  f"{rss_domain}/views/article/{article.id}" if cfg.get("rss.local",False) else article.url,
+        "description": article.description if article.description != "" else article.title or "",
+        "content": "",
+        "image": article.pic_url or "",
+        "mp_name":_feed.mp_name or "",
+        "updated": datetime.fromtimestamp(article.publish_time, tz=cst),
+        "version": article.updated_at_millis,
+        "feed": {
+                "id":_feed.id,
+                "name":_feed.mp_name,
+                "cover":_feed.mp_cover,
+                "intro":_feed.mp_intro
+        }
+    }
+
+def _feed_items(rss: RSS, articles, need_body: bool, rss_domain: str):
+    """
+    按需逐条生成条目：全文输出时每次加载一小批正文，输出后即释放，内存占用与条目数无关；
+    已有渲染片段（文章版本未变）的条目不加载正文
+    """
+    conn = DB.get_read_engine().connect() if need_body else None
+    options = rss.fragment_options()
+    try:
+        for i in range(0, len(articles), RSS_BODY_BATCH):
+            batch = articles[i:i + RSS_BODY_BATCH]
+            items = [_feed_item(_feed, article, rss_domain) for _feed,article in batch]
+            missing = set()
+            for item in items:
+                fragment = rss.cached_fragment(item, options) if need_body else None
+                if fragment is not None:
+                    item["fragment"] = fragment
+                elif need_body:
+                    missing.add(item["id"])
+            if missing:
+                load_bodies([article for _feed,article in batch if str(article.id) in missing], conn=conn)
+            for (_feed,article),item in zip(batch, items):
+                if item["id"] in missing:
+                    item["content"] = article.content or ""
+                    # 缓存文章内容（未加载正文时由 /content/{content_id} 按需读取）
+                    rss.cache_content(article.id, {
+                        "id": article.id,
+                        "title": article.title,
+                        "content": article.content,
+                        "publish_time": article.publish_time,
+                        "mp_id": article.mp_id,
+                        "pic_url": article.pic_url,
+                        "mp_name": _feed.mp_name
+                    }, version=article.updated_at_millis)
+                    article.__dict__.pop("_bodies", None)
+                yield item
+    finally:
+        if conn is not None:
+            conn.close()
+
+def _page_headers(url: URL, cursor_next: str) -> dict:
+    """下一页游标响应头"""
+    headers={}
+    if cursor_next:
+        # 阅读器可按 Link 头翻页，每页查询耗时固定
+        headers["X-Next-Cursor"]=cursor_next
+        # 响应头只能是latin-1，路径中的中文关键词需要转义
+        next_url=quote(str(url.remove_query_params(["offset","cursor"]).include_query_params(cursor=cursor_next)), safe=":/?&=%#+@")
+        headers["Link"]=f'<{next_url}>; rel="next"'
+    return headers
+
+# 最近一次订阅请求的站点地址：rss.base_url 未配置时预热按它生成链接，翻页 Link 与阅读器请求一致
+_request_base_url = None
+
+def _is_current(rss: RSS, etag: str) -> bool:
+    """缓存文件存在且由当前数据版本生成"""
+    cached = rss.get_version()
+    return bool(cached) and cached.get("etag") == etag and os.path.exists(rss.rss_file)
+
+def render_feed(feed_id: str = None, tag_id: str = None, ext: str = "rss", limit: int = 50) -> str:
+    """
+    在当前线程生成订阅首页的缓存（预热），缓存名、ETag 和响应头与阅读器请求
+    /feed/<feed_id>.<ext>（标签为 /feed/tag/<tag_id>.<ext>）一致，之后的请求直接输出缓存。
+    返回 hit（缓存已是最新）、busy（正由其它请求生成）、rendered（已生成）、
+    missing（公众号不存在）或 skipped（还不知道站点地址）
+    """
+    base_url = _request_base_url or cfg.get("rss.base_url", None)
+    if not base_url:
+        return "skipped"
+    rss_domain = cfg.get("rss.base_url", base_url)
+    path = f"feed/tag/{tag_id}.{ext}" if tag_id is not None else f"feed/{feed_id}.{ext}"
+    rss = RSS(name=_feed_name(tag_id, feed_id, limit, 0), ext=ext, feed_id=feed_id)
+    need_body = ext=="json" or bool(cfg.get("rss.full_context",False))
+    with DB.get_session_factory()() as session:
+        version = data_version(session, feed_id, tag_id)
+        etag = version.etag(rss.rss_file, None, None, rss_domain, _render_options())
+        if _is_current(rss, etag):
+            return "hit"
+        flight, leader = RSS_FLIGHTS.join(rss.rss_file)
+        if not leader:
+            return "busy"
+        try:
+            if _is_current(rss, etag):
+                flight.done(True)
+                return "hit"
+            feed, articles = _load_feed(session, feed_id, tag_id, "", None, 0, limit, rss_domain)
+            if not feed:
+                return "missing"
+            headers = _page_headers(URL(f"{base_url}{path}"), next_cursor([article for _feed,article in articles], limit))
+            chunks = rss.iter_generate(_feed_items(rss, articles, need_body, rss_domain),ext=ext, title=f"{feed.mp_name}",link=rss_domain,description=feed.mp_intro,image_url=feed.mp_cover)
+            last_modified = _last_modified(version, etag, rss.get_version())
+            for _ in rss.stream(chunks, on_complete=lambda: rss.save_version(etag, last_modified, headers)):
+                pass
+            flight.done(True)
+            return "rendered"
+        finally:
+            # 成功时已标记，done 以第一次调用为准
+            flight.done(False)
+
 @router.get("/{feed_id}", summary="获取公众号文章")
 async def get_mp_articles_source(
     request: Request,
@@ -182,44 +450,70 @@ async def get_mp_articles_source(
     kw:str="",
     is_update:bool=True,
     content_type:str=Query(None,alias="ctype"),
-    template:str=None
+    template:str=None,
+    cursor:str=None,
     # current_user: dict = Depends(get_current_user)
 ):
-    rss=RSS(name=f'{tag_id}_{feed_id}_{limit}_{offset}',ext=ext)
+    if cursor:
+        decode_cursor(cursor)
+    rss=RSS(name=_feed_name(tag_id, feed_id, limit, offset, cursor, kw),ext=ext,feed_id=feed_id)
     rss.set_content_type(content_type)
     rss_xml = rss.get_cache()
+    cached = rss.get_version() if rss_xml is not None else None
     if rss_xml is not None and is_update==False:
-         return Response(
-            content=rss_xml,
-            media_type=rss.get_type()
-        )
-    session = DB.get_session()
+         headers = _validators(cached["etag"], cached["last_modified"], cached["headers"]) if cached else {}
+         RSS_PREWARM.record_request(True)
+         if cached and _not_modified(request, cached["etag"], cached["last_modified"]):
+             return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+         return _cache_response(request, rss, rss_xml, headers)
+    global _request_base_url
+    _request_base_url=str(request.base_url)
+    rss_domain=cfg.get("rss.base_url",_request_base_url)
+    # JSON 格式和全文模式输出正文，其余格式只需要文章列表字段
+    need_body=ext=="json" or bool(cfg.get("rss.full_context",False))
+    # 按数据版本判断是否需要重新生成：版本未变化时返回304或缓存文件，不读取文章
     try:
-        from core.models.article import Article
-        from core.models.tags import Tags
-        # 查询公众号信息
-        feed = session.query(Feed)
-        query=session.query(Feed, Article).join(Article, Feed.id == Article.mp_id)
-        rss_domain=cfg.get("rss.base_url",str(request.base_url))
-        if feed_id not in ["all",None]:
-            feed=feed.filter(Feed.id == feed_id).first()
-            query=query.filter(Article.mp_id==feed_id)
-        else:
-            feed=Feed()
-            feed.mp_name=cfg.get("rss.title","WeRss") or "WeRss"
-            feed.mp_intro=cfg.get("rss.description") or "WeRss高效订阅我的公众号"
-            feed.mp_cover=cfg.get("rss.cover") or f"{rss_domain}static/logo.svg"
-            #如果传入了tag_id就加载tag对应的订阅信息
-            if tag_id is not None:
-                tags=session.query(Tags).filter(Tags.id == tag_id).first()
-                if tags:
-                    mps_ids = [str(mp['id']) for mp in json.loads(tags.mps_id)] if tags.mps_id else []
-                    query=query.filter(Feed.id.in_(mps_ids))
-                    feed.mp_name = tags.name
-                    feed.mp_intro = tags.intro
-                    feed.mp_cover = f'{rss_domain}{tags.cover}'
-
-        
+        version = await ADB.run_sync(lambda session: data_version(session, feed_id, tag_id))
+    except Exception as e:
+        # 数据库暂不可用时与生成失败相同：有缓存输出缓存，没有缓存返回空内容
+        print_error(f"获取RSS数据版本错误:{e}")
+        if rss_xml is not None:
+            headers = _validators(cached["etag"], cached["last_modified"], cached["headers"]) if cached else {}
+            return _cache_response(request, rss, rss_xml, headers)
+        return Response(content=rss_xml, media_type=rss.get_type())
+    etag = version.etag(rss.rss_file, content_type, template, rss_domain, _render_options())
+    current = bool(cached) and cached.get("etag") == etag
+    last_modified = _last_modified(version, etag, cached)
+    page_headers = cached["headers"] if current else {}
+    if _not_modified(request, etag, last_modified, check_date=current):
+        RSS_PREWARM.record_request(True)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_validators(etag, last_modified, page_headers))
+    if rss_xml is not None and current:
+        RSS_PREWARM.record_request(True)
+        return _cache_response(request, rss, rss_xml, _validators(etag, last_modified, page_headers))
+    # 缓存未命中，请求需要等待生成（预热的命中率统计）
+    RSS_PREWARM.record_request(False)
+    # 同一订阅只由一个请求重新生成，其余请求等待它写入缓存后直接输出
+    flight, leader = RSS_FLIGHTS.join(rss.rss_file)
+    if not leader:
+        await flight.wait_async(RSS_FLIGHTS.timeout)
+    # 等待期间（包括上面读取数据版本时）可能已由其它请求生成
+    rss_xml = rss.get_cache()
+    cached = rss.get_version() if rss_xml is not None else None
+    if rss_xml is not None and cached and cached.get("etag") == etag:
+        if leader:
+            flight.done(True)
+        return _cache_response(request, rss, rss_xml, _validators(etag, cached["last_modified"], cached["headers"]))
+    if not leader:
+        # 生成失败、等待超时或数据在生成期间又有变化，自行生成
+        flight = None
+    def _complete():
+        rss.save_version(etag, last_modified, headers)
+        if flight is not None:
+            flight.done(True)
+    try:
+        # 在异步会话上执行查询，不阻塞事件循环
+        feed, articles = await ADB.run_sync(lambda session: _load_feed(session, feed_id, tag_id, kw, cursor, offset, limit, rss_domain))
         if not feed:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -228,60 +522,37 @@ async def get_mp_articles_source(
                     message="公众号不存在"
                 )
             )
-      
-        # 查询文章列表
-        total = query.count()
-        # articles = query.order_by(Article.publish_time.desc()).limit(limit).offset(offset).all()
-        if kw!="":
-            query=query.filter(format_search_kw(kw))
-        articles =query.order_by(Article.publish_time.desc()).limit(limit).offset(offset).all()
-        # 转换为RSS格式数据
-        from datetime import datetime, timezone, timedelta
-        cst = timezone(timedelta(hours=8))
-        rss_list = [{
-            "id": str(article.id),
-            "title": article.title or "",
-            "link":  f"{rss_domain}/views/article/{article.id}" if cfg.get("rss.local",False) else article.url,
-            "description": article.description if article.description != "" else article.title or "",
-            "content": article.content or "",
-            "image": article.pic_url or "",
-            "mp_name":_feed.mp_name or "",
-            "updated": datetime.fromtimestamp(article.publish_time, tz=cst),
-            "feed": {
-                    "id":_feed.id,
-                    "name":_feed.mp_name,
-                    "cover":_feed.mp_cover,
-                    "intro":_feed.mp_intro
-            }
-        } for _feed,article in articles]
+        cursor_next=next_cursor([article for _feed,article in articles], limit)
+        # 逐条生成RSS内容，边生成边输出并写入缓存文件
+        chunks = rss.iter_generate(_feed_items(rss, articles, need_body, rss_domain),ext=ext, title=f"{feed.mp_name}",link=rss_domain,description=feed.mp_intro,image_url=feed.mp_cover,template=template)
         
-
-        # 缓存文章内容
-        for _feed,article in articles:
-            content_data = {
-                "id": article.id,
-                "title": article.title,
-                "content": article.content,
-                "publish_time": article.publish_time,
-                "mp_id": article.mp_id,
-                "pic_url": article.pic_url,
-                "mp_name": _feed.mp_name
-            }
-            rss.cache_content(article.id, content_data)
-        # 生成RSS XML
-        rss_xml = rss.generate(rss_list,ext=ext, title=f"{feed.mp_name}",link=rss_domain,description=feed.mp_intro,image_url=feed.mp_cover,template=template)
-        
-        return Response(
-            content=rss_xml,
-            media_type=rss.get_type()
+        headers=_page_headers(request.url, cursor_next)
+        # 边生成边压缩：输出的压缩数据同时写入预压缩文件
+        encoding = rss.accept_encoding(request.headers.get("accept-encoding"))
+        response_headers = _validators(etag, last_modified, headers)
+        response_headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+        return _FlightResponse(
+            rss.stream(chunks, on_complete=_complete, encoding=encoding),
+            flight=flight,
+            media_type=rss.get_type(),
+            headers=response_headers
         )
     except Exception as e:
+        if flight is not None:
+            flight.done(False)
         print_error(f"获取RSS错误:{e}")
         # raise
         return Response(
              content=rss_xml,
              media_type=rss.get_type()
         )
+    except BaseException:
+        # 请求被取消
+        if flight is not None:
+            flight.done(False)
+        raise
     
 
 
@@ -294,9 +565,10 @@ async def rss(
     offset: int = Query(0, ge=0),
     kw:str="",
     content_type:str=Query(None,alias="ctype"),
-    is_update:bool=True
+    is_update:bool=True,
+    cursor:str=Query(None, description="分页游标，传入后忽略offset")
 ):
-    return await get_mp_articles_source(request=request,feed_id=feed_id, limit=limit,offset=offset, is_update=is_update,ext=ext,kw=kw,content_type=content_type)
+    return await get_mp_articles_source(request=request,feed_id=feed_id, limit=limit,offset=offset, is_update=is_update,ext=ext,kw=kw,content_type=content_type,cursor=cursor)
 
 
 @feed_router.get("/search/{kw}/{feed_id}.{ext}", summary="获取公众号文章源")
@@ -308,9 +580,10 @@ async def rss(
     offset: int = Query(0, ge=0),
     kw:str="",
     content_type:str=Query(None,alias="ctype"),
-    is_update:bool=True
+    is_update:bool=True,
+    cursor:str=Query(None, description="分页游标，传入后忽略offset")
 ):
-    return await get_mp_articles_source(request=request,feed_id=feed_id, limit=limit,offset=offset, is_update=is_update,ext=ext,kw=kw,content_type=content_type)
+    return await get_mp_articles_source(request=request,feed_id=feed_id, limit=limit,offset=offset, is_update=is_update,ext=ext,kw=kw,content_type=content_type,cursor=cursor)
 @feed_router.get("/tag/{tag_id}.{ext}", summary="获取公众号文章源")
 async def rss(
     request: Request,
@@ -321,8 +594,9 @@ async def rss(
     offset: int = Query(0, ge=0),
     kw:str="",
     content_type:str=Query(None,alias="ctype"),
-    is_update:bool=True
+    is_update:bool=True,
+    cursor:str=Query(None, description="分页游标，传入后忽略offset")
 ):
-    return await get_mp_articles_source(request=request,feed_id=feed_id, tag_id=tag_id,limit=limit,offset=offset, is_update=is_update,ext=ext,kw=kw,content_type=content_type)
+    return await get_mp_articles_source(request=request,feed_id=feed_id, tag_id=tag_id,limit=limit,offset=offset, is_update=is_update,ext=ext,kw=kw,content_type=content_type,cursor=cursor)
 
 
@@ -9,6 +9,7 @@ from .base import success_response, error_response
 from driver.token import wx_cfg
 from core.config import cfg
 from jobs.mps import TaskQueue
+from core.db import DB
 from driver.success import getLoginInfo,getStatus
 router = APIRouter(prefix="/sys", tags=["系统信息"])
 def get_docker_version():
@@ -58,6 +59,14 @@ async def system_resources(
     try:
         resources_info=get_system_resources()
         resources_info["queue"]=TaskQueue.get_queue_info(),
+        resources_info["db_pool"]=DB.pool_status()
+        from core.cache import count_cache
+        resources_info["count_cache"]=count_cache.stats()
+        from core.rss import CONTENT_CACHE_WRITER, RSS_FLIGHTS
+        resources_info["content_cache"]=CONTENT_CACHE_WRITER.stats()
+        resources_info["rss_flights"]=RSS_FLIGHTS.stats()
+        from core.rss_prewarm import RSS_PREWARM
+        resources_info["rss_prewarm"]=RSS_PREWARM.stats()
         return success_response(data=resources_info)
     except Exception as e:
         return error_response(
@@ -1,9 +1,7 @@
-import threading
-from core import lax, thread
-from core.models import Article,Feed,DATA_STATUS
+from sqlalchemy import func
+from core.models import Feed
 from core.db import DB
-from core.cache import data_cache
-import json
+from core.feed_stats import FEED_STATS
 class ArticleInfo():
     #没有内容的文章数量
     no_content_count:int=0
@@ -15,46 +13,26 @@ class ArticleInfo():
     wrong_count:int=0
     #公众号总数
     mp_all_count:int=0
-def laxArticle():
+def laxArticle(session=None):
+    """
+    文章统计，汇总 feed_stats 中随文章写入增量维护的计数，
+    耗时只与公众号数有关，不再对 articles 全表 COUNT(*)
+    """
     info=ArticleInfo()
-    session=DB.get_session()
-    #获取没有内容的文章数量 - 只查询content字段
-    info.no_content_count=session.query(Article).filter(Article.content == None).count()
-    #所有文章数量 - 只查询id字段
-    info.all_count=session.query(Article.id).count()
+    session=session or DB.get_read_session()
+    totals=FEED_STATS.totals(session)
+    #所有文章数量
+    info.all_count=totals["article_count"]
     #有内容的文章数量
-    info.has_content_count=info.all_count-info.no_content_count
-
-    #获取删除的文章 - 只查询status字段
-    info.wrong_count=session.query(Article).filter(Article.status !=DATA_STATUS.ACTIVE ).count()
-
-    #公众号总数 - 只查询id字段
-    info.mp_all_count=session.query(Feed.id).distinct().count()
-    # session.close()
+    info.has_content_count=totals["content_count"]
+    #没有内容的文章数量
+    info.no_content_count=info.all_count-info.has_content_count
+    #状态不正常（已删除等）的文章数量
+    info.wrong_count=info.all_count-totals["active_count"]
+    #公众号总数
+    info.mp_all_count=session.query(func.count(Feed.id)).scalar()
     return info.__dict__
-    pass
-ARTICLE_INFO={}
-lock = threading.Lock()
-def refresh_article_info():
-    def lax_article():
-        global ARTICLE_INFO
-        with lock:
-            ARTICLE_INFO=laxArticle()
-            # 存储到缓存中，缓存30分钟
-            data_cache.set("article_info", ARTICLE_INFO)
-            print(ARTICLE_INFO)
-    threading.Thread(target=lax_article).start()
 
 def get_article_info():
-    """从缓存获取文章信息，如果缓存不存在则返回全局变量"""
-    # 先尝试从缓存获取
-    cached_info = data_cache.get("article_info", ttl=1800)  # 30分钟TTL
-    ARTICLE_INFO=cached_info
-    if cached_info is not None:
-        return cached_info
-    else:
-        refresh_article_info()
-    
-    # 如果缓存不存在，返回全局变量
-    return ARTICLE_INFO
-
+    """获取文章统计，统计随写入实时维护，无需缓存和后台线程"""
+    return laxArticle()
@@ -0,0 +1,145 @@
+"""
+异步数据库访问
+
+基于 SQLAlchemy AsyncEngine（aiosqlite / asyncmy / asyncpg），
+查询期间让出事件循环，慢查询不再阻塞其它请求。
+
+现有查询代码使用 session.query 写法，这里通过 AsyncSession.run_sync 在
+异步连接上执行同步风格的查询函数；对应的异步驱动未安装时回退到线程池执行。
+"""
+import asyncio
+import threading
+from typing import Any, Callable, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
+
+from core.config import cfg
+from core.print import print_info, print_warning
+from core.db import DB, Db, apply_sqlite_profile, sqlite_profile, last_write, sticky_seconds
+
+# 同步驱动 -> 异步驱动
+ASYNC_DRIVERS = {
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "mysql": ("mysql+asyncmy", "asyncmy"),
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+}
+
+
+def async_url(con_str: str) -> Optional[str]:
+    """将同步连接串转换为异步驱动连接串，驱动未安装时返回None"""
+    if not con_str:
+        return None
+    url = make_url(con_str)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        return None
+    drivername, module = ASYNC_DRIVERS[backend]
+    try:
+        __import__(module)
+    except ImportError:
+        print_warning(f"未安装异步驱动 {module}，{backend} 查询将在线程池中执行")
+        return None
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+class AsyncDb:
+    """
+    异步数据库实例
+
+    run_sync(fn, *args) 在异步会话上执行 fn(session, *args)，read=True 时
+    与 Db.get_read_session 相同的规则选择只读副本或主库。
+    """
+
+    def __init__(self, db: Db = DB, tag: str = "异步"):
+        self.db = db
+        self.tag = tag
+        self._lock = threading.Lock()
+        self._engines: dict = {}
+        self._factories: dict = {}
+
+    def _create_engine(self, con_str: str) -> Optional[AsyncEngine]:
+        url = async_url(con_str)
+        if url is None:
+            return None
+        if url.startswith("sqlite+aiosqlite:///"):
+            # SQLite数据库文件已由同步引擎创建
+            engine = create_async_engine(url,
+                                         pool_size=int(cfg.get("db_pool.size", 5)),
+                                         max_overflow=int(cfg.get("db_pool.max_overflow", 20)),
+                                         pool_timeout=int(cfg.get("db_pool.timeout", 30)),
+                                         isolation_level="AUTOCOMMIT",
+                                         connect_args={"timeout": sqlite_profile()["busy_timeout"] / 1000})
+            apply_sqlite_profile(engine.sync_engine)
+        else:
+            engine = create_async_engine(url,
+                                         pool_size=int(cfg.get("db_pool.size", 5)),
+                                         max_overflow=int(cfg.get("db_pool.max_overflow", 20)),
+                                         pool_timeout=int(cfg.get("db_pool.timeout", 30)),
+                                         pool_recycle=int(cfg.get("db_pool.recycle", 60)),
+                                         pool_pre_ping=bool(cfg.get("db_pool.pre_ping", True)),
+                                         isolation_level="AUTOCOMMIT")
+        print_info(f"异步数据库引擎已创建: {engine.url.render_as_string(hide_password=True)}")
+        return engine
+
+    def get_sessionmaker(self, con_str: str) -> Optional[async_sessionmaker]:
+        """获取连接串对应的异步会话工厂，异步驱动不可用时返回None"""
+        if con_str in self._factories:
+            return self._factories[con_str]
+        with self._lock:
+            if con_str not in self._factories:
+                engine = self._create_engine(con_str)
+                self._engines[con_str] = engine
+                self._factories[con_str] = async_sessionmaker(engine, expire_on_commit=False, info={"tag": self.tag}) if engine else None
+            return self._factories[con_str]
+
+    async def _read_con_str(self) -> str:
+        """只读请求使用的连接串（规则同 Db.get_read_session）"""
+        db = self.db
+        if not db._init_read():
+            return db.connection_str
+        import time
+        if time.time() - last_write() < sticky_seconds():
+            return db.connection_str
+        guard = db.replica_guard
+        if time.monotonic() - guard.checked_at >= guard.check_interval:
+            usable = await asyncio.to_thread(guard.usable)
+        else:
+            usable = guard.usable()
+        return db.read_connection_str if usable else db.connection_str
+
+    async def run_sync(self, fn: Callable, *args, read: bool = True, **kwargs) -> Any:
+        """在异步会话上执行同步风格的查询函数 fn(session, *args, **kwargs)"""
+        con_str = await self._read_con_str() if read else self.db.connection_str
+        factory = self.get_sessionmaker(con_str)
+        if factory is None:
+            def _call():
+                session = self.db.get_read_session() if read else self.db.get_session()
+                return fn(session, *args, **kwargs)
+            return await run_in_threadpool(_call)
+        # fn 在事件循环线程中执行，全文索引是否可用需要访问同步引擎，过期时先在线程池中检查
+        from core.search import SEARCH
+        if SEARCH.stale():
+            await run_in_threadpool(SEARCH.available)
+        async with factory() as session:
+            return await session.run_sync(fn, *args, **kwargs)
+
+    async def session_dependency(self):
+        """FastAPI依赖项，请求范围的异步只读会话"""
+        factory = self.get_sessionmaker(await self._read_con_str())
+        if factory is None:
+            raise RuntimeError("异步数据库驱动不可用")
+        async with factory() as session:
+            yield session
+
+    async def dispose(self) -> None:
+        for engine in list(self._engines.values()):
+            if engine is not None:
+                await engine.dispose()
+        self._engines.clear()
+        self._factories.clear()
+
+
+# 全局异步数据库实例
+ADB = AsyncDb()
@@ -111,9 +111,141 @@ class ViewCache:
         except OSError:
             return False
 
+class CountCache:
+    """
+    列表总数缓存
+
+    以 (作用域, 规范化后的筛选条件) 为键缓存 count() 结果，
+    文章新增/删除时按 mp_id 失效；未限定公众号的条目对任意 mp_id 的变更都失效。
+    """
+
+    def __init__(self, ttl: int = 300, max_size: int = 1024):
+        import threading
+        from collections import OrderedDict
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # key -> (expire_at, value, mp_ids)
+        # 每次失效加一，计数期间发生过失效时不缓存结果（计数可能读到了失效前的数据）
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(scope: str, filters: dict) -> str:
+        """规范化筛选条件：去掉空值，列表排序，字符串去首尾空白"""
+        normalized = {}
+        for k, v in (filters or {}).items():
+            if v is None or v == "" or v == []:
+                continue
+            if isinstance(v, (list, tuple, set)):
+                v = sorted(str(i) for i in v)
+            elif isinstance(v, str):
+                v = v.strip()
+            normalized[k] = v
+        return f"{scope}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+    def get_or_count(self, scope: str, filters: dict, count_func, mp_ids=None, estimate_func=None) -> int:
+        """
+        获取缓存的总数，不存在时调用 count_func 计算
+
+        :param mp_ids: 结果涉及的公众号，None 表示全部公众号
+        :param estimate_func: 未筛选时的估算函数，返回 None 则回退到精确计数
+        """
+        key = self.make_key(scope, filters)
+        now = time.time()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > now:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+            generation = self._generation
+        value = None
+        if estimate_func is not None:
+            value = estimate_func()
+        if value is None:
+            value = count_func()
+        if isinstance(mp_ids, str):
+            mp_ids = [mp_ids]
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._items[key] = (now + self.ttl, value, frozenset(mp_ids) if mp_ids else None)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return value
+
+    def invalidate(self, mp_id: Optional[Union[str, list]] = None) -> None:
+        """按 mp_id 失效，不传则全部失效"""
+        with self._lock:
+            self._generation += 1
+            if mp_id is None:
+                self._items.clear()
+                return
+            changed = {mp_id} if isinstance(mp_id, str) else set(mp_id)
+            for key in [k for k, (_, _, ids) in self._items.items() if ids is None or ids & changed]:
+                del self._items[key]
+
+    def stats(self) -> dict:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+class FragmentCache:
+    """
+    RSS 条目片段缓存
+
+    以 (格式, 正文格式, 文章ID, 文章版本 updated_at_millis, 其它字段) 为键缓存已渲染的单个条目，
+    文章修改后版本变化，旧片段不再命中，按LRU淘汰；按片段总大小（字符数）限制内存占用。
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024):
+        import threading
+        from collections import OrderedDict
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # key -> text
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            text = self._items.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def set(self, key, text: str) -> None:
+        if len(text) > self.max_size:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = text
+            self._size += len(text)
+            while self._size > self.max_size:
+                _, dropped = self._items.popitem(last=False)
+                self._size -= len(dropped)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        return {"size": len(self._items), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
 # 全局缓存实例
 view_cache = ViewCache()
 data_cache = ViewCache("data/cache/data", default_ttl=3600, enabled=True)  # 数据缓存，默认1小时
+count_cache = CountCache(ttl=int(cfg.get("cache.count.ttl", 300)), max_size=int(cfg.get("cache.count.max_size", 1024)))
+fragment_cache = FragmentCache(max_size=int(cfg.get("cache.fragment.max_mb", 64)) * 1024 * 1024)
 
 def cache_view(prefix: str, ttl: Optional[int] = None, key_func=None):
     """
@@ -36,6 +36,7 @@ class Config:
         parser.add_argument('-config', help='配置文件', default='config.yaml')
         parser.add_argument('-job', help='启动任务', default=False)
         parser.add_argument('-init', help='初始化数据库,初始化用户', default=False)
+        parser.add_argument('--force', help='初始化时强制同步表结构（忽略表结构指纹）', action='store_true')
         args, _ = parser.parse_known_args()
         return args
     def _encrypt(self, data):
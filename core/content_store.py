@@ -0,0 +1,168 @@
+"""
+文章正文存储
+
+正文(content)和 content_html 压缩后存放在 article_contents 表，articles 表只保留元数据，
+session.query(Article) 不再把正文读出来；Article.content / Article.content_html 在访问时按需加载。
+
+压缩算法由 article.content_store.codec 配置（zstd / zlib / none），zstd 需要安装 zstandard，
+未安装时使用 zlib。读取时按每行记录的 codec 解压，修改配置不影响已有数据。
+articles 表中的旧正文列由 data_sync.py 迁移后清空，迁移前仍可读取。
+"""
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select
+from sqlalchemy.orm import object_session
+from sqlalchemy import inspect as sa_inspect
+
+from core.config import cfg
+from core.print import print_warning
+from core.models.article_content import ArticleContent
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+Bodies = Tuple[Optional[str], Optional[str]]
+EMPTY: Bodies = (None, None)
+
+_codec_warned = False
+
+
+def default_codec() -> str:
+    global _codec_warned
+    codec = str(cfg.get("article.content_store.codec", "zlib") or "zlib").lower()
+    if codec == "zstd" and zstandard is None:
+        if not _codec_warned:
+            print_warning("未安装 zstandard，正文压缩改用 zlib")
+            _codec_warned = True
+        return "zlib"
+    return codec if codec in ("zstd", "zlib", "none") else "zlib"
+
+
+def compress(text: Optional[str], codec: str) -> Optional[bytes]:
+    """空正文存为NULL，便于按 IS NULL 筛选未抓取正文的文章"""
+    if not text:
+        return None
+    raw = text.encode("utf-8")
+    level = int(cfg.get("article.content_store.level", 6))
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(raw)
+    if codec == "zlib":
+        return zlib.compress(raw, level)
+    return raw
+
+
+def decompress(data: Optional[bytes], codec: str) -> Optional[str]:
+    if data is None:
+        return None
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("正文使用zstd压缩，请安装 zstandard")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        data = zlib.decompress(data)
+    return bytes(data).decode("utf-8")
+
+
+def encode_row(article_id: str, content: Optional[str], content_html: Optional[str], codec: str = None) -> dict:
+    codec = codec or default_codec()
+    return {
+        "article_id": article_id,
+        "codec": codec,
+        "content": compress(content, codec),
+        "content_html": compress(content_html, codec),
+        "raw_size": len((content or "").encode("utf-8")) + len((content_html or "").encode("utf-8")),
+        "updated_at": int(time.time()),
+    }
+
+
+class ContentStore:
+    """按 article_id 读写 article_contents，所有方法都在调用方的连接上执行"""
+
+    table = ArticleContent.__table__
+
+    def put_many(self, conn, bodies: Dict[str, Bodies]) -> None:
+        """写入或覆盖正文，并按正文从无到有（或清空）更新公众号的正文数"""
+        if not bodies:
+            return
+        from core.feed_stats import FEED_STATS
+        before = FEED_STATS.filled(conn, bodies)
+        codec = default_codec()
+        rows = [encode_row(id, content, html, codec) for id, (content, html) in bodies.items()]
+        self.delete(conn, list(bodies))
+        conn.execute(insert(self.table), rows)
+        deltas = {}
+        for row in rows:
+            mp_id, had = before.get(row["article_id"], (None, False))
+            change = (row["content"] is not None) - had
+            if mp_id and change:
+                deltas.setdefault(mp_id, {"content": 0})["content"] += change
+        FEED_STATS.apply(conn, deltas, create=False)
+
+    def delete(self, conn, article_ids: List[str]) -> None:
+        if article_ids:
+            conn.execute(delete(self.table).where(self.table.c.article_id.in_(bindparam("ids", expanding=True))),
+                         {"ids": list(article_ids)})
+
+    def prune(self, conn) -> int:
+        """删除文章已不存在的正文（批量删除文章不会触发映射事件）"""
+        from core.models.article import Article
+        t = self.table
+        return conn.execute(delete(t).where(~t.c.article_id.in_(select(Article.__table__.c.id)))).rowcount
+
+    def get_many(self, conn, article_ids: Iterable[str]) -> Dict[str, Bodies]:
+        """读取正文，article_contents 中没有的文章回退读取 articles 表的旧正文列"""
+        from core.models.article import Article
+        ids = list(dict.fromkeys(article_ids))
+        result = {}
+        if not ids:
+            return result
+        t = self.table
+        for row in conn.execute(select(t.c.article_id, t.c.codec, t.c.content, t.c.content_html)
+                                .where(t.c.article_id.in_(ids))):
+            result[row.article_id] = (decompress(row.content, row.codec), decompress(row.content_html, row.codec))
+        missing = [id for id in ids if id not in result]
+        if missing:
+            legacy = Article.__table__.c
+            for row in conn.execute(select(legacy.id, legacy.content, legacy.content_html).where(legacy.id.in_(missing))):
+                result[row.id] = (row.content, row.content_html)
+        return result
+
+
+STORE = ContentStore()
+
+
+def load_bodies(articles: Iterable, conn=None) -> None:
+    """
+    批量加载文章正文到对象上，避免逐篇访问 article.content 时产生 N+1 查询
+    在 AsyncDb.run_sync 中查询出的对象，需要在 run_sync 内调用本函数后才能在外部读取正文
+    """
+    groups = {}
+    for article in articles:
+        if article is None or "_bodies" in article.__dict__:
+            continue
+        state = sa_inspect(article)
+        if not state.has_identity:
+            article.__dict__["_bodies"] = EMPTY
+            continue
+        session = object_session(article)
+        key = id(session) if conn is None else 0
+        groups.setdefault(key, (session, []))[1].append(article)
+    for session, items in groups.values():
+        if conn is None and session is None:
+            from core.db import DB
+            session = DB.get_session()
+        bodies = STORE.get_many(conn if conn is not None else session.connection(), [a.id for a in items])
+        for article in items:
+            article.__dict__["_bodies"] = bodies.get(article.id, EMPTY)
+
+
+def bodies_of(target, conn) -> Bodies:
+    """映射事件中读取正文：优先使用对象上已加载/刚设置的正文，否则在当前连接上查询"""
+    bodies = target.__dict__.get("_bodies")
+    if bodies is None:
+        bodies = STORE.get_many(conn, [target.id]).get(target.id, EMPTY)
+    return bodies
@@ -1,55 +1,460 @@
-from sqlalchemy import create_engine, Engine,Text,event
+from sqlalchemy import create_engine, Engine,Text,event,text
 from sqlalchemy.orm import sessionmaker, declarative_base,scoped_session
+from sqlalchemy.pool import QueuePool, StaticPool
+from sqlalchemy.exc import OperationalError, DBAPIError
 from sqlalchemy import Column, Integer, String, DateTime
 from typing import Optional, List
+import threading
+import time
+import contextvars
+from itertools import islice
 from .models import Feed, Article
+from .models.article import ArticleBase
+from .models.base import DATA_STATUS
 from .config import cfg
 from core.models.base import Base  
 from core.print import print_warning,print_info,print_error,print_success
 # 声明基类
 # Base = declarative_base()
 
+class PoolStats:
+    """连接池取连接的等待统计"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timeout: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+            if timeout:
+                self.timeouts += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.waits,
+                "avg_ms": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0,
+                "max_ms": round(self.wait_max * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+class TimedQueuePool(QueuePool):
+    """记录取连接等待时间的QueuePool"""
+    stats: PoolStats = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self._record(time.perf_counter() - start, timeout=True)
+            raise
+        self._record(time.perf_counter() - start)
+        return conn
+
+    def _record(self, seconds: float, timeout: bool = False):
+        if self.stats is not None:
+            self.stats.record(seconds, timeout)
+
+    def recreate(self):
+        # dispose() 会重建连接池，统计信息需要沿用
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class ConnectionHealth:
+    """
+    连接健康状态
+
+    连接池开启 pre_ping 后，每次取出连接都会先做一次轻量探测，
+    这里只缓存"最近一次确认可用"的时间：在 ttl 内直接认为可用，
+    超过 ttl 才执行一次 SELECT 1；只有真正的 OperationalError 才会重建连接池。
+    """
+    def __init__(self, engine: Engine, ttl: float = 30):
+        self.engine = engine
+        self.ttl = ttl
+        self.last_ok = 0.0
+        self.failures = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        # pre_ping 通过后才会触发 checkout，说明连接可用
+        self.last_ok = time.monotonic()
+
+    def _on_error(self, context):
+        if context.is_disconnect:
+            self.last_ok = 0.0
+
+    def mark_bad(self) -> None:
+        self.last_ok = 0.0
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.last_ok < self.ttl
+
+    def ensure(self) -> bool:
+        """确认连接可用，返回False表示连接已断开并已重建连接池"""
+        if self.is_fresh():
+            return True
+        with self._lock:
+            if self.is_fresh():
+                return True
+            try:
+                with self.engine.connect() as conn:
+                    conn.exec_driver_sql("SELECT 1")
+                self.last_ok = time.monotonic()
+                return True
+            except (OperationalError, DBAPIError) as e:
+                if isinstance(e, DBAPIError) and not isinstance(e, OperationalError) and not e.connection_invalidated:
+                    raise
+                self.failures += 1
+                print_warning(f"数据库连接不可用: {e}. 重建连接池...")
+                self.engine.dispose()
+                return False
+
+    def to_dict(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "last_ok_ago": round(time.monotonic() - self.last_ok, 3) if self.last_ok else None,
+            "failures": self.failures,
+        }
+
+def sqlite_profile() -> dict:
+    """SQLite连接参数（PRAGMA），可通过配置 sqlite.* 调整"""
+    return {
+        "journal_mode": cfg.get("sqlite.journal_mode", "WAL"),
+        "synchronous": cfg.get("sqlite.synchronous", "NORMAL"),
+        "busy_timeout": int(cfg.get("sqlite.busy_timeout", 5000)),
+        "mmap_size": int(cfg.get("sqlite.mmap_size", 268435456)),
+        "cache_size": int(cfg.get("sqlite.cache_size", -65536)),
+        "temp_store": cfg.get("sqlite.temp_store", "MEMORY"),
+    }
+
+def apply_sqlite_profile(engine: Engine, profile: dict = None) -> None:
+    """在每个新建的SQLite连接上设置PRAGMA"""
+    profile = profile or sqlite_profile()
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in profile.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+def sqlite_maintenance(engine: Engine, checkpoint: str = "TRUNCATE") -> dict:
+    """SQLite定期维护：合并WAL日志并更新查询优化统计"""
+    with engine.connect() as conn:
+        busy, log, checkpointed = conn.exec_driver_sql(f"PRAGMA wal_checkpoint({checkpoint})").fetchone()
+        conn.exec_driver_sql("PRAGMA optimize")
+    return {"busy": busy, "log": log, "checkpointed": checkpointed}
+
+def stream_batches(query, batch_size: int = 1000, conn=None):
+    """
+    分批流式读取查询结果，每次产出一批（list），内存占用只与 batch_size 相关，与表大小无关
+    query 为 ORM Query，或 Core select（需传入 conn）；MySQL/PostgreSQL 使用服务端游标（stream_results），
+    SQLite 逐行从游标读取；ORM 对象按批构建（yield_per），已处理的批次不再引用即可回收。
+    迭代期间游标占用所在连接（MySQL 上不能在同一连接执行其他查询），批次中需要再查询时应使用另一个连接；
+    yield_per 不支持集合类的预加载（joinedload/selectinload 集合）
+    """
+    if conn is not None:
+        for rows in conn.execute(query.execution_options(yield_per=batch_size)).partitions():
+            yield rows
+        return
+    rows = iter(query.yield_per(batch_size))
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+class EngineRegistry:
+    """
+    进程级共享引擎注册表
+
+    同一个连接串在进程内只创建一个 Engine（及其连接池），
+    各个 Db 实例按 tag 获取绑定在该引擎上的会话工厂。
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._engines: dict = {}
+        self._factories: dict = {}
+        self._tags: dict = {}
+        self._health: dict = {}
+
+    def _prepare_sqlite(self, con_str: str) -> None:
+        """确保SQLite数据库文件所在目录和文件存在"""
+        import os
+        db_path = con_str[10:]  # 去掉'sqlite:///'前缀
+        if not os.path.exists(db_path):
+            try:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            except Exception as e:
+                pass
+            open(db_path, 'w').close()
+
+    def _create_engine(self, con_str: str) -> Engine:
+        is_sqlite = con_str.startswith('sqlite:///')
+        if is_sqlite and ":memory:" in con_str:
+            # 内存数据库只能共享同一个连接
+            engine = create_engine(con_str,
+                                   poolclass=StaticPool,
+                                   isolation_level="AUTOCOMMIT",
+                                   connect_args={"check_same_thread": False})
+            engine.pool.stats = PoolStats()
+            return engine
+        if is_sqlite:
+            self._prepare_sqlite(con_str)
+            profile = sqlite_profile()
+            # SQLite文件无需探活和回收连接，长连接可以保留页缓存和mmap；
+            # WAL模式下只有一个写入方，连接只用于并发读取，每个连接各有一份页缓存（cache_size），
+            # 使用小连接池，不沿用面向数据库服务器的 db_pool.size/max_overflow
+            engine = create_engine(con_str,
+                                   poolclass=TimedQueuePool,
+                                   pool_size=int(cfg.get("sqlite.pool_size", 4)),
+                                   max_overflow=int(cfg.get("sqlite.max_overflow", 4)),
+                                   pool_timeout=int(cfg.get("db_pool.timeout", 30)),
+                                   pool_recycle=-1,
+                                   pool_pre_ping=False,
+                                   isolation_level="AUTOCOMMIT",
+                                   connect_args={"check_same_thread": False,
+                                                 "timeout": profile["busy_timeout"] / 1000})
+            apply_sqlite_profile(engine, profile)
+            engine.pool.stats = PoolStats()
+            return engine
+        engine = create_engine(con_str,
+                               poolclass=TimedQueuePool,
+                               pool_size=int(cfg.get("db_pool.size", 5)),             # 常驻连接数
+                               max_overflow=int(cfg.get("db_pool.max_overflow", 20)), # 允许的最大溢出连接数
+                               pool_timeout=int(cfg.get("db_pool.timeout", 30)),      # 获取连接时的超时时间（秒）
+                               echo=False,
+                               pool_recycle=int(cfg.get("db_pool.recycle", 60)),      # 连接池回收时间（秒）
+                               pool_pre_ping=bool(cfg.get("db_pool.pre_ping", True)), # 取出连接前先探测是否可用
+                               isolation_level="AUTOCOMMIT",  # 设置隔离级别
+                               #  isolation_level="READ COMMITTED",  # 设置隔离级别
+                               #  query_cache_size=0,
+                               )
+        engine.pool.stats = PoolStats()
+        return engine
+
+    def get_engine(self, con_str: str) -> Engine:
+        """获取连接串对应的共享引擎，不存在时创建"""
+        engine = self._engines.get(con_str)
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get(con_str)
+            if engine is None:
+                engine = self._create_engine(con_str)
+                self._engines[con_str] = engine
+                self._health[con_str] = ConnectionHealth(engine, ttl=float(cfg.get("db_pool.health_ttl", 30)))
+                print_info(f"数据库引擎已创建: {engine.url.render_as_string(hide_password=True)}")
+            return engine
+
+    def session_factory(self, con_str: str, tag: str = "默认") -> sessionmaker:
+        """获取绑定在共享引擎上、带有tag标记的会话工厂"""
+        key = (con_str, tag)
+        factory = self._factories.get(key)
+        if factory is not None:
+            return factory
+        with self._lock:
+            factory = self._factories.get(key)
+            if factory is None:
+                factory = sessionmaker(bind=self.get_engine(con_str), autoflush=True, expire_on_commit=True, future=True, info={"tag": tag})
+                event.listen(factory, "after_flush", _record_flush)
+                event.listen(factory, "after_commit", _record_commit)
+                self._factories[key] = factory
+                self._tags.setdefault(con_str, []).append(tag)
+            return factory
+
+    def reset(self, con_str: str) -> None:
+        """丢弃连接池中的所有连接，下次使用时重新建立"""
+        engine = self._engines.get(con_str)
+        if engine is not None:
+            engine.dispose()
+        health = self._health.get(con_str)
+        if health is not None:
+            health.mark_bad()
+
+    def ensure_healthy(self, con_str: str) -> bool:
+        """检查连接串对应的连接是否可用（带缓存）"""
+        health = self._health.get(con_str)
+        if health is None:
+            return True
+        return health.ensure()
+
+    def dispose_all(self) -> None:
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+
+    def pool_status(self) -> list:
+        """返回各引擎连接池的实时使用情况，用于评估连接池大小"""
+        status = []
+        for con_str, engine in list(self._engines.items()):
+            pool = engine.pool
+            item = {
+                "url": engine.url.render_as_string(hide_password=True),
+                "pool": pool.__class__.__name__,
+                "tags": list(self._tags.get(con_str, [])),
+            }
+            if isinstance(pool, QueuePool):
+                item.update({
+                    "size": pool.size(),
+                    "max_overflow": pool._max_overflow,
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                })
+            stats = getattr(pool, "stats", None)
+            if stats is not None:
+                item["wait"] = stats.to_dict()
+            health = self._health.get(con_str)
+            if health is not None:
+                item["health"] = health.to_dict()
+            status.append(item)
+        return status
+
+# 进程内共享的引擎注册表
+ENGINES = EngineRegistry()
+
+# 读己之写：客户端在主库写入后，由 Cookie（或请求头）带回写入时间，之后的请求在 sticky 时间内读取主库
+WRITE_COOKIE = "db_write_at"
+WRITE_HEADER = "X-DB-Write-At"
+
+class ClientWrites:
+    """一个请求所属客户端最近一次在主库写入的时间（time.time()），请求内的线程池、run_sync 共用同一个对象"""
+    __slots__ = ("at", "wrote")
+
+    def __init__(self, at: float = 0.0):
+        self.at = at
+        self.wrote = False
+
+# 当前请求的客户端写入记录，由 web.py 的中间件设置
+_CLIENT_WRITES = contextvars.ContextVar("db_client_writes", default=None)
+# 请求之外（后台任务、线程）的上下文最近一次在主库写入的时间
+_LAST_WRITE = contextvars.ContextVar("db_last_write", default=0.0)
+
+def begin_client_writes(value: str = None) -> ClientWrites:
+    """请求开始时调用，value 为 Cookie/请求头中带回的写入时间"""
+    try:
+        at = float(value) if value else 0.0
+    except ValueError:
+        at = 0.0
+    writes = ClientWrites(min(at, time.time()))
+    _CLIENT_WRITES.set(writes)
+    return writes
+
+def mark_write() -> None:
+    """标记当前客户端（请求之外为当前上下文）刚在主库写入过数据"""
+    now = time.time()
+    writes = _CLIENT_WRITES.get()
+    if writes is not None:
+        writes.at = now
+        writes.wrote = True
+    else:
+        _LAST_WRITE.set(now)
+
+def last_write() -> float:
+    """当前客户端最近一次在主库写入的时间"""
+    writes = _CLIENT_WRITES.get()
+    return max(writes.at if writes is not None else 0.0, _LAST_WRITE.get())
+
+def sticky_seconds() -> float:
+    """写入后留在主库读取的时间"""
+    return float(cfg.get("db_read_lag.sticky_seconds", cfg.get("db_read_lag.max_seconds", 10)))
+
+class ReplicaGuard:
+    """
+    只读副本延迟检查
+
+    每隔 check_interval 秒查询一次复制延迟并缓存结果，
+    延迟超过 max_lag 秒、复制中断或检查失败时返回False，由调用方回退到主库。
+    """
+    def __init__(self, engine: Engine, max_lag: float = 10, check_interval: float = 5):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag = None
+        self.checked_at = 0.0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def _query_lag(self) -> Optional[float]:
+        dialect = self.engine.dialect.name
+        with self.engine.connect() as conn:
+            if dialect == "mysql":
+                for sql, column in (("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                                    ("SHOW SLAVE STATUS", "Seconds_Behind_Master")):
+                    try:
+                        row = conn.exec_driver_sql(sql).mappings().fetchone()
+                    except DBAPIError:
+                        continue
+                    if row is None:
+                        return 0.0  # 不是副本（例如直连主库）
+                    value = row.get(column)
+                    return float(value) if value is not None else None
+                return None
+            if dialect == "postgresql":
+                row = conn.exec_driver_sql(
+                    "SELECT CASE WHEN pg_is_in_recovery() "
+                    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) ELSE 0 END"
+                ).fetchone()
+                return float(row[0]) if row and row[0] is not None else None
+        return 0.0
+
+    def usable(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at >= self.check_interval:
+            with self._lock:
+                if now - self.checked_at >= self.check_interval:
+                    try:
+                        self.lag = self._query_lag()
+                    except Exception as e:
+                        print_warning(f"检查只读副本延迟失败: {e}")
+                        self.lag = None
+                    self.checked_at = now
+        ok = self.lag is not None and self.lag <= self.max_lag
+        if not ok:
+            self.fallbacks += 1
+        return ok
+
+    def to_dict(self) -> dict:
+        return {"lag": self.lag, "max_lag": self.max_lag, "fallbacks": self.fallbacks}
+
 class Db:
     connection_str: str=None
-    def __init__(self,tag:str="默认",User_In_Thread=True):
+    def __init__(self,tag:str="默认",User_In_Thread=True,con_str:str=None,read_con_str:str=None):
         self.Session= None
+        self.ReadSession = None
         self.engine = None
+        self.read_engine = None
+        self.replica_guard = None
         self.User_In_Thread=User_In_Thread
         self.tag=tag
+        self.read_connection_str = read_con_str if read_con_str is not None else cfg.get("db_read")
         print_success(f"[{tag}]连接初始化")
-        self.init(cfg.get("db"))
+        self.init(con_str or cfg.get("db"))
     def get_engine(self) -> Engine:
         """Return the SQLAlchemy engine for this database connection."""
         if self.engine is None:
             raise ValueError("Database connection has not been initialized.")
         return self.engine
     def get_session_factory(self):
-        return sessionmaker(bind=self.engine, autoflush=True, expire_on_commit=True, future=True)
+        return ENGINES.session_factory(self.connection_str, tag=self.tag)
     def init(self, con_str: str) -> None:
         """Initialize database connection and create tables"""
         try:
             self.connection_str=con_str
-            # 检查SQLite数据库文件是否存在
-            if con_str.startswith('sqlite:///'):
-                import os
-                db_path = con_str[10:]  # 去掉'sqlite:///'前缀
-                if not os.path.exists(db_path):
-                    try:
-                        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-                    except Exception as e:
-                        pass
-                    open(db_path, 'w').close()
-            self.engine = create_engine(con_str,
-                                     pool_size=2,          # 最小空闲连接数
-                                     max_overflow=20,      # 允许的最大溢出连接数
-                                     pool_timeout=30,      # 获取连接时的超时时间（秒）
-                                     echo=False,
-                                     pool_recycle=60,  # 连接池回收时间（秒）
-                                     isolation_level="AUTOCOMMIT",  # 设置隔离级别
-                                    #  isolation_level="READ COMMITTED",  # 设置隔离级别
-                                    #  query_cache_size=0,
-                                     connect_args={"check_same_thread": False} if con_str.startswith('sqlite:///') else {}
-                                     )
+            self.engine = ENGINES.get_engine(con_str)
             self.session_factory=self.get_session_factory()
         except Exception as e:
             print(f"Error creating database connection: {e}")
@@ -91,13 +496,183 @@ class Db:
             pass      
         return False
      
+    @staticmethod
+    def _prepare_article(article_data: dict, prefix_id: bool = True, keep_status: bool = False) -> dict:
+        """
+        补齐文章入库前的默认字段（id前缀、时间、content_html、状态）；
+        与 add_article 一致，新文章的状态固定为正常，keep_status 为True时才保留传入的状态
+        """
+        from datetime import datetime
+        from core.models.base import DATA_STATUS
+        columns = Article.__table__.columns.keys()
+        row = {k: v for k, v in article_data.items() if k in columns}
+        if prefix_id and row.get("id"):
+            row["id"] = f"{str(row.get('mp_id'))}-{row['id']}".replace("MP_WXS_", "")
+        now = datetime.now()
+        if row.get("created_at") is None:
+            row["created_at"] = now
+        if row.get("updated_at") is None:
+            row["updated_at"] = now
+        if row.get("updated_at_millis") is None:
+            row["updated_at_millis"] = int(now.timestamp() * 1000)
+        if isinstance(row["created_at"], str):
+            row["created_at"] = datetime.strptime(row["created_at"], '%Y-%m-%d %H:%M:%S')
+        if isinstance(row["updated_at"], str):
+            row["updated_at"] = datetime.strptime(row["updated_at"], '%Y-%m-%d %H:%M:%S')
+        if row.get("content_html") is None and row.get("content") is not None:
+            from tools.fix import fix_html
+            row["content_html"] = fix_html(row.get("content"))
+        if not keep_status or row.get("status") is None:
+            row["status"] = DATA_STATUS.ACTIVE
+        return row
+
+    def _upsert_statement(self, rows: List[dict], update_fields=None):
+        """按数据库方言生成批量插入语句，主键冲突时忽略或更新指定字段"""
+        from sqlalchemy import func
+        table = Article.__table__
+        dialect = self.engine.dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table).values(rows)
+            if not update_fields:
+                return stmt.prefix_with("IGNORE")
+            return stmt.on_duplicate_key_update(
+                {f: func.coalesce(stmt.inserted[f], table.c[f]) for f in update_fields})
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(table).values(rows)
+            if not update_fields:
+                return stmt.on_conflict_do_nothing(index_elements=[table.c.id])
+            return stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={f: func.coalesce(stmt.excluded[f], table.c[f]) for f in update_fields})
+        return None
+
+    def upsert_articles(self, articles: List[dict], update_fields=None, prefix_id: bool = True,
+                        chunk_size: int = 200, check_exist: bool = False, keep_status: bool = False) -> dict:
+        """
+        批量写入文章
+
+        参数:
+            articles: 文章字典列表，字段同 add_article
+            update_fields: 已存在时需要更新的字段，为空则跳过已存在的文章
+            prefix_id: 是否按 add_article 的规则给id加上公众号前缀
+            chunk_size: 每批写入的条数
+            check_exist: 与 add_article(check_exist=True) 一致，按url查重，已有相同url的文章跳过
+            keep_status: 新文章保留传入的状态，默认与 add_article 一致固定为正常
+
+        返回:
+            {"inserted": [...], "updated": [...], "skipped": [...]} 对应的文章id
+        """
+        result = {"inserted": [], "updated": [], "skipped": []}
+        rows = {}
+        # 更新状态时保留传入的状态
+        keep_status = keep_status or "status" in (update_fields or [])
+        for data in articles:
+            row = self._prepare_article(data, prefix_id=prefix_id, keep_status=keep_status)
+            if row.get("id"):
+                rows[row["id"]] = row
+        if not rows:
+            return result
+        update_fields = [f for f in (update_fields or []) if f != "id"]
+        # 正文写入 article_contents，不参与 articles 表的批量语句
+        body_fields = [f for f in update_fields if f in ("content", "content_html")]
+        update_fields = [f for f in update_fields if f not in body_fields]
+        # 更新已有文章时刷新 updated_at_millis（RSS 数据版本）
+        if (update_fields or body_fields) and "updated_at_millis" not in update_fields:
+            update_fields.append("updated_at_millis")
+        session = self.get_session()
+        rows = list(rows.values())
+        try:
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i:i + chunk_size]
+                if check_exist:
+                    urls = [r["url"] for r in chunk if r.get("url")]
+                    duplicated = {r[0] for r in session.query(Article.url).filter(Article.url.in_(urls))} if urls else set()
+                    for r in chunk:
+                        if r.get("url") in duplicated:
+                            print_warning(f"Article already exists: {r['id']}")
+                            result["skipped"].append(r["id"])
+                    chunk = [r for r in chunk if r.get("url") not in duplicated]
+                    if not chunk:
+                        continue
+                ids = [r["id"] for r in chunk]
+                existing = {r[0] for r in session.query(Article.id).filter(Article.id.in_(ids))}
+                bodies = {r["id"]: (r.pop("content", None), r.pop("content_html", None)) for r in chunk}
+                # 批量插入要求每行字段一致
+                keys = set().union(*(r.keys() for r in chunk))
+                chunk = [{k: r.get(k) for k in keys} for r in chunk]
+                stmt = self._upsert_statement(chunk, update_fields)
+                if stmt is not None:
+                    session.execute(stmt)
+                else:
+                    for row in chunk:
+                        if row["id"] not in existing:
+                            session.add(Article(**row))
+                        elif update_fields:
+                            session.query(Article).filter(Article.id == row["id"]).update(
+                                {f: row[f] for f in update_fields if row.get(f) is not None})
+                    session.flush()
+                self._write_bodies(session.connection(), bodies, existing, body_fields)
+                # 批量语句不触发映射事件，在这里维护全文索引
+                from core.search import SEARCH
+                reindex = ids if {"title", "description", "content"} & set(update_fields + body_fields) else \
+                    [id for id in ids if id not in existing]
+                if reindex and SEARCH.writable():
+                    from core.content_store import STORE
+                    texts = STORE.get_many(session.connection(), reindex)
+                    docs = session.query(Article.id, Article.title, Article.description).filter(Article.id.in_(reindex))
+                    SEARCH.index(session.connection(), [dict(d._asdict(), content=texts.get(d.id, (None, None))[0])
+                                                        for d in docs])
+                # 维护公众号统计：新文章按增量累加，修改了状态或公众号的已有文章重新统计
+                from core.feed_stats import FEED_STATS
+                FEED_STATS.apply(session.connection(),
+                                 FEED_STATS.inserted_deltas(r for r in chunk if r["id"] not in existing))
+                if {"status", "mp_id"} & set(update_fields):
+                    FEED_STATS.refresh(session.connection(), {r.get("mp_id") for r in chunk if r["id"] in existing})
+                session.commit()
+                mark_write()
+                inserted_mps = {r.get("mp_id") for r in chunk if r["id"] not in existing}
+                if inserted_mps:
+                    from core.cache import count_cache
+                    count_cache.invalidate(list(inserted_mps))
+                for id in ids:
+                    if id not in existing:
+                        result["inserted"].append(id)
+                    elif update_fields:
+                        result["updated"].append(id)
+                    else:
+                        result["skipped"].append(id)
+        except Exception as e:
+            session.rollback()
+            print_error(f"Failed to upsert articles: {e}")
+            raise
+        return result
+
+    @staticmethod
+    def _write_bodies(conn, bodies: dict, existing: set, body_fields: list) -> None:
+        """
+        批量写入正文：新文章直接写入；已有文章仅在 body_fields 中的字段非空时更新，
+        与 articles 表批量更新时“空值不覆盖”的规则一致
+        """
+        from core.content_store import STORE
+        new = {id: b for id, b in bodies.items() if id not in existing and any(b)}
+        changed = {id: b for id, b in bodies.items() if id in existing and body_fields and any(b)}
+        if changed:
+            current = STORE.get_many(conn, list(changed))
+            for id, (content, html) in changed.items():
+                old_content, old_html = current.get(id, (None, None))
+                changed[id] = (content if "content" in body_fields and content is not None else old_content,
+                               html if "content_html" in body_fields and html is not None else old_html)
+        STORE.put_many(conn, {**new, **changed})
+
     def add_article(self, article_data: dict,check_exist=False) -> bool:
         try:
             session=self.get_session()
-            from datetime import datetime
-            art = Article(**article_data)
-            if art.id:
-               art.id=f"{str(art.mp_id)}-{art.id}".replace("MP_WXS_","")
+            art = Article(**self._prepare_article(article_data))
             
             if check_exist:
                 # 检查文章是否已存在
@@ -105,23 +680,6 @@ class Db:
                 if existing_article is not None:
                     print_warning(f"Article already exists: {art.id}")
                     return False
-                
-            if art.created_at is None:
-                art.created_at=datetime.now()
-            if art.updated_at is None:
-                art.updated_at=datetime.now()
-            if art.updated_at_millis is None:
-                art.updated_at_millis=int(datetime.now().timestamp()*1000)
-
-            if isinstance(art.created_at, str):
-                art.created_at=datetime.strptime(art.created_at ,'%Y-%m-%d %H:%M:%S')
-            if isinstance(art.updated_at, str):
-                art.updated_at=datetime.strptime(art.updated_at,'%Y-%m-%d %H:%M:%S')
-            art.content=art.content
-
-            if art.content_html is None:
-                from tools.fix import fix_html
-                art.content_html = fix_html(art.content)
             from core.models.base import DATA_STATUS
             art.status=DATA_STATUS.ACTIVE
             session.add(art)
@@ -136,6 +694,48 @@ class Db:
             return False
         return True    
         
+    def estimate_count(self, table_name: str = "articles", conn=None) -> Optional[int]:
+        """
+        根据数据库统计信息估算表的行数，无统计信息时返回None
+        conn 为调用方已有的连接（如 AsyncDb.run_sync 中的 session.connection()），不传时从同步引擎取连接
+        """
+        if conn is None:
+            with self.engine.connect() as conn:
+                return self.estimate_count(table_name, conn)
+        try:
+            dialect = conn.dialect.name
+            if dialect == "sqlite":
+                if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'")).fetchone() is None:
+                    return None
+                row = conn.execute(text("SELECT stat FROM sqlite_stat1 WHERE tbl=:t LIMIT 1"), {"t": table_name}).fetchone()
+                return int(row[0].split()[0]) if row else None
+            if dialect == "mysql":
+                row = conn.execute(text("SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA=DATABASE() AND TABLE_NAME=:t"), {"t": table_name}).fetchone()
+                return int(row[0]) if row and row[0] is not None else None
+            if dialect == "postgresql":
+                row = conn.execute(text("SELECT reltuples::bigint FROM pg_class WHERE relname=:t"), {"t": table_name}).fetchone()
+                return int(row[0]) if row and row[0] >= 0 else None
+        except Exception as e:
+            print_warning(f"估算{table_name}行数失败: {e}")
+        return None
+
+    def estimate_active_articles(self, conn=None) -> Optional[int]:
+        """
+        估算未删除的文章数（列表未筛选时的总数）：表行数估算值减去已删除的文章数，
+        已删除文章按 ix_articles_status_publish 计数；没有统计信息时返回None
+        """
+        if conn is None:
+            with self.engine.connect() as conn:
+                return self.estimate_active_articles(conn)
+        total = self.estimate_count("articles", conn)
+        if total is None:
+            return None
+        from sqlalchemy import func, select
+        from core.models.base import DATA_STATUS
+        a = Article.__table__
+        deleted = conn.execute(select(func.count()).select_from(a).where(a.c.status == DATA_STATUS.DELETED)).scalar()
+        return max(total - int(deleted or 0), 0)
+
     def get_articles(self, id:str=None, limit:int=30, offset:int=0) -> List[Article]:
         try:
             data = self.get_session().query(Article).limit(limit).offset(offset)
@@ -218,15 +818,11 @@ class Db:
             print_info(f"[{self.tag}] Session is already closed.")
             _session()
             return self.Session()
-        # 检查数据库连接是否已断开
-        try:
-            from core.models import User
-            # 尝试执行一个简单的查询来检查连接状态
-            session.query(User.id).count()
-        except Exception as e:
-            from core.print import print_warning
-            print_warning(f"[{self.tag}] Database connection lost: {e}. Reconnecting...")
-            self.init(self.connection_str)
+        # 检查数据库连接是否已断开（带缓存，ttl内不重复探测）
+        if not ENGINES.ensure_healthy(self.connection_str):
+            print_warning(f"[{self.tag}] Database connection lost. Reconnecting...")
+            if UseInThread and isinstance(self.Session, scoped_session):
+                self.Session.remove()
             _session()
             return self.Session()
         return session
@@ -246,6 +842,231 @@ class Db:
         finally:
             session.remove()
 
+    def _init_read(self) -> bool:
+        """延迟创建只读副本的引擎和会话"""
+        if self.ReadSession is not None:
+            return True
+        if not self.read_connection_str or self.read_connection_str == self.connection_str:
+            return False
+        with ENGINES._lock:
+            if self.ReadSession is None:
+                self.read_engine = ENGINES.get_engine(self.read_connection_str)
+                self.replica_guard = ReplicaGuard(self.read_engine,
+                                                  max_lag=float(cfg.get("db_read_lag.max_seconds", 10)),
+                                                  check_interval=float(cfg.get("db_read_lag.check_interval", 5)))
+                factory = ENGINES.session_factory(self.read_connection_str, tag=f"{self.tag}(只读)")
+                self.ReadSession = scoped_session(factory) if self.User_In_Thread else factory
+        return True
+
+    def get_read_session(self):
+        """
+        获取只读会话
+
+        配置了 db_read 时从只读副本读取；以下情况回退到主库会话：
+        未配置副本、副本延迟过大或不可用、当前上下文刚在主库写入过（读己之写）
+        """
+        if not self._use_replica():
+            return self.get_session()
+        return self.ReadSession()
+
+    def _use_replica(self) -> bool:
+        """已配置只读副本、副本可用且当前客户端最近没有在主库写入"""
+        if not self._init_read():
+            return False
+        if time.time() - last_write() < sticky_seconds():
+            return False
+        return self.replica_guard.usable()
+
+    def get_read_engine(self) -> Engine:
+        """只读查询使用的引擎（直接取连接批量读取时），规则同 get_read_session"""
+        return self.read_engine if self._use_replica() else self.get_engine()
+
+    def read_session_dependency(self):
+        """FastAPI依赖项，请求范围的只读会话"""
+        session = self.get_read_session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def pool_status(self) -> list:
+        """获取连接池使用情况"""
+        status = ENGINES.pool_status()
+        if self.replica_guard is not None:
+            for item in status:
+                if item["url"] == self.read_engine.url.render_as_string(hide_password=True):
+                    item["replica"] = self.replica_guard.to_dict()
+        return status
+
+# 文章内容变化时刷新 updated_at_millis（RSS 数据版本，见 core/rss_version.py），阅读状态等不影响输出的字段除外
+_VERSION_IGNORED = {"updated_at", "updated_at_millis", "is_read", "is_export"}
+
+def _touch_article(mapper, connection, target):
+    from sqlalchemy import inspect
+    state = inspect(target)
+    if any(attr.key not in _VERSION_IGNORED and attr.history.has_changes()
+           for attr in state.attrs if attr.key in mapper.column_attrs):
+        target.updated_at_millis = int(time.time() * 1000)
+
+event.listen(ArticleBase, "before_update", _touch_article, propagate=True)
+
+# 文章新增、删除或状态变化时，失效对应公众号的总数缓存；
+# 刷新时只记录公众号，提交后才失效，避免提交前其它请求按旧数据重新计数并缓存
+def _invalidate_article_count(mapper, connection, target):
+    from sqlalchemy.orm import object_session
+    session = object_session(target)
+    if session is None:
+        from core.cache import count_cache
+        count_cache.invalidate(target.mp_id)
+        return
+    session.info.setdefault("count_mp_ids", set()).add(target.mp_id)
+
+def _invalidate_article_count_on_update(mapper, connection, target):
+    from sqlalchemy import inspect
+    state = inspect(target)
+    if state.attrs.status.history.has_changes() or state.attrs.mp_id.history.has_changes():
+        _invalidate_article_count(mapper, connection, target)
+
+event.listen(ArticleBase, "after_insert", _invalidate_article_count, propagate=True)
+event.listen(ArticleBase, "after_delete", _invalidate_article_count, propagate=True)
+event.listen(ArticleBase, "after_update", _invalidate_article_count_on_update, propagate=True)
+
+def _commit_count_invalidation(session):
+    mp_ids = session.info.pop("count_mp_ids", None)
+    if mp_ids:
+        from core.cache import count_cache
+        count_cache.invalidate(list(mp_ids))
+
+def _discard_count_invalidation(session):
+    session.info.pop("count_mp_ids", None)
+
+# 所有会话（含异步会话内部的同步会话）
+from sqlalchemy.orm import Session as _Session
+event.listen(_Session, "after_commit", _commit_count_invalidation)
+event.listen(_Session, "after_rollback", _discard_count_invalidation)
+
+# 文章新增、修改标题/摘要/正文或删除时，同步更新全文索引
+def _index_article(mapper, connection, target):
+    from core.search import SEARCH
+    try:
+        SEARCH.index_object(connection, target)
+    except Exception as e:
+        print_warning(f"更新全文索引失败 {target.id}: {e}")
+
+def _index_article_on_update(mapper, connection, target):
+    from sqlalchemy import inspect
+    state = inspect(target)
+    # 修改正文时 Article.content 的 setter 会清空 legacy_content，以此判断正文是否变化
+    if any(name in state.attrs and state.attrs[name].history.has_changes()
+           for name in ("title", "description", "legacy_content")):
+        _index_article(mapper, connection, target)
+
+def _unindex_article(mapper, connection, target):
+    from core.search import SEARCH
+    try:
+        SEARCH.remove(connection, [target.id])
+    except Exception as e:
+        print_warning(f"删除全文索引失败 {target.id}: {e}")
+
+event.listen(ArticleBase, "after_insert", _index_article, propagate=True)
+event.listen(ArticleBase, "after_update", _index_article_on_update, propagate=True)
+event.listen(ArticleBase, "after_delete", _unindex_article, propagate=True)
+
+# 文章新增、删除或状态变化时，增量更新公众号统计（正文数在 ContentStore.put_many 中更新）
+def _stats_on_insert(mapper, connection, target):
+    from core.feed_stats import FEED_STATS
+    try:
+        FEED_STATS.apply(connection, FEED_STATS.inserted_deltas([{
+            "mp_id": target.mp_id, "status": target.status, "publish_time": target.publish_time}]))
+    except Exception as e:
+        print_warning(f"更新公众号统计失败 {target.mp_id}: {e}")
+
+def _stats_on_update(mapper, connection, target):
+    from sqlalchemy import inspect
+    from core.feed_stats import FEED_STATS
+    state = inspect(target)
+    mp_hist, status_hist = state.attrs.mp_id.history, state.attrs.status.history
+    if not (mp_hist.has_changes() or status_hist.has_changes()):
+        return
+    try:
+        if mp_hist.has_changes() or not status_hist.deleted:
+            # 改了公众号，或不知道原状态（未加载）时重新统计
+            FEED_STATS.refresh(connection, list(mp_hist.deleted) + [target.mp_id])
+            return
+        old, new = status_hist.deleted[0], target.status
+        active = (new == DATA_STATUS.ACTIVE) - (old == DATA_STATUS.ACTIVE)
+        if active:
+            FEED_STATS.apply(connection, {target.mp_id: {"active": active}})
+    except Exception as e:
+        print_warning(f"更新公众号统计失败 {target.mp_id}: {e}")
+
+def _stats_before_delete(mapper, connection, target):
+    # 删除后正文也随之删除，先记录是否有正文
+    from core.feed_stats import FEED_STATS
+    try:
+        target.__dict__["_had_content"] = FEED_STATS.filled(connection, [target.id]).get(target.id, (None, False))[1]
+    except Exception as e:
+        print_warning(f"读取正文状态失败 {target.id}: {e}")
+
+def _stats_on_delete(mapper, connection, target):
+    from core.feed_stats import FEED_STATS
+    status = target.__dict__.get("status")
+    had_content = target.__dict__.pop("_had_content", None)
+    try:
+        if status is None or had_content is None:
+            FEED_STATS.refresh(connection, [target.mp_id])
+        else:
+            FEED_STATS.apply(connection, {target.mp_id: {
+                "total": -1, "active": -1 if status == DATA_STATUS.ACTIVE else 0,
+                "content": -1 if had_content else 0, "recheck_latest": True}})
+    except Exception as e:
+        print_warning(f"更新公众号统计失败 {target.mp_id}: {e}")
+
+event.listen(ArticleBase, "after_insert", _stats_on_insert, propagate=True)
+event.listen(ArticleBase, "after_update", _stats_on_update, propagate=True)
+event.listen(ArticleBase, "before_delete", _stats_before_delete, propagate=True)
+event.listen(ArticleBase, "after_delete", _stats_on_delete, propagate=True)
+
+# 标签、消息任务的 mps_id 变化时同步关联表
+def _membership_of(target):
+    from core.tag_feeds import TAG_FEEDS, TASK_FEEDS
+    from core.models.tags import Tags
+    return TAG_FEEDS if isinstance(target, Tags) else TASK_FEEDS
+
+def _sync_feed_membership(mapper, connection, target):
+    try:
+        _membership_of(target).sync(connection, target.id, target.mps_id)
+    except Exception as e:
+        print_warning(f"同步关联公众号失败 {target.id}: {e}")
+
+def _sync_feed_membership_on_update(mapper, connection, target):
+    from sqlalchemy import inspect
+    if inspect(target).attrs.mps_id.history.has_changes():
+        _sync_feed_membership(mapper, connection, target)
+
+def _remove_feed_membership(mapper, connection, target):
+    try:
+        _membership_of(target).remove(connection, target.id)
+    except Exception as e:
+        print_warning(f"删除关联公众号失败 {target.id}: {e}")
+
+def _listen_feed_membership():
+    from core.models.tags import Tags
+    from core.models.message_task import MessageTask
+    for model in (Tags, MessageTask):
+        event.listen(model, "after_insert", _sync_feed_membership)
+        event.listen(model, "after_update", _sync_feed_membership_on_update)
+        event.listen(model, "after_delete", _remove_feed_membership)
+
+_listen_feed_membership()
+
+# 主库会话提交了写入后，当前上下文在一段时间内的读取留在主库
+def _record_flush(session, flush_context):
+    session.info["wrote"] = True
+
+def _record_commit(session):
+    if session.info.pop("wrote", False):
+        mark_write()
+
 # 全局数据库实例
-DB = Db(User_In_Thread=True)
-DB.init(cfg.get("db"))
\ No newline at end of file
+DB = Db(User_In_Thread=True)
\ No newline at end of file
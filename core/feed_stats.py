@@ -0,0 +1,276 @@
+"""
+公众号文章统计
+
+feed_stats 表按公众号保存文章总数、有效文章数、已抓取正文数、最新发布时间和最近采集时间，
+文章新增、删除、状态变化时增量更新（core/db.py 中的映射事件和 upsert_articles），
+写入正文时由 ContentStore.put_many 更新正文数。
+公众号列表、标签、级联状态、系统信息等页面直接读取，不再逐个公众号或全表 COUNT(*)。
+
+批量 delete/update 语句不会触发映射事件，执行后需调用 refresh；
+统计按 stats.reconcile_cron 定期重建（jobs/stats_reconcile.py），
+也可以执行 python tools/feed_stats_rebuild.py 手动重建。
+
+引擎为 AUTOCOMMIT，统计与文章不在同一事务中，每条写入语句各自原子：
+已有记录按增量 UPDATE，没有记录或重建时按文章表统计后 upsert（ON CONFLICT / ON DUPLICATE KEY），
+并发写入不会因主键冲突失败，可能出现的偏差由定期重建修正。
+"""
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+
+from core.models.base import DATA_STATUS
+from core.models.feed_stats import FeedStats
+from core.print import print_info
+
+# 列表页面展示的统计字段，FeedStats 没有记录时以此为默认值
+EMPTY = {"article_count": 0, "active_count": 0, "content_count": 0, "latest_publish_time": None, "last_gather_at": None}
+
+
+def _timestamp(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, str):
+        try:
+            return int(datetime.strptime(value[:19], "%Y-%m-%d %H:%M:%S").timestamp())
+        except ValueError:
+            return None
+    return int(value)
+
+
+def _greatest(column, value):
+    return case((column.is_(None) | (column < value), value), else_=column)
+
+
+class FeedStatsStore:
+    """按公众号读写 feed_stats，写入方法都在调用方的连接上执行"""
+
+    table = FeedStats.__table__
+
+    def __init__(self, db=None):
+        self._db = db
+
+    @property
+    def db(self):
+        if self._db is None:
+            from core.db import DB
+            self._db = DB
+        return self._db
+
+    # ------------------------------------------------------------------
+    # 增量维护
+    # ------------------------------------------------------------------
+    @staticmethod
+    def inserted_deltas(rows: Iterable[dict], gather_at: int = None) -> Dict[str, dict]:
+        """根据新写入的文章（含 mp_id/status/publish_time）计算各公众号的增量"""
+        gather_at = gather_at or int(time.time())
+        deltas = {}
+        for row in rows:
+            mp_id = row.get("mp_id")
+            if not mp_id:
+                continue
+            d = deltas.setdefault(mp_id, {"total": 0, "active": 0, "latest": None, "gather": gather_at})
+            d["total"] += 1
+            d["active"] += 1 if row.get("status") == DATA_STATUS.ACTIVE else 0
+            publish_time = row.get("publish_time")
+            if publish_time is not None and (d["latest"] is None or publish_time > d["latest"]):
+                d["latest"] = publish_time
+        return deltas
+
+    def apply(self, conn, deltas: Dict[str, dict], create: bool = True) -> None:
+        """
+        增量更新统计，deltas 为 {mp_id: {"total": n, "active": n, "content": n, "latest": 发布时间,
+        "gather": 采集时间, "recheck_latest": 是否重新计算最新发布时间}}
+        没有统计记录的公众号改为按文章表重新统计（调用方已写入文章，结果已包含本次变化），
+        create=False 时跳过，由随后的文章写入事件统计
+        """
+        t = self.table
+        missing = []
+        for mp_id, d in deltas.items():
+            values = {
+                "article_count": t.c.article_count + d.get("total", 0),
+                "active_count": t.c.active_count + d.get("active", 0),
+                "content_count": t.c.content_count + d.get("content", 0),
+                "updated_at": int(time.time()),
+            }
+            if d.get("recheck_latest"):
+                a = self._articles
+                values["latest_publish_time"] = select(func.max(a.c.publish_time)) \
+                    .where(a.c.mp_id == mp_id).scalar_subquery()
+            elif d.get("latest") is not None:
+                values["latest_publish_time"] = _greatest(t.c.latest_publish_time, d["latest"])
+            if d.get("gather"):
+                values["last_gather_at"] = _greatest(t.c.last_gather_at, d["gather"])
+            if conn.execute(update(t).where(t.c.mp_id == mp_id).values(values)).rowcount == 0:
+                missing.append(mp_id)
+        if create:
+            self.refresh(conn, missing)
+
+    def refresh(self, conn, mp_ids: Iterable[str]) -> None:
+        """按文章表重新统计指定公众号，覆盖已有记录"""
+        ids = [id for id in dict.fromkeys(mp_ids) if id]
+        if not ids:
+            return
+        computed = self.aggregate(conn, ids)
+        now = int(time.time())
+        self._upsert(conn, [dict(EMPTY, mp_id=id, **computed.get(id, {}), updated_at=now) for id in ids])
+
+    def _upsert(self, conn, rows: List[dict], before: int = None) -> None:
+        """
+        按数据库方言批量写入统计，mp_id 已存在时覆盖；
+        before 不为空时只覆盖 updated_at 早于该时间的记录（期间被增量更新过的记录保留）
+        """
+        t = self.table
+        if not rows:
+            return
+        columns = [k for k in rows[0] if k != "mp_id"]
+        older = self._older(before) if before is not None else None
+        dialect = conn.dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+            stmt = dialect_insert(t)
+            # MySQL 按顺序赋值，updated_at 放在最后，前面的条件比较的是原值
+            values = [(k, stmt.inserted[k] if older is None else case((older, stmt.inserted[k]), else_=t.c[k]))
+                      for k in sorted(columns, key=lambda k: k == "updated_at")]
+            stmt = stmt.on_duplicate_key_update(values)
+        elif dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(t)
+            stmt = stmt.on_conflict_do_update(index_elements=[t.c.mp_id], set_={k: stmt.excluded[k] for k in columns},
+                                              where=older)
+        else:
+            for row in rows:
+                query = update(t).where(t.c.mp_id == row["mp_id"])
+                if older is not None:
+                    query = query.where(older)
+                if conn.execute(query.values(row)).rowcount == 0 and \
+                        conn.execute(select(t.c.mp_id).where(t.c.mp_id == row["mp_id"])).first() is None:
+                    conn.execute(insert(t).values(row))
+            return
+        for i in range(0, len(rows), 500):
+            conn.execute(stmt, rows[i:i + 500])
+
+    def _older(self, before: int):
+        t = self.table
+        return or_(t.c.updated_at.is_(None), t.c.updated_at < before)
+
+    def filled(self, conn, article_ids: Iterable[str]) -> Dict[str, tuple]:
+        """文章是否已有正文，返回 {article_id: (mp_id, 是否有正文)}"""
+        ids = list(dict.fromkeys(article_ids))
+        if not ids:
+            return {}
+        a = self._articles
+        query = select(a.c.id, a.c.mp_id, self._has_content()).select_from(self._joined()).where(a.c.id.in_(ids))
+        return {id: (mp_id, bool(has)) for id, mp_id, has in conn.execute(query)}
+
+    def prune(self, conn) -> int:
+        """删除公众号已不存在的统计"""
+        from core.models.feed import Feed
+        t = self.table
+        return conn.execute(delete(t).where(~t.c.mp_id.in_(select(Feed.__table__.c.id)))).rowcount
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+    def get_many(self, session, mp_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        读取统计，返回 {mp_id: {article_count, active_count, latest_publish_time, last_gather_at}}
+        没有统计记录的公众号（统计表尚未建立等）当场按文章表统计，不写入
+        """
+        ids = [id for id in dict.fromkeys(mp_ids) if id]
+        if not ids:
+            return {}
+        t = self.table
+        conn = session.connection()
+        result = {row.mp_id: dict(row._mapping) for row in conn.execute(
+            select(t.c.mp_id, *[t.c[k] for k in EMPTY]).where(t.c.mp_id.in_(ids)))}
+        missing = [id for id in ids if id not in result]
+        if missing:
+            computed = self.aggregate(conn, missing)
+            for id in missing:
+                result[id] = dict(EMPTY, mp_id=id, **computed.get(id, {}))
+        return result
+
+    def active_count(self, session, mp_ids: Iterable[str]) -> int:
+        """多个公众号的有效文章数之和（标签的文章数）"""
+        return sum(s["active_count"] or 0 for s in self.get_many(session, mp_ids).values())
+
+    def totals(self, session) -> Dict[str, int]:
+        """所有公众号的统计之和，读取量与公众号数相关，与文章数无关"""
+        t = self.table
+        row = session.connection().execute(select(
+            func.coalesce(func.sum(t.c.article_count), 0), func.coalesce(func.sum(t.c.active_count), 0),
+            func.coalesce(func.sum(t.c.content_count), 0))).first()
+        return {"article_count": int(row[0]), "active_count": int(row[1]), "content_count": int(row[2])}
+
+    def popular(self, session, limit: int = 10) -> List[tuple]:
+        """有效文章最多的公众号 [(id, mp_name), ...]"""
+        from core.models.feed import Feed
+        return session.query(Feed.id, Feed.mp_name).join(FeedStats, FeedStats.mp_id == Feed.id).filter(
+            Feed.status == 1, FeedStats.active_count > 0
+        ).order_by(FeedStats.active_count.desc()).limit(limit).all()
+
+    # ------------------------------------------------------------------
+    # 重建
+    # ------------------------------------------------------------------
+    @property
+    def _articles(self):
+        from core.models.article import Article
+        return Article.__table__
+
+    def _joined(self):
+        from core.models.article_content import ArticleContent
+        a, c = self._articles, ArticleContent.__table__
+        return a.outerjoin(c, c.c.article_id == a.c.id)
+
+    def _has_content(self):
+        """与 Article.content_missing() 相反：正文表有正文，或尚未迁移的旧正文列非空"""
+        from core.models.article_content import ArticleContent
+        a, c = self._articles, ArticleContent.__table__
+        return case((or_(c.c.content.isnot(None), and_(a.c.content.isnot(None), a.c.content != "")), 1), else_=0)
+
+    def aggregate(self, conn, mp_ids: List[str] = None) -> Dict[str, dict]:
+        """按文章表统计（全部或指定公众号）"""
+        a = self._articles
+        query = select(a.c.mp_id, func.count(), func.sum(case((a.c.status == DATA_STATUS.ACTIVE, 1), else_=0)),
+                       func.sum(self._has_content()), func.max(a.c.publish_time), func.max(a.c.created_at)) \
+            .select_from(self._joined()).group_by(a.c.mp_id)
+        if mp_ids is not None:
+            query = query.where(a.c.mp_id.in_(mp_ids))
+        return {mp_id: {"article_count": total, "active_count": int(active or 0), "content_count": int(filled or 0),
+                        "latest_publish_time": latest, "last_gather_at": _timestamp(gathered)}
+                for mp_id, total, active, filled, latest, gathered in conn.execute(query) if mp_id}
+
+    def rebuild(self) -> int:
+        """
+        按文章表完整重建统计，返回公众号数
+        逐行覆盖而不是清空后重新写入，重建期间读取方始终能读到完整的统计；
+        重建开始后被增量更新过的记录保留（下次重建再校正），最后删除已没有文章的公众号的记录
+        """
+        t = self.table
+        now = int(time.time())
+        with self.db.engine.begin() as conn:
+            computed = self.aggregate(conn)
+            self._upsert(conn, [dict(EMPTY, mp_id=mp_id, **s, updated_at=now) for mp_id, s in computed.items()], before=now)
+            stale = [mp_id for mp_id, in conn.execute(select(t.c.mp_id).where(self._older(now))) if mp_id not in computed]
+            for i in range(0, len(stale), 500):
+                conn.execute(delete(t).where(t.c.mp_id.in_(stale[i:i + 500]), self._older(now)))
+        return len(computed)
+
+    def setup(self) -> None:
+        """初始化时调用：统计表为空且已有文章时建立统计"""
+        with self.db.engine.connect() as conn:
+            if conn.execute(select(self.table.c.mp_id).limit(1)).first() is not None:
+                return
+            if conn.execute(select(self._articles.c.id).limit(1)).first() is None:
+                return
+        print_info(f"公众号统计已建立，共 {self.rebuild()} 个公众号")
+
+
+FEED_STATS = FeedStatsStore()
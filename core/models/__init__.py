@@ -1,15 +1,29 @@
 # 导入文章模型
 from .article import Article 
+# 导入文章正文模型
+from .article_content import ArticleContent
 # 导入订阅源模型
 from .feed import Feed
+# 导入公众号统计模型
+from .feed_stats import FeedStats
 # 导入用户模型
 from .user import User
 # 导入消息任务模型
 from .message_task import MessageTask
+# 导入消息任务关联公众号模型
+from .message_task_feeds import MessageTaskFeed
 # 导入配置管理模型
 from .config_management import ConfigManagement
 # 导入Access Key模型
 from .access_key import AccessKey
+# 导入表结构指纹模型
+from .schema_version import SchemaVersion
+# 导入标签模型
+from .tags import Tags
+# 导入标签关联公众号模型
+from .tag_feeds import TagFeed
+# 导入消息任务日志模型
+from .message_task_log import MessageTask as MessageTaskLog
 # 导入级联节点模型
 from .cascade_node import CascadeNode, CascadeSyncLog
 # 导入级联任务分配模型
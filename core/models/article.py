@@ -1,9 +1,22 @@
-from sqlalchemy import BigInteger
+from sqlalchemy import BigInteger,Index,event
+from sqlalchemy.orm import deferred, load_only
 
 from  .base import Base,Column,String,Integer,DateTime,Text,DATA_STATUS
 class ArticleBase(Base):
     from_attributes = True
     __tablename__ = 'articles'
+    __table_args__ = (
+        # 按公众号+状态筛选并按发布时间排序（文章列表、上一篇/下一篇、相关文章、计数）
+        Index('ix_articles_mp_status_publish', 'mp_id', 'status', 'publish_time', 'id'),
+        # 单个公众号的 RSS 不按状态筛选，按 (publish_time, id) 顺序读取一页
+        Index('ix_articles_mp_publish', 'mp_id', 'publish_time', 'id'),
+        # 全部文章按状态筛选并按发布时间排序
+        Index('ix_articles_status_publish', 'status', 'publish_time', 'id'),
+        # RSS 数据版本：公众号内文章的最大更新时间（core/rss_version.py）
+        Index('ix_articles_mp_updated', 'mp_id', 'updated_at_millis'),
+        # add_article(check_exist=True) 按url查重
+        Index('ix_articles_url', 'url', mysql_length=255),
+    )
     id = Column(String(255), primary_key=True)
     mp_id = Column(String(255))
     title = Column(String(1000))
@@ -17,9 +30,74 @@ class ArticleBase(Base):
     updated_at_millis = Column(BigInteger,index=True)  
     is_export = Column(Integer)
     is_read = Column(Integer, default=0)
+
+    # 列表页需要的字段（不含正文），见 lite()
+    LIST_FIELDS = ("id", "mp_id", "title", "pic_url", "url", "description", "status",
+                   "publish_time", "created_at", "updated_at_millis", "is_read")
+    # 上一篇/下一篇、去重等只需要定位文章的字段，见 brief()
+    BRIEF_FIELDS = ("id", "mp_id", "title", "status", "publish_time")
+
+    @classmethod
+    def lite(cls):
+        """列表查询的加载选项: session.query(Article).options(Article.lite())，正文通过 content_store.load_bodies 按需加载"""
+        return load_only(*(getattr(cls, f) for f in cls.LIST_FIELDS))
+
+    @classmethod
+    def brief(cls):
+        """只加载定位文章所需字段的加载选项"""
+        return load_only(*(getattr(cls, f) for f in cls.BRIEF_FIELDS))
 class Article(ArticleBase):
-    content = Column(Text)
-    content_html = Column(Text)
+    # 正文已移到 article_contents 表（见 core/content_store.py），旧列仅在迁移前兼容读取
+    legacy_content = deferred(Column("content", Text), group="body")
+    legacy_content_html = deferred(Column("content_html", Text), group="body")
+
+    def _get_bodies(self):
+        if "_bodies" not in self.__dict__:
+            from core.content_store import load_bodies
+            load_bodies([self])
+        return self.__dict__["_bodies"]
+
+    def _set_body(self, index, value):
+        from sqlalchemy import inspect
+        # 新建的对象还没有入库，不需要加载
+        if "_bodies" in self.__dict__ or inspect(self).has_identity:
+            bodies = list(self._get_bodies())
+        else:
+            bodies = [None, None]
+        bodies[index] = value
+        self.__dict__["_bodies"] = tuple(bodies)
+        self.__dict__["_bodies_dirty"] = True
+        # 清空旧列，同时让对象进入待刷新状态，由 after_insert/after_update 事件写入正文表
+        self.legacy_content = None
+        self.legacy_content_html = None
+
+    # 正文在 article_contents 中压缩存放，只能按对象读取，不提供 SQL 表达式；
+    # 查询条件使用 content_missing()，批量读取使用 content_store.load_bodies
+    @property
+    def content(self):
+        return self._get_bodies()[0]
+
+    @content.setter
+    def content(self, value):
+        self._set_body(0, value)
+
+    @property
+    def content_html(self):
+        return self._get_bodies()[1]
+
+    @content_html.setter
+    def content_html(self, value):
+        self._set_body(1, value)
+
+    @classmethod
+    def content_missing(cls):
+        """未抓取正文（或正文为空）的筛选条件，兼容尚未迁移的旧正文列"""
+        from sqlalchemy import and_, exists, or_
+        from .article_content import ArticleContent
+        return and_(
+            or_(cls.legacy_content.is_(None), cls.legacy_content == ""),
+            ~exists().where(ArticleContent.article_id == cls.id, ArticleContent.content.isnot(None)),
+        )
     
     def to_dict(self):
         """将Article对象转换为字典"""
@@ -39,3 +117,23 @@ class Article(ArticleBase):
             'is_export': self.is_export,
             'is_read': self.is_read
         }
+
+def _write_bodies(mapper, connection, target):
+    """对象上设置过正文时，随本次 flush 写入正文表"""
+    if target.__dict__.pop("_bodies_dirty", False):
+        from core.content_store import STORE
+        STORE.put_many(connection, {target.id: target.__dict__["_bodies"]})
+
+def _delete_bodies(mapper, connection, target):
+    from core.content_store import STORE
+    STORE.delete(connection, [target.id])
+
+def _expire_bodies(target, attrs):
+    # 对象整体过期（如提交后）时丢弃缓存的正文，下次访问重新加载
+    if attrs is None:
+        target.__dict__.pop("_bodies", None)
+
+event.listen(Article, "after_insert", _write_bodies)
+event.listen(Article, "after_update", _write_bodies)
+event.listen(ArticleBase, "after_delete", _delete_bodies, propagate=True)
+event.listen(Article, "expire", _expire_bodies)
@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, LargeBinary
+
+from .base import Base, Column, String, Integer
+
+
+class ArticleContent(Base):
+    """文章正文（压缩存储），与 articles 表按 article_id 一对一，读写见 core/content_store.py"""
+    __tablename__ = 'article_contents'
+    article_id = Column(String(255), primary_key=True)
+    # 压缩算法: zstd / zlib / none
+    codec = Column(String(16), default="zlib")
+    # MySQL 下 length 超过 64KB 会建为 MEDIUMBLOB
+    content = Column(LargeBinary(length=16777215))
+    content_html = Column(LargeBinary(length=16777215))
+    # 压缩前的字节数（content + content_html），用于统计压缩率
+    raw_size = Column(Integer, default=0)
+    updated_at = Column(BigInteger)
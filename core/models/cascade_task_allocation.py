@@ -1,6 +1,7 @@
 """级联任务分配模型 - 持久化任务分配记录，支持任务互斥"""
 
 from .base import Base, Column, String, Integer, DateTime, Text, Boolean
+from sqlalchemy import Index
 from datetime import datetime
 
 
@@ -15,6 +16,10 @@ class CascadeTaskAllocation(Base):
     """
     from_attributes = True
     __tablename__ = 'cascade_task_allocations'
+    __table_args__ = (
+        # 按状态查找待认领/超时任务，并按下发时间排序
+        Index('ix_cascade_task_allocations_status_node_dispatched', 'status', 'node_id', 'dispatched_at'),
+    )
     
     id = Column(String(255), primary_key=True)  # 分配记录ID
     
@@ -11,4 +11,4 @@ class Feed(Base):
     update_time = Column(Integer)
     created_at = Column(DateTime) 
     updated_at = Column(DateTime)
-    faker_id = Column(String(255))
\ No newline at end of file
+    faker_id = Column(String(255),index=True)
\ No newline at end of file
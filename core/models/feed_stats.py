@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger
+
+from .base import Base, Column, String, Integer
+
+
+class FeedStats(Base):
+    """公众号文章统计，在文章写入时增量维护，见 core/feed_stats.py"""
+    __tablename__ = 'feed_stats'
+    mp_id = Column(String(255), primary_key=True)
+    # 文章总数（含已删除状态）
+    article_count = Column(Integer, default=0)
+    # 有效文章数（status=1）
+    active_count = Column(Integer, default=0)
+    # 已抓取正文的文章数
+    content_count = Column(Integer, default=0)
+    # 最新一篇文章的发布时间
+    latest_publish_time = Column(Integer)
+    # 最近一次采集到新文章的时间
+    last_gather_at = Column(Integer)
+    updated_at = Column(BigInteger)
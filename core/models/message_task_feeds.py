@@ -0,0 +1,14 @@
+from sqlalchemy import Index
+
+from .base import Base, Column, String
+
+
+class MessageTaskFeed(Base):
+    """消息任务关联的公众号，与 MessageTask.mps_id（JSON）同步写入，见 core/tag_feeds.py"""
+    __tablename__ = 'message_task_feeds'
+    __table_args__ = (
+        # 按公众号查找关联的任务
+        Index('ix_message_task_feeds_feed', 'feed_id'),
+    )
+    task_id = Column(String(255), primary_key=True)
+    feed_id = Column(String(255), primary_key=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger
+
+from .base import Base, Column, String
+
+
+class SchemaVersion(Base):
+    """数据库表结构指纹，与模型一致时启动跳过表结构同步，见 data_sync.py"""
+    __tablename__ = 'schema_version'
+    name = Column(String(50), primary_key=True)
+    # 模型字段定义和最后一次迁移的摘要
+    fingerprint = Column(String(64))
+    # 最后一次执行的迁移
+    migration = Column(String(100))
+    updated_at = Column(BigInteger)
@@ -0,0 +1,14 @@
+from sqlalchemy import Index
+
+from .base import Base, Column, String
+
+
+class TagFeed(Base):
+    """标签关联的公众号，与 Tags.mps_id（JSON）同步写入，见 core/tag_feeds.py"""
+    __tablename__ = 'tag_feeds'
+    __table_args__ = (
+        # 按公众号查找所属标签
+        Index('ix_tag_feeds_feed', 'feed_id'),
+    )
+    tag_id = Column(String(255), primary_key=True)
+    feed_id = Column(String(255), primary_key=True)
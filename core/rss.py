@@ -2,23 +2,162 @@ import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 import os
 import json
+import threading
+import uuid
+import zlib
 from core.content_format import format_content
+from core.single_flight import SingleFlight
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 预压缩文件：生成订阅时同时写入 <缓存文件>.br / .gz，按 Accept-Encoding 直接输出，不再逐次压缩
+ENCODING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+def _available_encodings() -> tuple:
+    """启用的预压缩编码（br 优先），未开启预压缩时为空，未安装 brotli 时只有gzip"""
+    from core.config import cfg
+    if not cfg.get("rss.precompress", True):
+        return ()
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def _encoders() -> dict:
+    """为启用的预压缩编码创建增量压缩器 {编码: (压缩函数, 结束函数)}，生成订阅时使用"""
+    result = {}
+    for encoding in _available_encodings():
+        if encoding == "gzip":
+            gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            result["gzip"] = (gz.compress, gz.flush)
+        else:
+            br = brotli.Compressor(quality=BROTLI_QUALITY)
+            result["br"] = (br.process, br.finish)
+    return result
+
+class ContentCacheWriter:
+    """
+    文章内容缓存的后台写入
+
+    生成订阅时只把待写入的内容放入有界队列，由后台线程写文件；同一文章同一版本（updated_at_millis）
+    只写一次，队列满时放弃写入（/rss/content 未命中缓存时会从数据库读取），不阻塞请求。
+    """
+
+    def __init__(self, maxsize: int = 1000, max_versions: int = 100000):
+        import queue
+        from collections import OrderedDict
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._versions = OrderedDict()  # 文件路径 -> 已写入（或已排队）的版本
+        self.max_versions = max_versions
+        self._thread = None
+        self.written = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, path: str, content: dict, version=None, prepare=None) -> bool:
+        """
+        排队写入 content 到 path，prepare(content) 在后台线程中执行；
+        同一路径同一版本已写入或已排队时跳过，没有版本时总是写入。返回是否排队
+        """
+        import queue
+        with self._lock:
+            if version is not None and self._versions.get(path) == version:
+                self._versions.move_to_end(path)
+                self.skipped += 1
+                return False
+            try:
+                self._queue.put_nowait((path, content, version, prepare))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            if version is not None:
+                self._versions[path] = version
+                self._versions.move_to_end(path)
+                while len(self._versions) > self.max_versions:
+                    self._versions.popitem(last=False)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="rss-content-cache", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            path, content, version, prepare = self._queue.get()
+            try:
+                if prepare is not None:
+                    prepare(content)
+                tmp_file = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, path)
+                self.written += 1
+            except Exception as e:
+                print(f"写入文章内容缓存失败 {path}: {e}")
+                self.failed += 1
+                with self._lock:
+                    if version is not None and self._versions.get(path) == version:
+                        del self._versions[path]
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """等待已排队的内容全部写入"""
+        self._queue.join()
+
+    def stats(self) -> dict:
+        return {"queued": self._queue.qsize(), "written": self.written, "skipped": self.skipped,
+                "dropped": self.dropped, "failed": self.failed}
+
+def _content_writer_size() -> int:
+    from core.config import cfg
+    return int(cfg.get("cache.content.queue_size", 1000))
+
+def _flight_timeout() -> float:
+    from core.config import cfg
+    return float(cfg.get("rss.single_flight_timeout", 30))
+
+CONTENT_CACHE_WRITER = ContentCacheWriter(maxsize=_content_writer_size())
+# 按缓存文件合并同一订阅的并发生成（见 apis/rss.py）
+RSS_FLIGHTS = SingleFlight(timeout=_flight_timeout())
+
 class RSS:
     cache_dir = os.path.normpath("data/cache/rss")
     content_cache_dir = os.path.normpath("data/cache/content")
     rss_file="all"
     
-    def __init__(self, name:str="all",cache_dir: str = None,ext:str="rss"):
+    # 不属于单个公众号的订阅（全部、标签、订阅列表）的缓存子目录
+    SHARED_SHARD = "_all"
+
+    def __init__(self, name:str="all",cache_dir: str = None,ext:str="rss",feed_id:str=None):
+        """
+        缓存文件按公众号分目录存放：<cache_dir>/<feed_id>/<name>.<ext>，其它订阅放在 _all 目录，
+        清除某个公众号的缓存只需处理它自己的目录。
+        目录在写入缓存时才创建，请求不存在的公众号不会留下空目录
+        """
         if cache_dir is not None:
             self.cache_dir = cache_dir
         self.ext=ext    
-        os.makedirs(self.cache_dir, exist_ok=True)
+        shard_dir = self.shard_dir(feed_id)
         os.makedirs(self.content_cache_dir, exist_ok=True)
-        normalized_path = os.path.normpath(f"{self.cache_dir}/{name}.{ext}")
-        if not normalized_path.startswith(self.cache_dir):
+        normalized_path = os.path.normpath(f"{shard_dir}/{name}.{ext}")
+        if not normalized_path.startswith(shard_dir + os.sep):
             raise ValueError("Invalid file path: Path traversal detected.")
         self.rss_file = normalized_path
         pass
+    def shard_dir(self, feed_id: str = None) -> str:
+        """公众号对应的缓存子目录"""
+        shard = feed_id if feed_id not in (None, "", "all") else self.SHARED_SHARD
+        shard_dir = os.path.normpath(f"{self.cache_dir}/{shard}")
+        if os.path.dirname(shard_dir) != os.path.normpath(self.cache_dir):
+            raise ValueError("Invalid file path: Path traversal detected.")
+        return shard_dir
+    def _ensure_shard_dir(self):
+        """写入缓存前创建所在的公众号目录"""
+        os.makedirs(os.path.dirname(self.rss_file), exist_ok=True)
     def get_type(self):
         if self.ext in ["rss","atom","md","txt"]:
             return "application/xml"
@@ -26,15 +165,15 @@ class RSS:
             return "application/json"
         return "text/plain"
     
-    def cache_content(self, content_id: str, content: dict):
-        """缓存文章内容"""
-        content["content"]=self.add_logo_prefix_to_urls(content["content"])
+    def cache_content(self, content_id: str, content: dict, version=None):
+        """缓存文章内容（后台写入），version 为文章的 updated_at_millis，同一版本只写一次"""
         content_path = os.path.normpath(f"{self.content_cache_dir}/{content_id}.json")
         if not content_path.startswith(self.content_cache_dir):
             raise ValueError("Invalid content path: Path traversal detected.")
-        
-        with open(content_path, "w", encoding="utf-8") as f:
-            json.dump(content, f, ensure_ascii=False, indent=2)
+        CONTENT_CACHE_WRITER.submit(content_path, content, version, prepare=self._prepare_content)
+
+    def _prepare_content(self, content: dict):
+        content["content"]=self.add_logo_prefix_to_urls(content["content"])
 
     def get_cached_content(self, content_id: str) -> dict:
         """获取缓存的文章内容"""
@@ -99,6 +238,14 @@ class RSS:
     def generate_rss(self,rss_list: dict, title: str = "Mp-We-Rss", 
                     link: str = "https://github.com/rachelos/we-mp-rss",
                     description: str = "RSS频道", language: str = "zh-CN",image_url:str=""):
+        tree_str = "".join(self.iter_rss(rss_list, title=title, link=link, description=description, language=language, image_url=image_url))
+        self.write_cache(tree_str)
+        return tree_str
+
+    def iter_rss(self,rss_list, title: str = "Mp-We-Rss", 
+                    link: str = "https://github.com/rachelos/we-mp-rss",
+                    description: str = "RSS频道", language: str = "zh-CN",image_url:str=""):
+        """逐条生成RSS 2.0内容：先输出频道信息，再每个条目输出一个片段，rss_list 可以是按需生成条目的迭代器"""
         from core.config import cfg
         full_context=bool(cfg.get("rss.full_context",False))
         
@@ -123,8 +270,13 @@ class RSS:
             ET.SubElement(image, "title").text = title
             ET.SubElement(image, "link").text = link
 
-        for rss_item in rss_list:
-            item = ET.SubElement(channel, "item")
+        # 频道信息序列化后去掉结尾的闭合标签，条目逐个输出在中间
+        closing = "</channel></rss>"
+        yield '<?xml version="1.0" encoding="utf-8"?>\r\n' + \
+            ET.tostring(rss, encoding="unicode", method="xml", short_empty_elements=False)[:-len(closing)]
+
+        def render(rss_item):
+            item = ET.Element("item")
             ET.SubElement(item, "id").text = rss_item["id"]
             ET.SubElement(item, "title").text = rss_item["title"]
             ET.SubElement(item, "description").text = rss_item["description"] 
@@ -149,15 +301,9 @@ class RSS:
             # ET.SubElement(item, "author").text = rss_item["author"]
             ET.SubElement(item, "link").text = rss_item["link"]
             ET.SubElement(item, "pubDate").text = self.datetime_to_rfc822(str(rss_item["updated"]))
-
-        # 生成XML字符串(添加声明和美化输出)
-        tree_str = '<?xml version="1.0" encoding="utf-8"?>\r\n' + \
-                ET.tostring(rss, encoding="utf-8", method="xml", short_empty_elements=False).decode("utf-8")
-        
-        if self.rss_file is not None:
-            with open(self.rss_file, "w", encoding="utf-8") as f:
-                f.write(tree_str)
-        return tree_str
+            return ET.tostring(item, encoding="unicode", method="xml", short_empty_elements=False)
+        yield from self.iter_fragments(rss_list, render)
+        yield closing
      
     def generate_atom(self,rss_list: dict, title: str = "Mp-We-Rss", 
                     link: str = "https://github.com/rachelos/we-mp-rss",
@@ -174,6 +320,14 @@ class RSS:
         Returns:
             Atom格式的XML字符串
         """
+        tree_str = "".join(self.iter_atom(rss_list, title=title, link=link, description=description, language=language, image_url=image_url))
+        self.write_cache(tree_str)
+        return tree_str
+
+    def iter_atom(self,rss_list, title: str = "Mp-We-Rss", 
+                    link: str = "https://github.com/rachelos/we-mp-rss",
+                    description: str = "RSS频道", language: str = "zh-CN",image_url:str=""):
+        """逐条生成Atom内容，输出与 generate_atom 一致"""
         from core.config import cfg
         full_context = bool(cfg.get("rss.full_context", False))
         
@@ -196,8 +350,13 @@ class RSS:
             ET.SubElement(image, "url").text = str(image_url)
             ET.SubElement(image, "title").text = str(title)
             ET.SubElement(image, "link").text = str(link)
-        for rss_item in rss_list:
-            entry = ET.SubElement(feed, "entry")
+
+        closing = "</feed>"
+        yield '<?xml version="1.0" encoding="utf-8"?>\r\n' + \
+            ET.tostring(feed, encoding="unicode", method="xml")[:-len(closing)]
+
+        def render(rss_item):
+            entry = ET.Element("entry")
             ET.SubElement(entry, "id").text = rss_item["id"]
             ET.SubElement(entry, "title").text = str(rss_item["title"])
             ET.SubElement(entry, "link", href=str(rss_item["link"]))
@@ -224,14 +383,9 @@ class RSS:
                 except Exception as e:
                     print(f"Error adding content:encoded element: {e}")
                 pass
-        # 生成XML字符串
-        tree_str = '<?xml version="1.0" encoding="utf-8"?>\r\n' + \
-                  ET.tostring(feed, encoding="utf-8", method="xml").decode("utf-8")
-        
-        if self.rss_file is not None:
-            with open(self.rss_file, "w", encoding="utf-8") as f:
-                f.write(tree_str)
-        return tree_str
+            return ET.tostring(entry, encoding="unicode", method="xml")
+        yield from self.iter_fragments(rss_list, render)
+        yield closing
     def set_content_type(self,type:str=None):
         self.content_type=type
     def get_content_type(self)->str:
@@ -254,6 +408,12 @@ class RSS:
         Returns:
             JSON格式的字符串
         """
+        return "".join(self.iter_json(rss_list, title=title, link=link, description=description, language=language, image_url=image_url))
+
+    def iter_json(self, rss_list, title: str = "Mp-We-Rss", 
+                    link: str = "https://github.com/rachelos/we-mp-rss",
+                    description: str = "RSS频道", language: str = "zh-CN",image_url:str=""):
+        """逐条生成JSON内容，输出与 json.dumps(indent=2) 整体序列化一致"""
         type=self.get_content_type()
         result = {
             "name":title,
@@ -261,29 +421,154 @@ class RSS:
             "description":description,
             "language": language,
             "cover":image_url,
-            "items": [
-                {
-                    "id": item["id"],
-                    "title": item["title"],
-                    "description": item["description"],
-                    "link": item["link"],
-                    "updated": item["updated"].isoformat() if isinstance(item["updated"], datetime) else item["updated"],
-                    "content": format_content(item["content"],type),
-                    "channel_name": item.get("mp_name", ""),
-                    "feed": item.get("feed")
-                } for item in rss_list
-            ]
+            "items": []
         }
-        return json.dumps(result, ensure_ascii=False, indent=2, default=self.serialize_datetime)
+        # 先输出到 "items": [ 为止，条目按两级缩进逐个输出
+        head = json.dumps(result, ensure_ascii=False, indent=2, default=self.serialize_datetime)
+        yield head[:-len("]\n}")]
+        def render(item):
+            text = json.dumps({
+                "id": item["id"],
+                "title": item["title"],
+                "description": item["description"],
+                "link": item["link"],
+                "updated": item["updated"].isoformat() if isinstance(item["updated"], datetime) else item["updated"],
+                "content": format_content(item["content"],type),
+                "channel_name": item.get("mp_name", ""),
+                "feed": item.get("feed")
+            }, ensure_ascii=False, indent=2, default=self.serialize_datetime)
+            return "\n".join("    " + line for line in text.split("\n"))
+        first = True
+        for text in self.iter_fragments(rss_list, render):
+            yield ("\n" if first else ",\n") + text
+            first = False
+        yield "]\n}" if first else "\n  ]\n}"
+
+    # 除正文外参与条目渲染的字段，正文由文章版本（item["version"]，即 updated_at_millis）代表
+    FRAGMENT_FIELDS = ("id", "title", "description", "link", "image", "mp_name", "updated", "feed")
+
+    def fragment_options(self):
+        """影响条目渲染的输出格式、正文格式和配置，模板输出不使用片段缓存时返回None；每次生成读取一次"""
+        from core.config import cfg
+        kind = {"rss": "rss", "xml": "rss", "atom": "atom", "md": "atom", "txt": "atom", "json": "json", "jmd": "json"}.get(self.ext)
+        if kind is None:
+            return None
+        return (kind, self.get_content_type(), bool(cfg.get("rss.full_context", False)),
+                bool(cfg.get("rss.add_cover", False)), bool(cfg.get("rss.cdata", False)))
+
+    def fragment_key(self, item: dict, options):
+        """条目片段缓存键：fragment_options 加上文章ID、版本和其它字段；条目没有版本时返回None（不缓存）"""
+        if options is None or item.get("version") is None:
+            return None
+        fields = tuple(json.dumps(item.get(k), ensure_ascii=False, sort_keys=True, default=str) for k in self.FRAGMENT_FIELDS)
+        return options + (item["version"],) + fields
+
+    def cached_fragment(self, item: dict, options):
+        """
+        读取条目已缓存的片段，没有时返回None；
+        调用方可把结果放入 item["fragment"]，生成时直接输出，不再需要正文
+        """
+        from core.cache import fragment_cache
+        key = self.fragment_key(item, options)
+        return fragment_cache.get(key) if key is not None else None
+
+    def iter_fragments(self, rss_list, render):
+        """逐条输出 render(item) 渲染的条目片段，文章版本未变的条目直接使用缓存的片段"""
+        from core.cache import fragment_cache
+        options = self.fragment_options()
+        for item in rss_list:
+            text = item.get("fragment")
+            if text is not None:
+                yield text
+                continue
+            key = self.fragment_key(item, options)
+            text = fragment_cache.get(key) if key is not None else None
+            if text is None:
+                text = render(item)
+                if key is not None:
+                    fragment_cache.set(key, text)
+            yield text
 
     def get_cache(self):
         if not hasattr(self, 'rss_file') or not self.rss_file:
                return None
         try:
-            with open(self.rss_file, "r", encoding="utf-8") as f:
+            with open(self.rss_file, "r", encoding="utf-8", newline="") as f:
                 return f.read()  
         except FileNotFoundError:
             return None     
+    def write_cache(self, text: str):
+        """写入缓存文件及预压缩文件（先写临时文件再替换，读取方不会读到写了一半的内容）"""
+        if not self.rss_file or text is None:
+            return
+        self._ensure_shard_dir()
+        data = text.encode("utf-8")
+        tmp_files = {}
+        try:
+            for encoding, (compress, finish) in _encoders().items():
+                tmp_files[encoding] = f"{self.rss_file}{ENCODING_SUFFIX[encoding]}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_files[encoding], "wb") as f:
+                    f.write(compress(data) + finish())
+            tmp_files[None] = f"{self.rss_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_files[None], "wb") as f:
+                f.write(data)
+            self._replace_cache(tmp_files)
+        finally:
+            for tmp_file in tmp_files.values():
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+    def _replace_cache(self, tmp_files: dict):
+        """用临时文件替换缓存文件：先替换预压缩文件，未生成的编码删除旧文件，最后替换原文件（键为None）"""
+        for encoding, suffix in ENCODING_SUFFIX.items():
+            if encoding in tmp_files:
+                os.replace(tmp_files[encoding], f"{self.rss_file}{suffix}")
+            elif os.path.exists(f"{self.rss_file}{suffix}"):
+                os.remove(f"{self.rss_file}{suffix}")
+        os.replace(tmp_files[None], self.rss_file)
+    def accept_encoding(self, header: str = None):
+        """按 Accept-Encoding 选择预压缩编码（br 优先于 gzip，q=0 表示不接受），不支持时返回None"""
+        available = _available_encodings()
+        accepted = {}
+        for part in (header or "").split(","):
+            name, _, params = part.strip().partition(";")
+            q = 1.0
+            for param in params.split(";"):
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            accepted[name.strip().lower()] = q
+        best = None
+        for encoding in available:
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > 0 and (best is None or q > best[1]):
+                best = (encoding, q)
+        return best[0] if best else None
+    def get_cache_encoded(self, encoding: str):
+        """读取预压缩的缓存文件，不存在时返回None"""
+        if encoding not in ENCODING_SUFFIX or not self.rss_file:
+            return None
+        try:
+            with open(f"{self.rss_file}{ENCODING_SUFFIX[encoding]}", "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+    def get_version(self) -> dict:
+        """读取缓存文件对应的数据版本 {"etag", "last_modified", "headers"}，没有缓存时返回None"""
+        try:
+            with open(f"{self.rss_file}.ver", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+    def save_version(self, etag: str, last_modified: int, headers: dict = None):
+        """记录缓存文件对应的数据版本，需在 generate 写入缓存之后调用"""
+        self._ensure_shard_dir()
+        tmp_file = f"{self.rss_file}.ver.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "last_modified": last_modified, "headers": headers or {}}, f)
+        os.replace(tmp_file, f"{self.rss_file}.ver")
     def generate(self,rss_list: dict,ext=str, title: str = "Mp-We-Rss", 
                     link: str = "https://github.com/rachelos/we-mp-rss",
                     description: str = "RSS频道", language: str = "zh-CN",image_url:str="",template:str=None) -> str:
@@ -300,18 +585,69 @@ class RSS:
         Raises:
             ValueError: 当扩展名不支持时
         """
+        text = "".join(self.iter_generate(rss_list, ext=ext, title=title, link=link, description=description,
+                                          language=language, image_url=image_url, template=template))
+        self.write_cache(text)
+        return text
+    def iter_generate(self,rss_list,ext=str, title: str = "Mp-We-Rss", 
+                    link: str = "https://github.com/rachelos/we-mp-rss",
+                    description: str = "RSS频道", language: str = "zh-CN",image_url:str="",template:str=None):
+        """
+        根据扩展名返回逐条生成内容的迭代器（字符串片段），配合 stream 输出到 StreamingResponse；
+        扩展名不支持时立即抛出 ValueError
+        """
         ext = ext.lower().strip('.')
         self.ext=ext
         if ext in ('rss', 'xml'):
-            return self.generate_rss(rss_list, title=title, link=link, description=description,language=language,image_url=image_url)
+            return self.iter_rss(rss_list, title=title, link=link, description=description,language=language,image_url=image_url)
         elif ext in ('atom','md','txt'):
-            return self.generate_atom(rss_list, title=title, link=link, description=description,language=language,image_url=image_url)
+            return self.iter_atom(rss_list, title=title, link=link, description=description,language=language,image_url=image_url)
         elif ext in ('json','jmd'):
-            return self.generate_json(rss_list, title=title, link=link, description=description,language=language,image_url=image_url)
+            return self.iter_json(rss_list, title=title, link=link, description=description,language=language,image_url=image_url)
         elif template is not None:
-            return self.generate_by_template(rss_list,template, title=title, link=link, description=description,language=language,image_url=image_url)
+            # 模板需要完整的文章列表
+            return iter([self.generate_by_template(list(rss_list),template, title=title, link=link, description=description,language=language,image_url=image_url)])
         else:
             raise ValueError(f"Unsupported extension: {ext}")
+    def stream(self, chunks, on_complete=None, encoding: str = None):
+        """
+        把 iter_generate 生成的片段编码后逐块输出（用于 StreamingResponse），同时写入缓存文件和预压缩文件；
+        encoding 为 accept_encoding 选出的编码时输出对应的压缩数据（与写入预压缩文件的是同一份，不额外压缩）。
+        全部输出后才替换缓存文件并调用 on_complete，中途断开或出错时丢弃临时文件，原缓存不变
+        """
+        self._ensure_shard_dir()
+        token = uuid.uuid4().hex
+        encoders = _encoders()
+        tmp_files = {None: f"{self.rss_file}.{token}.tmp"}
+        tmp_files.update({name: f"{self.rss_file}{ENCODING_SUFFIX[name]}.{token}.tmp" for name in encoders})
+        files = {name: open(path, "wb") for name, path in tmp_files.items()}
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                files[None].write(data)
+                for name, (compress, _finish) in encoders.items():
+                    out = compress(data)
+                    files[name].write(out)
+                    if name == encoding and out:
+                        yield out
+                if encoding not in encoders:
+                    yield data
+            for name, (_compress, finish) in encoders.items():
+                out = finish()
+                files[name].write(out)
+                if name == encoding and out:
+                    yield out
+            for f in files.values():
+                f.close()
+            self._replace_cache(tmp_files)
+            if on_complete is not None:
+                on_complete()
+        finally:
+            for f in files.values():
+                f.close()
+            for tmp_file in tmp_files.values():
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
     def generate_by_template(self,rss_list: dict, template: str, title: str = "Mp-We-Rss",link: str = "https://github.com/rachelos/we-mp-rss",description: str = "RSS频道",language: str = "zh-CN",image_url:str=""):
             from core.lax import TemplateParser
             template = TemplateParser(template)
@@ -319,23 +655,29 @@ class RSS:
             pass
     def clear_cache(self,mp_id:str=""):
 
-        """清除所有缓存文件
+        """清除缓存文件
         
-        删除data/cache/rss和data/cache/content目录中包含'mp_id'的文件
-        保持与现有方法相同的路径安全检查机制
+        删除公众号 mp_id 缓存目录中的文件（含预压缩文件和版本文件），不传 mp_id 时清除全部订阅缓存；
+        正在写入的临时文件保留，由写入方自行替换或删除
         """
-        import shutil
-        
-        # 清除rss缓存目录
-        if os.path.exists(self.cache_dir):
-            for filename in os.listdir(self.cache_dir):
-                if f'{mp_id}_' not in filename:
+        if mp_id:
+            shard_dirs = [self.shard_dir(mp_id)]
+        elif os.path.exists(self.cache_dir):
+            # 根目录中是旧版本未分目录的缓存文件
+            shard_dirs = [self.cache_dir] + [entry.path for entry in os.scandir(self.cache_dir) if entry.is_dir()]
+        else:
+            shard_dirs = []
+        for shard_dir in shard_dirs:
+            try:
+                entries = list(os.scandir(shard_dir))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".tmp") or not entry.is_file():
                     continue
-                file_path = os.path.normpath(f"{self.cache_dir}/{filename}")
-                if not file_path.startswith(self.cache_dir):
-                    raise ValueError("Invalid file path: Path traversal detected.")
                 try:
-                    if os.path.isfile(file_path):
-                        os.unlink(file_path)
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
                 except Exception as e:
-                    print(f"Error deleting {file_path}: {e}")
\ No newline at end of file
+                    print(f"Error deleting {entry.path}: {e}")
@@ -0,0 +1,144 @@
+"""
+采集后预热订阅缓存
+
+采集完成（WxGather.Over）清除公众号的订阅缓存后，后台重新生成常用订阅的首页：
+该公众号、全部文章（all）和包含它的标签，每个订阅生成 rss.prewarm.formats 中的各格式（默认 rss/atom/json），
+条数为接口默认值，阅读器之后的请求直接命中缓存，不再等待生成。
+预热在有界线程池中执行（rss.prewarm.workers），同一公众号排队未开始时重复提交只执行一次；
+生成与阅读器请求共用 RSS_FLIGHTS，同一订阅不会同时生成两次。
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from core.print import print_info, print_warning
+
+DEFAULT_FORMATS = ("rss", "atom", "json")
+# 与 /feed 接口的默认条数一致，才能命中阅读器请求的缓存
+DEFAULT_LIMIT = 50
+RESULTS = ("rendered", "hit", "busy", "missing", "skipped", "failed")
+
+
+def _formats(value) -> list:
+    """rss.prewarm.formats 可以是列表或逗号分隔的字符串"""
+    if not value:
+        return list(DEFAULT_FORMATS)
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(ext).strip() for ext in value if str(ext).strip()]
+
+
+class FeedPrewarmer:
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = set()
+        self._futures = set()
+        self.runs = 0
+        self.results = dict.fromkeys(RESULTS, 0)
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.total_duration = 0.0
+        # 阅读器请求：直接输出缓存或304 / 需要等待生成
+        self.reader_hits = 0
+        self.reader_misses = 0
+
+    def submit(self, mp_id: str) -> bool:
+        """排队预热公众号相关的订阅，未启用、没有公众号或已在排队时返回False"""
+        from core.config import cfg
+        if not mp_id or not cfg.get("rss.prewarm.enable", True):
+            return False
+        with self._lock:
+            if mp_id in self._pending:
+                return False
+            self._pending.add(mp_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="rss-prewarm")
+            future = self._executor.submit(self._run, mp_id)
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return True
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def variants(self, session, mp_id: str) -> list:
+        """需要预热的订阅 [(feed_id, tag_id, ext), ...]"""
+        from core.config import cfg
+        from core.tag_feeds import TAG_FEEDS
+        scopes = [(mp_id, None), ("all", None)] + [(None, tag_id) for tag_id in TAG_FEEDS.owners(session, mp_id)]
+        formats = _formats(cfg.get("rss.prewarm.formats", None))
+        return [(feed_id, tag_id, ext) for feed_id, tag_id in scopes for ext in formats]
+
+    def _run(self, mp_id: str):
+        # 开始后再有提交（又一次采集）需要重新预热
+        with self._lock:
+            self._pending.discard(mp_id)
+        from apis.rss import render_feed
+        from core.config import cfg
+        from core.db import DB
+        start = time.perf_counter()
+        limit = int(cfg.get("rss.prewarm.limit", DEFAULT_LIMIT))
+        try:
+            with DB.get_session_factory()() as session:
+                variants = self.variants(session, mp_id)
+        except Exception as e:
+            print_warning(f"预热订阅失败 {mp_id}: {e}")
+            with self._lock:
+                self.results["failed"] += 1
+            return
+        counts = dict.fromkeys(RESULTS, 0)
+        for feed_id, tag_id, ext in variants:
+            try:
+                result = render_feed(feed_id=feed_id, tag_id=tag_id, ext=ext, limit=limit)
+            except Exception as e:
+                print_warning(f"预热订阅失败 {tag_id or feed_id}.{ext}: {e}")
+                result = "failed"
+            counts[result] += 1
+        duration = time.perf_counter() - start
+        with self._lock:
+            self.runs += 1
+            for result, count in counts.items():
+                self.results[result] += count
+            self.last_duration = duration
+            self.max_duration = max(self.max_duration, duration)
+            self.total_duration += duration
+        print_info(f"预热订阅 {mp_id}: {len(variants)}个 生成{counts['rendered']} 已是最新{counts['hit']} "
+                   f"耗时{duration:.2f}秒")
+
+    def record_request(self, hit: bool) -> None:
+        """记录一次阅读器请求是否命中缓存"""
+        if hit:
+            self.reader_hits += 1
+        else:
+            self.reader_misses += 1
+
+    def flush(self, timeout: float = None) -> None:
+        """等待已提交的预热全部完成"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout)
+
+    def stats(self) -> dict:
+        requests = self.reader_hits + self.reader_misses
+        return {
+            "pending": len(self._pending),
+            "runs": self.runs,
+            **self.results,
+            "last_ms": round(self.last_duration * 1000, 1),
+            "avg_ms": round(self.total_duration * 1000 / self.runs, 1) if self.runs else 0.0,
+            "max_ms": round(self.max_duration * 1000, 1),
+            "reader_hits": self.reader_hits,
+            "reader_misses": self.reader_misses,
+            "hit_ratio": round(self.reader_hits / requests, 4) if requests else None,
+        }
+
+
+def _workers() -> int:
+    from core.config import cfg
+    return int(cfg.get("rss.prewarm.workers", 2))
+
+
+RSS_PREWARM = FeedPrewarmer(workers=_workers())
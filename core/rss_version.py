@@ -0,0 +1,69 @@
+"""
+RSS 数据版本
+
+按订阅范围（公众号 / 标签 / 全部，关键词搜索沿用所在范围）计算数据版本：
+范围内文章的最大 updated_at_millis 和文章数，以及公众号/标签本身的更新时间。
+文章新增、修改（core/db.py 中的映射事件和 upsert_articles 会刷新 updated_at_millis）、删除都会改变版本，
+apis/rss.py 据此生成 ETag / Last-Modified，版本不变时返回 304 或直接输出缓存文件，不再读取文章。
+
+读取量与文章数无关：文章数读取 feed_stats，最大更新时间走 (mp_id, updated_at_millis) 索引，
+标签按关联公众号逐个取最大值。
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    # 范围内文章及公众号/标签的最大更新时间（毫秒）
+    updated_at_millis: int = 0
+    # 范围内文章数（含已删除状态，与 RSS 查询一致）
+    count: int = 0
+
+    @property
+    def last_modified(self) -> int:
+        """Last-Modified 对应的时间戳（秒）"""
+        return self.updated_at_millis // 1000
+
+    def etag(self, *parts) -> str:
+        """数据版本加上输出参数（缓存名、格式、配置等）的弱 ETag，同一版本重新生成时内容可能只有生成时间不同"""
+        digest = hashlib.sha1(repr((self.updated_at_millis, self.count) + parts).encode("utf-8")).hexdigest()
+        return f'W/"{digest[:20]}"'
+
+
+def _millis(value) -> int:
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return 0
+
+
+def data_version(session, feed_id: str = None, tag_id: str = None) -> DataVersion:
+    """计算公众号（feed_id）、标签（tag_id）或全部文章的数据版本"""
+    from core.feed_stats import EMPTY, FEED_STATS
+    from core.models.article import Article
+    from core.models.feed import Feed
+    from core.models.tags import Tags
+    from core.models.tag_feeds import TagFeed
+    from core.tag_feeds import TAG_FEEDS
+    a = Article.__table__
+    conn = session.connection()
+    if feed_id not in ("all", None):
+        latest = conn.execute(select(func.max(a.c.updated_at_millis)).where(a.c.mp_id == feed_id)).scalar()
+        count = FEED_STATS.get_many(session, [feed_id]).get(feed_id, EMPTY)["article_count"]
+        updated_at = session.query(Feed.updated_at).filter(Feed.id == feed_id).scalar()
+        return DataVersion(max(latest or 0, _millis(updated_at)), int(count or 0))
+    tag = session.query(Tags.updated_at).filter(Tags.id == tag_id).first() if tag_id is not None else None
+    if tag is not None:
+        # 逐个关联公众号取最大更新时间，每个公众号只读取一个索引项
+        t = TagFeed.__table__
+        per_feed = select(func.max(a.c.updated_at_millis)).where(a.c.mp_id == t.c.feed_id).scalar_subquery()
+        latest = conn.execute(select(func.max(per_feed)).where(t.c.tag_id == tag_id)).scalar()
+        stats = FEED_STATS.get_many(session, TAG_FEEDS.feed_ids(session, tag_id))
+        count = sum(s["article_count"] or 0 for s in stats.values())
+        return DataVersion(max(latest or 0, _millis(tag.updated_at)), int(count))
+    # 全部文章（标签不存在时 RSS 也输出全部文章）
+    latest = conn.execute(select(func.max(a.c.updated_at_millis))).scalar()
+    return DataVersion(int(latest or 0), FEED_STATS.totals(session)["article_count"])
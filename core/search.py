@@ -0,0 +1,413 @@
+"""
+文章全文检索
+
+按数据库类型选择索引实现，索引覆盖标题、摘要和正文纯文本:
+    sqlite      article_search 映射表 + FTS5 虚拟表 article_search_fts，中文按二元切分(bigram)后写入
+    mysql       article_search 表 + FULLTEXT 索引（ngram 分词器）
+    postgresql  article_search 表 + tsvector 列（GIN 索引），中文同样按二元切分
+
+索引表不存在、回填未完成或 search.enabled 关闭时回退为标题 LIKE 匹配。
+文章新增/修改/删除时由 core.db 中的映射事件和 Db.upsert_articles 增量维护，
+已有数据使用 tools/search_backfill.py 回填。
+"""
+import asyncio
+import html
+import operator
+import re
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import bindparam, column, select, text
+
+from core.config import cfg
+from core.models.article import Article
+from core.models.base import DATA_STATUS
+from core.print import print_info, print_warning
+
+SEARCH_TABLE = "article_search"
+SQLITE_FTS_TABLE = "article_search_fts"
+# 回填进度（最后一批的文章id），中断后从这里继续；有进度记录时索引不完整，不用于搜索
+SEARCH_STATE_TABLE = "article_search_state"
+
+# CJK 统一表意文字（含扩展A和兼容区），连续的汉字按二元切分
+_CJK = "㐀-䶿一-鿿豈-﫿"
+_TOKEN_RE = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+_TAG_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>|<[^>]+>", re.S | re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def html_to_text(content: Optional[str]) -> str:
+    """去掉HTML标签，得到用于索引的正文纯文本"""
+    if not content:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", content))).strip()
+
+
+def bigram_tokens(text_: Optional[str]) -> List[str]:
+    """中文连续字符切分为二元词，英文和数字按单词切分并转小写"""
+    tokens = []
+    for word in _TOKEN_RE.findall(text_ or ""):
+        if not _CJK_RE.match(word):
+            tokens.append(word.lower())
+        elif len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(map(operator.add, word, word[1:]))
+    return tokens
+
+
+def bigram_text(text_: Optional[str]) -> str:
+    return " ".join(bigram_tokens(text_))
+
+
+def split_keyword(keyword: str) -> List[str]:
+    """按空格、-、| 拆分关键词，与原 LIKE 搜索的规则一致，多个词之间为“或”关系"""
+    words = keyword.replace("-", " ").replace("|", " ").split(" ")
+    return [w for w in words if w.strip()]
+
+
+def _on_event_loop() -> bool:
+    """当前线程是否正在运行事件循环"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class SearchIndex:
+    """全文检索索引，按主库类型选择实现"""
+
+    def __init__(self, db=None, recheck_interval: int = 60):
+        self._db = db
+        self.recheck_interval = recheck_interval
+        self.max_body_chars = int(cfg.get("search.max_body_chars", 20000))
+        # 按数据库记录索引状态: {url: (索引表是否存在, 回填是否完成, 检查时间)}
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from core.db import DB
+            self._db = DB
+        return self._db
+
+    @property
+    def engine(self):
+        return self.db.engine
+
+    @property
+    def dialect(self) -> str:
+        return self.engine.dialect.name
+
+    def stale(self, engine=None) -> bool:
+        """索引状态的缓存是否已过期，available() 需要重新检查（检查会访问数据库）"""
+        engine = engine if engine is not None else self.engine
+        if not cfg.get("search.enabled", True) or engine is None:
+            return False
+        checked_at = self._checked.get(str(engine.url), (False, False, 0.0))[2]
+        return time.monotonic() - checked_at >= self.recheck_interval
+
+    def _status(self, engine) -> tuple:
+        """
+        返回 (索引表是否存在, 回填是否完成)，结果缓存 recheck_interval 秒
+        在事件循环线程（AsyncDb.run_sync 的回调）中只读取缓存，检查由 AsyncDb.run_sync 预先在线程池中完成
+        """
+        key = str(engine.url)
+        exists, complete, checked_at = self._checked.get(key, (False, False, 0.0))
+        if time.monotonic() - checked_at < self.recheck_interval or _on_event_loop():
+            return exists, complete
+        with self._lock:
+            try:
+                exists, complete = self._inspect(engine)
+            except Exception as e:
+                print_warning(f"检查全文索引失败: {e}")
+                exists, complete = False, False
+            self._checked[key] = (exists, complete, time.monotonic())
+        return exists, complete
+
+    @staticmethod
+    def _inspect(engine) -> tuple:
+        from sqlalchemy import inspect
+        dialect = engine.dialect.name
+        name = SQLITE_FTS_TABLE if dialect == "sqlite" else SEARCH_TABLE
+        inspector = inspect(engine)
+        if dialect not in ("sqlite", "mysql", "postgresql") or not inspector.has_table(name):
+            return False, False
+        if not inspector.has_table(SEARCH_STATE_TABLE):
+            return True, True
+        with engine.connect() as conn:
+            row = conn.execute(text(f"SELECT value FROM {SEARCH_STATE_TABLE} WHERE name='backfill'")).fetchone()
+        return True, row is None
+
+    def writable(self, engine=None) -> bool:
+        """索引表已存在，回填进行中也要维护新增和修改的文章"""
+        engine = engine if engine is not None else self.engine
+        if not cfg.get("search.enabled", True) or engine is None:
+            return False
+        return self._status(engine)[0]
+
+    def available(self, engine=None) -> bool:
+        """
+        索引表已存在、回填已完成且未关闭全文检索时可用于搜索；
+        回填进行中或中断后索引不完整，继续使用 LIKE 搜索，避免未索引的文章从结果中消失
+        """
+        engine = engine if engine is not None else self.engine
+        if not cfg.get("search.enabled", True) or engine is None:
+            return False
+        exists, complete = self._status(engine)
+        return exists and complete
+
+    def _reset(self):
+        self._checked.pop(str(self.engine.url), None)
+
+    def ensure(self) -> bool:
+        """创建索引表，已存在时跳过；返回本次是否新建"""
+        from sqlalchemy import inspect
+        dialect = self.dialect
+        name = SQLITE_FTS_TABLE if dialect == "sqlite" else SEARCH_TABLE
+        if inspect(self.engine).has_table(name):
+            return False
+        with self.engine.begin() as conn:
+            if dialect == "sqlite":
+                conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                                     "(rowid INTEGER PRIMARY KEY, article_id VARCHAR(255) NOT NULL UNIQUE)")
+                conn.exec_driver_sql(f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} "
+                                     "USING fts5(title, body, tokenize='unicode61')")
+            elif dialect == "mysql":
+                conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                                     "article_id VARCHAR(255) NOT NULL PRIMARY KEY, title TEXT, body MEDIUMTEXT, "
+                                     "FULLTEXT KEY ft_article_search (title, body) WITH PARSER ngram"
+                                     ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4")
+            elif dialect == "postgresql":
+                conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                                     "(article_id VARCHAR(255) PRIMARY KEY, tsv tsvector)")
+                conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_tsv ON {SEARCH_TABLE} USING GIN (tsv)")
+            else:
+                print_warning(f"{dialect} 不支持全文索引，继续使用LIKE搜索")
+                return False
+        self._reset()
+        print_info(f"全文索引表已创建: {name}")
+        return True
+
+    def drop(self):
+        """删除索引表（重建索引时使用）"""
+        with self.engine.begin() as conn:
+            if self.dialect == "sqlite":
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_STATE_TABLE}")
+        self._reset()
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def _document(self, row) -> tuple:
+        get = row.get if isinstance(row, dict) else (lambda k: getattr(row, k, None))
+        title = get("title") or ""
+        body = " ".join(filter(None, [get("description"), html_to_text(get("content"))]))
+        return str(get("id")), title, body[:self.max_body_chars]
+
+    def index(self, conn, rows: Iterable) -> int:
+        """写入或更新文章的索引，rows 为文章对象或字典（需含 id/title/description/content）"""
+        if not self.writable(conn.engine):
+            return 0
+        docs = [self._document(r) for r in rows]
+        docs = [d for d in docs if d[0]]
+        if not docs:
+            return 0
+        dialect = conn.engine.dialect.name
+        if dialect == "sqlite":
+            ids = [d[0] for d in docs]
+            self.remove(conn, ids)
+            conn.execute(text(f"INSERT INTO {SEARCH_TABLE} (article_id) VALUES (:id)"), [{"id": i} for i in ids])
+            rowids = dict(conn.execute(
+                text(f"SELECT article_id, rowid FROM {SEARCH_TABLE} WHERE article_id IN :ids")
+                .bindparams(bindparam("ids", expanding=True)), {"ids": ids}).all())
+            conn.execute(text(f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, body) VALUES (:rowid, :title, :body)"),
+                         [{"rowid": rowids[i], "title": bigram_text(t), "body": bigram_text(b)} for i, t, b in docs])
+        elif dialect == "mysql":
+            conn.execute(text(f"REPLACE INTO {SEARCH_TABLE} (article_id, title, body) VALUES (:id, :title, :body)"),
+                         [{"id": i, "title": t, "body": b} for i, t, b in docs])
+        elif dialect == "postgresql":
+            conn.execute(text(f"INSERT INTO {SEARCH_TABLE} (article_id, tsv) VALUES (:id, "
+                              "setweight(to_tsvector('simple', :title), 'A') || setweight(to_tsvector('simple', :body), 'B')) "
+                              "ON CONFLICT (article_id) DO UPDATE SET tsv = EXCLUDED.tsv"),
+                         [{"id": i, "title": bigram_text(t), "body": bigram_text(b)} for i, t, b in docs])
+        return len(docs)
+
+    def index_object(self, conn, target) -> int:
+        """映射事件中写入单篇文章的索引，正文未加载时从正文表读取"""
+        from core.content_store import bodies_of
+        content = bodies_of(target, conn)[0]
+        return self.index(conn, [{"id": target.id, "title": target.title,
+                                  "description": target.description, "content": content}])
+
+    def remove(self, conn, article_ids: List[str]) -> None:
+        if not article_ids or not self.writable(conn.engine):
+            return
+        ids = bindparam("ids", expanding=True)
+        if conn.engine.dialect.name == "sqlite":
+            conn.execute(text(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN "
+                              f"(SELECT rowid FROM {SEARCH_TABLE} WHERE article_id IN :ids)").bindparams(ids),
+                         {"ids": list(article_ids)})
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE article_id IN :ids").bindparams(ids),
+                     {"ids": list(article_ids)})
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def _match_expr(self, keyword: str) -> Optional[str]:
+        """把关键词转换为对应数据库的全文检索表达式，无有效词时返回None"""
+        words = split_keyword(keyword)
+        dialect = self.dialect
+        if dialect == "mysql":
+            # ngram 分词器下，双引号短语按连续字符匹配
+            terms = [w.replace('"', " ").strip() for w in words]
+            return " ".join(f'"{t}"' for t in terms if t) or None
+        phrases = []
+        for word in words:
+            tokens = bigram_tokens(word)
+            if not tokens:
+                continue
+            if dialect == "sqlite":
+                # 相邻二元词组成短语即连续子串匹配；单个汉字用前缀匹配
+                if len(tokens) == 1 and _CJK_RE.match(tokens[0]) and len(tokens[0]) == 1:
+                    phrases.append(f"{tokens[0]}*")
+                else:
+                    phrases.append('"' + " ".join(tokens) + '"')
+            else:
+                if len(tokens) == 1 and _CJK_RE.match(tokens[0]) and len(tokens[0]) == 1:
+                    phrases.append(f"{tokens[0]}:*")
+                else:
+                    phrases.append("(" + " <-> ".join(tokens) + ")")
+        if not phrases:
+            return None
+        return " OR ".join(phrases) if dialect == "sqlite" else " | ".join(phrases)
+
+    def ranked(self, keyword: str):
+        """返回 (article_id, score) 子查询，score 越大越相关；关键词无效时返回None"""
+        expr = self._match_expr(keyword)
+        if expr is None:
+            return None
+        if self.dialect == "sqlite":
+            # bm25 数值越小越相关，标题权重高于正文
+            sql = (f"SELECT {SEARCH_TABLE}.article_id AS article_id, -bm25({SQLITE_FTS_TABLE}, 5.0, 1.0) AS score "
+                   f"FROM {SQLITE_FTS_TABLE} JOIN {SEARCH_TABLE} ON {SEARCH_TABLE}.rowid = {SQLITE_FTS_TABLE}.rowid "
+                   f"WHERE {SQLITE_FTS_TABLE} MATCH :search_q")
+        elif self.dialect == "mysql":
+            sql = (f"SELECT article_id, MATCH(title, body) AGAINST(:search_q IN BOOLEAN MODE) AS score "
+                   f"FROM {SEARCH_TABLE} WHERE MATCH(title, body) AGAINST(:search_q IN BOOLEAN MODE)")
+        else:
+            sql = (f"SELECT article_id, ts_rank(tsv, to_tsquery('simple', :search_q)) AS score "
+                   f"FROM {SEARCH_TABLE} WHERE tsv @@ to_tsquery('simple', :search_q)")
+        return text(sql).bindparams(search_q=expr) \
+            .columns(column("article_id"), column("score")).subquery("search_rank")
+
+    def condition(self, keyword: str):
+        """文章筛选条件，可直接用于 query.filter"""
+        ranked = self.ranked(keyword)
+        if ranked is None:
+            return Article.id.is_(None)
+        return Article.id.in_(select(ranked.c.article_id))
+
+    def order_by_rank(self, query, keyword: str):
+        """按相关度排序（相关度相同时按发布时间倒序）"""
+        ranked = self.ranked(keyword)
+        if ranked is None:
+            return query.filter(Article.id.is_(None))
+        return query.join(ranked, ranked.c.article_id == Article.id) \
+            .order_by(ranked.c.score.desc(), Article.publish_time.desc(), Article.id.desc())
+
+    def setup(self) -> None:
+        """
+        初始化时调用：索引表不存在时，文章数不超过 search.auto_backfill_limit 则直接建立索引，
+        否则保持 LIKE 搜索，提示手动执行 tools/search_backfill.py
+        """
+        if not cfg.get("search.enabled", True) or self.dialect not in ("sqlite", "mysql", "postgresql"):
+            return
+        from sqlalchemy import func, inspect
+        name = SQLITE_FTS_TABLE if self.dialect == "sqlite" else SEARCH_TABLE
+        if inspect(self.engine).has_table(name):
+            return
+        with self.engine.connect() as conn:
+            total = conn.execute(select(func.count()).select_from(Article.__table__)).scalar() or 0
+        limit = int(cfg.get("search.auto_backfill_limit", 50000))
+        if total > limit:
+            print_warning(f"文章数 {total} 超过 {limit}，全文索引未自动建立，请执行 python tools/search_backfill.py")
+            return
+        done = self.backfill()
+        print_info(f"全文索引已建立，共 {done} 篇文章")
+
+    # ------------------------------------------------------------------
+    # 回填
+    # ------------------------------------------------------------------
+    def _load_checkpoint(self) -> Optional[str]:
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"CREATE TABLE IF NOT EXISTS {SEARCH_STATE_TABLE} "
+                                 "(name VARCHAR(50) NOT NULL PRIMARY KEY, value VARCHAR(255))")
+            row = conn.execute(text(f"SELECT value FROM {SEARCH_STATE_TABLE} WHERE name='backfill'")).fetchone()
+        return row[0] if row else None
+
+    def _save_checkpoint(self, conn, last_id: Optional[str]):
+        conn.execute(text(f"DELETE FROM {SEARCH_STATE_TABLE} WHERE name='backfill'"))
+        if last_id is not None:
+            conn.execute(text(f"INSERT INTO {SEARCH_STATE_TABLE} (name, value) VALUES ('backfill', :v)"), {"v": last_id})
+
+    def backfill(self, batch_size: int = 1000, rebuild: bool = False, progress=None) -> int:
+        """
+        为已有文章建立索引，按id顺序分批读取；每批写入后记录进度，
+        中断后再次执行从上次的进度继续，完成后清除进度。
+        建表前先写入进度记录，回填完成前各进程的 available() 都返回False，搜索继续使用 LIKE
+
+        参数:
+            batch_size: 每批处理的文章数
+            rebuild: 先删除索引表和进度再完整重建
+            progress: 进度回调 progress(本次已处理数, 耗时秒)
+        """
+        if rebuild:
+            self.drop()
+        last_id = self._load_checkpoint()
+        if last_id is None:
+            # 空字符串表示回填已开始、尚未写入任何一批
+            with self.engine.begin() as conn:
+                self._save_checkpoint(conn, "")
+        elif last_id:
+            print_info(f"全文索引回填从上次中断处继续: {last_id}")
+        self.ensure()
+        self._reset()
+        start = time.perf_counter()
+        done = 0
+        from core.content_store import STORE
+        columns = [Article.id, Article.title, Article.description]
+        while True:
+            with self.engine.connect() as conn:
+                stmt = select(*columns).where(Article.status != DATA_STATUS.DELETED).order_by(Article.id).limit(batch_size)
+                if last_id:
+                    stmt = stmt.where(Article.id > last_id)
+                rows = [dict(r._mapping) for r in conn.execute(stmt)]
+                bodies = STORE.get_many(conn, [r["id"] for r in rows])
+                for r in rows:
+                    r["content"] = bodies.get(r["id"], (None, None))[0]
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            with self.engine.begin() as conn:
+                self.index(conn, rows)
+                self._save_checkpoint(conn, last_id)
+            done += len(rows)
+            if progress:
+                progress(done, time.perf_counter() - start)
+        with self.engine.begin() as conn:
+            self._save_checkpoint(conn, None)
+            if self.dialect == "sqlite":
+                conn.exec_driver_sql(f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('optimize')")
+        self._reset()
+        return done
+
+
+# 全局检索索引实例
+SEARCH = SearchIndex()
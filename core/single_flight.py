@@ -0,0 +1,94 @@
+"""
+请求合并（single flight）
+
+同一个键同时只有一个调用方（leader）执行耗时操作，其余调用方（follower）等待它结束后直接使用它的结果，
+例如同一订阅缓存失效后的并发请求只重新生成一次。
+线程中用 wait() 等待，协程中用 await wait_async() 等待，不占用线程池；leader 结束时必须调用 done()。
+leader 超过 timeout 未结束（异常退出、连接中断未清理）时视为放弃，下一个调用方成为新的 leader。
+"""
+import asyncio
+import threading
+import time
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Flight:
+    """一次合并的执行，ok 表示 leader 是否成功完成"""
+
+    def __init__(self, owner, key):
+        self._owner = owner
+        self.key = key
+        self.started = time.monotonic()
+        self.ok = False
+        self._event = threading.Event()
+        self._waiters = []  # (loop, future)
+
+    @property
+    def finished(self) -> bool:
+        return self._event.is_set()
+
+    def done(self, ok: bool = True) -> None:
+        """leader 结束，唤醒所有等待方；重复调用时以第一次为准"""
+        with self._owner._lock:
+            if self._event.is_set():
+                return
+            self.ok = ok
+            if self._owner._flights.get(self.key) is self:
+                del self._owner._flights[self.key]
+            self._event.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+    def wait(self, timeout: float = None) -> bool:
+        """线程中等待 leader 结束，返回是否成功完成（超时返回False）"""
+        return self._event.wait(timeout) and self.ok
+
+    async def wait_async(self, timeout: float = None) -> bool:
+        """协程中等待 leader 结束，返回是否成功完成（超时返回False）"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._owner._lock:
+            if self._event.is_set():
+                return self.ok
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.ok
+
+
+class SingleFlight:
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def join(self, key):
+        """
+        加入 key 对应的执行，返回 (flight, 是否为leader)；
+        leader 执行后调用 flight.done(ok)，follower 等待 flight.wait()/wait_async() 后读取结果
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and time.monotonic() - flight.started < self.timeout:
+                self.followers += 1
+                return flight, False
+            flight = Flight(self, key)
+            self._flights[key] = flight
+            self.leaders += 1
+            return flight, True
+
+    def stats(self) -> dict:
+        return {"running": len(self._flights), "leaders": self.leaders, "followers": self.followers}
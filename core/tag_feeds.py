@@ -0,0 +1,169 @@
+"""
+标签/消息任务与公众号的关联表
+
+Tags.mps_id 和 MessageTask.mps_id 以 JSON 保存关联的公众号（[{"id": ..., "mp_name": ...}, ...]），
+接口仍按 JSON 读写；写入时由 core/db.py 中的映射事件同步到 tag_feeds / message_task_feeds，
+按标签筛选文章时读取关联表（见 article_filter），不再逐次解析 JSON。
+关联表为空时（升级后首次启动）由 setup 按 JSON 回填。
+"""
+import json
+import time
+from typing import Dict, Iterable, List
+
+from sqlalchemy import case, delete, exists, func, insert, select
+
+from core.models.message_task_feeds import MessageTaskFeed
+from core.models.tag_feeds import TagFeed
+from core.print import print_info, print_warning
+
+# 关联公众号的有效文章占全部文章的比例不低于该值时，按发布时间索引顺序扫描并用关联表判断归属
+EXISTS_MIN_SHARE = 0.05
+# 占比的缓存时间（秒），只影响查询方式的选择，不影响结果
+SHARE_TTL = 300
+
+
+def parse_mps_id(value) -> List[str]:
+    """解析 mps_id JSON，兼容 [{"id": ...}] 和 ["id", ...] 两种格式，格式错误时返回空列表"""
+    if not value:
+        return []
+    try:
+        data = json.loads(value) if isinstance(value, str) else value
+    except (json.JSONDecodeError, TypeError):
+        return []
+    if not isinstance(data, list):
+        return []
+    ids = [str(item.get("id") if isinstance(item, dict) else item) for item in data]
+    return [id for id in dict.fromkeys(ids) if id and id != "None"]
+
+
+class FeedMembership:
+    """一张 (owner_id, feed_id) 关联表的读写，写入方法在调用方的连接上执行"""
+
+    def __init__(self, model, owner_field: str, source):
+        self.model = model
+        self.table = model.__table__
+        self.owner = self.table.c[owner_field]
+        self.feed = self.table.c.feed_id
+        # mps_id 所在的模型（Tags / MessageTask）
+        self.source = source
+        # {owner_id: (关联公众号集合, 文章占比是否较高, 计算时间)}，按本次读取的关联公众号校验，
+        # 其它进程修改关联后集合不同，不会沿用旧结果
+        self._wide = {}
+
+    @property
+    def source_model(self):
+        return self.source()
+
+    def sync(self, conn, owner_id: str, mps_id) -> None:
+        """按 mps_id JSON 重写关联"""
+        self.remove(conn, owner_id)
+        feed_ids = parse_mps_id(mps_id)
+        if feed_ids:
+            conn.execute(insert(self.table), [{self.owner.key: owner_id, "feed_id": id} for id in feed_ids])
+
+    def remove(self, conn, owner_id: str) -> None:
+        conn.execute(delete(self.table).where(self.owner == owner_id))
+
+    def members(self, owner_id: str):
+        """关联公众号id的子查询，用于 Article.mp_id.in_(...) / JOIN"""
+        return select(self.feed).where(self.owner == owner_id)
+
+    def feed_ids(self, session, owner_id: str) -> List[str]:
+        return [row[0] for row in session.connection().execute(self.members(owner_id))]
+
+    def feeds(self, session, owner_id: str) -> list:
+        """关联的公众号对象"""
+        from core.models.feed import Feed
+        return session.query(Feed).filter(Feed.id.in_(self.members(owner_id))).all()
+
+    def owners(self, session, feed_id: str) -> List[str]:
+        """关联了该公众号的标签/任务id"""
+        return [row[0] for row in session.connection().execute(select(self.owner).where(self.feed == feed_id))]
+
+    def feed_map(self, session, owner_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """一次读取多个标签/任务的关联公众号 {owner_id: [feed_id, ...]}"""
+        ids = list(dict.fromkeys(owner_ids))
+        result = {id: [] for id in ids}
+        if ids:
+            for owner_id, feed_id in session.connection().execute(
+                    select(self.owner, self.feed).where(self.owner.in_(ids))):
+                result[owner_id].append(feed_id)
+        return result
+
+    def article_filter(self, session, owner_id: str, feed_ids: List[str] = None):
+        """
+        按标签/任务筛选文章的条件，没有关联公众号时返回None
+        关联公众号的文章占比高时用 EXISTS 关联表：按发布时间索引顺序扫描，凑够一页即停止；
+        占比低时用公众号id列表：逐个公众号走索引读取后排序，避免扫描大量无关文章
+        """
+        from core.models.article import Article
+        feed_ids = self.feed_ids(session, owner_id) if feed_ids is None else feed_ids
+        if not feed_ids:
+            return None
+        if self._is_wide(session, owner_id, feed_ids):
+            return exists().where(self.owner == owner_id, self.feed == Article.mp_id)
+        return Article.mp_id.in_(feed_ids)
+
+    def _is_wide(self, session, owner_id: str, feed_ids: List[str]) -> bool:
+        key = frozenset(feed_ids)
+        cached, wide, checked_at = self._wide.get(owner_id, (None, False, 0.0))
+        if cached == key and time.monotonic() - checked_at < SHARE_TTL:
+            return wide
+        from core.models.feed_stats import FeedStats
+        t = FeedStats.__table__
+        total, members = session.connection().execute(select(
+            func.sum(t.c.active_count), func.sum(case((t.c.mp_id.in_(feed_ids), t.c.active_count), else_=0)))).first()
+        wide = bool(total) and (members or 0) >= total * EXISTS_MIN_SHARE
+        self._wide[owner_id] = (key, wide, time.monotonic())
+        return wide
+
+    def rebuild(self, conn) -> int:
+        """按 mps_id JSON 完整重建关联表，返回关联数"""
+        model = self.source_model
+        rows = []
+        for owner_id, mps_id in conn.execute(select(model.id, model.mps_id)):
+            rows.extend({self.owner.key: owner_id, "feed_id": id} for id in parse_mps_id(mps_id))
+        conn.execute(delete(self.table))
+        for i in range(0, len(rows), 500):
+            conn.execute(insert(self.table), rows[i:i + 500])
+        return len(rows)
+
+    def setup(self, engine) -> None:
+        """初始化时调用：关联表为空且已有数据时按 JSON 回填"""
+        model = self.source_model
+        with engine.begin() as conn:
+            if conn.execute(select(self.owner).limit(1)).first() is not None:
+                return
+            if conn.execute(select(model.id).where(model.mps_id.isnot(None)).limit(1)).first() is None:
+                return
+            total = self.rebuild(conn)
+        print_info(f"{self.table.name} 已按 mps_id 回填，共 {total} 条关联")
+
+
+def _tags():
+    from core.models.tags import Tags
+    return Tags
+
+
+def _message_tasks():
+    from core.models.message_task import MessageTask
+    return MessageTask
+
+
+TAG_FEEDS = FeedMembership(TagFeed, "tag_id", _tags)
+TASK_FEEDS = FeedMembership(MessageTaskFeed, "task_id", _message_tasks)
+
+
+def setup(engine=None) -> bool:
+    """回填两张关联表，全部成功时返回True"""
+    if engine is None:
+        from core.db import DB
+        engine = DB.engine
+    ok = True
+    for membership in (TAG_FEEDS, TASK_FEEDS):
+        try:
+            membership.setup(engine)
+        except Exception as e:
+            print_warning(f"回填 {membership.table.name} 失败: {e}")
+            ok = False
+    return ok
@@ -2,6 +2,7 @@ import threading
 import random
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from typing import Callable, Any, Optional
 from core.log import logger
 import uuid
@@ -165,6 +166,42 @@ class TaskScheduler:
                 logger.error(f"Failed to add cron job: {str(e)}")
                 raise
     
+    def add_interval_job(self,
+                         func: Callable,
+                         minutes: int,
+                         args: Optional[dict] = None,
+                         kwargs: Optional[dict] = None,
+                         job_id: Optional[str] = None,
+                         tag: str = ""
+                         ) -> str:
+        """
+        添加一个固定间隔执行的任务，间隔可以超过60分钟（cron表达式的 */n 只能在一小时内整除）
+        
+        :param func: 要执行的函数
+        :param minutes: 执行间隔（分钟）
+        :return: 任务ID
+        """
+        with self._lock:
+            job_id = job_id or str(uuid.uuid4())
+
+            def wrapped_func(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"Job {tag} {job_id} failed: {str(e)}")
+                    raise
+
+            job = self._scheduler.add_job(
+                wrapped_func,
+                trigger=IntervalTrigger(minutes=minutes),
+                args=args,
+                kwargs=kwargs,
+                id=str(job_id)
+            )
+            self._jobs[job.id] = job
+            logger.info(f"Successfully added job {tag} {job.id} every {minutes} minutes")
+            return job.id
+
     def remove_job(self, job_id: str) -> bool:
         """
         移除指定任务
@@ -66,6 +66,7 @@ class WxGather:
         return wx
     def __init__(self,is_add:bool=False):
         self.articles=[]
+        self._pending=[]
         self.is_add=is_add
         self._cookies={}
         self.start_time = None  # 记录开始时间
@@ -136,11 +137,31 @@ class WxGather:
                 }
                 if 'digest' in data:
                     art['description']=data['digest']
+                if callable(getattr(CallBack, "batch", None)):
+                    # 回调支持批量写入时先缓存，在每页结束时一次写入
+                    self._pending.append((CallBack.batch, art, Ext_Data))
+                    return
                 if CallBack(art):
                     art["ext"]=Ext_Data
                     # art.pop("content")
                     self.articles.append(art)
 
+    def FlushBack(self):
+        """批量写入FillBack缓存的文章"""
+        pending=getattr(self, "_pending", None)
+        if not pending:
+            return
+        self._pending=[]
+        groups={}
+        for batch,art,ext in pending:
+            groups.setdefault(batch,[]).append((art,ext))
+        for batch,items in groups.items():
+            results=batch([art for art,_ in items])
+            for (art,ext),ok in zip(items,results):
+                if ok:
+                    art["ext"]=ext
+                    self.articles.append(art)
+
     #通过公众号码平台接口查询公众号
     def search_Biz(self,kw:str="",limit=10,offset=0):
 
@@ -187,6 +208,7 @@ class WxGather:
     
     def Start(self,mp_id=None):
         self.articles=[]
+        self._pending=[]
         self.get_token()
         if self.token=="" or self.token is None:
              self.Error("请先扫码登录公众号平台")
@@ -200,6 +222,7 @@ class WxGather:
 
     def Item_Over(self,item=None,CallBack=None):
         print(f"item end")
+        self.FlushBack()
         _cookies=[{'name': c.name, 'value': c.value, 'domain': c.domain,'expiry':c.expires,'expires':c.expires} for c in self._cookies]
         _cookies.append({'name':'token','value':self.token})
         if CallBack is not None:
@@ -226,6 +249,7 @@ class WxGather:
         execution_time = 0
         if self.start_time is not None:
             execution_time = end_time - self.start_time
+        self.FlushBack()
         
         if getattr(self, 'articles', None) is not None:
             print(f"成功{len(self.articles)}条")
@@ -236,6 +260,9 @@ class WxGather:
             except:
                 pass
             rss.clear_cache(mp_id=mp_id)  
+            # 后台重新生成该公众号相关的常用订阅，阅读器请求直接命中缓存
+            from core.rss_prewarm import RSS_PREWARM
+            RSS_PREWARM.submit(mp_id)
         
         # 输出执行时间统计
         if execution_time > 0:
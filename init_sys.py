@@ -25,14 +25,42 @@ def init_user(_db: Db):
     except Exception as e:
         # print_error(f"Init error: {str(e)}")
         pass
-def sync_models():
-     # 同步模型到表结构
+def setup_derived() -> bool:
+     # 建立全文索引、关联表、公众号统计（表为空时按已有数据回填），全部成功时返回True
+         ok = True
+         try:
+             from core.search import SEARCH
+             SEARCH.setup()
+         except Exception as e:
+             print_error(f"建立全文索引失败: {e}")
+             ok = False
+         from core.tag_feeds import setup as setup_tag_feeds
+         if not setup_tag_feeds():
+             ok = False
+         try:
+             from core.feed_stats import FEED_STATS
+             FEED_STATS.setup()
+         except Exception as e:
+             print_error(f"建立公众号统计失败: {e}")
+             ok = False
+         return ok
+
+def sync_models(force: bool = False):
+     # 同步模型到表结构并回填派生数据，表结构指纹与模型一致时都跳过（启动参数 --force 强制同步）
+     # 指纹在回填完成后保存，回填失败或中断时下次启动重新执行
          from data_sync import DatabaseSynchronizer
-         DB.create_tables()
-         time.sleep(3)
+         start = time.perf_counter()
+         force = force or cfg.args.force
          synchronizer = DatabaseSynchronizer(db_url=cfg.get("db",""))
-         synchronizer.sync()
-         print_info("模型同步完成")
+         if force or not synchronizer.up_to_date():
+             DB.create_tables()
+             time.sleep(3)
+             synced = synchronizer.sync(force=True, save=False)
+             if setup_derived() and synced and not synchronizer.failed:
+                 synchronizer.save_fingerprint()
+         else:
+             print_info("表结构指纹未变化，跳过表结构同步")
+         print_info(f"模型同步完成，耗时 {time.perf_counter() - start:.2f}s")
 
      
 
@@ -3,6 +3,7 @@ import core.wx as wx
 import core.db as db
 from core.config import DEBUG,cfg
 from core.models.article import Article
+from core.print import print_error
 
 DB=db.Db(tag="文章采集API")
 
@@ -15,6 +16,17 @@ def UpdateArticle(art:dict,check_exist=False):
         mps_count=mps_count+1
         return True
     return False
+def UpdateArticles(arts:list,check_exist=False)->list:
+    """批量写入一页文章，返回与arts对应的是否新增；批量写入失败时逐篇写入，个别文章出错不影响整页"""
+    try:
+        result=DB.upsert_articles(arts,check_exist=check_exist)
+    except Exception as e:
+        print_error(f"批量写入文章失败，改为逐篇写入: {e}")
+        return [UpdateArticle(art,check_exist=check_exist) for art in arts]
+    inserted=set(result["inserted"])
+    return [f"{str(art.get('mp_id'))}-{art.get('id')}".replace("MP_WXS_","") in inserted for art in arts]
+# 采集时按页批量写入
+UpdateArticle.batch=UpdateArticles
 def Update_Over(data=None):
     print("更新完成")
     pass
\ No newline at end of file
@@ -343,10 +343,8 @@ class CascadeTaskDispatcher:
         # 获取任务关联的公众号
         session = DB.get_session()
         try:
-            mps_list = json.loads(task.mps_id) if task.mps_id else []
-            feed_ids = [mp["id"] for mp in mps_list]
-            
-            feeds = session.query(Feed).filter(Feed.id.in_(feed_ids)).all()
+            from core.tag_feeds import TASK_FEEDS
+            feeds = TASK_FEEDS.feeds(session, task.id)
             
             if not feeds:
                 print_warning(f"任务 {task.name} 没有关联公众号")
@@ -16,8 +16,7 @@ def fetch_articles_without_content():
     ga=WxGather().Model()
     try:
         # 查询content为空的文章
-        from sqlalchemy import or_
-        articles = session.query(Article).filter(or_(Article.content.is_(None), Article.content == "")).limit(10).all()
+        articles = session.query(Article).filter(Article.content_missing()).limit(10).all()
         
         if not articles:
             print_warning("暂无需要获取内容的文章")
@@ -103,9 +103,8 @@ def add_job(feeds:list[Feed]=None,task:MessageTask=None,isTest=False):
     pass
 import json
 def get_feeds(task:MessageTask=None):
-     mps = json.loads(task.mps_id)
-     ids=",".join([item["id"]for item in mps])
-     mps=wx_db.get_mps_list(ids)
+     from core.tag_feeds import TASK_FEEDS
+     mps=TASK_FEEDS.feeds(wx_db.get_session(), task.id)
      if len(mps)==0:
         mps=wx_db.get_all_mps()
      return mps
@@ -0,0 +1,30 @@
+from core.config import cfg
+from core.task import TaskScheduler
+from core.print import print_info, print_success, print_warning
+from core.db import DB, sqlite_maintenance
+
+scheduler = TaskScheduler()
+
+def do_maintenance():
+    """合并WAL日志并执行PRAGMA optimize"""
+    try:
+        result = sqlite_maintenance(DB.engine)
+        print_info(f"SQLite维护完成: {result}")
+    except Exception as e:
+        print_warning(f"SQLite维护失败: {e}")
+
+def start_sqlite_maintenance():
+    """
+    SQLite数据库定期维护任务
+
+    仅在使用SQLite时启用，间隔由 sqlite.maintenance_interval（分钟）控制，设为0关闭
+    """
+    if DB.engine is None or DB.engine.dialect.name != "sqlite":
+        return
+    interval = int(cfg.get("sqlite.maintenance_interval", 30))
+    if interval <= 0:
+        print_warning("SQLite定期维护未启用")
+        return
+    job_id = scheduler.add_interval_job(do_maintenance, minutes=interval, tag="SQLite维护")
+    scheduler.start()
+    print_success(f"已添加SQLite维护任务: {job_id}")
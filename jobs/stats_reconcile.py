@@ -0,0 +1,28 @@
+from core.config import cfg
+from core.task import TaskScheduler
+from core.print import print_info, print_success, print_warning
+from core.feed_stats import FEED_STATS
+
+scheduler = TaskScheduler()
+
+def do_reconcile():
+    """按文章表重建公众号统计，修正批量语句或异常中断造成的偏差"""
+    try:
+        total = FEED_STATS.rebuild()
+        print_info(f"公众号统计已校正，共 {total} 个公众号")
+    except Exception as e:
+        print_warning(f"公众号统计校正失败: {e}")
+
+def start_stats_reconcile():
+    """
+    公众号统计定期校正任务
+
+    执行时间由 stats.reconcile_cron 控制，设为空关闭
+    """
+    cron_expr = str(cfg.get("stats.reconcile_cron", "0 4 * * *") or "").strip()
+    if not cron_expr:
+        print_warning("公众号统计定期校正未启用")
+        return
+    job_id = scheduler.add_cron_job(do_reconcile, cron_expr=cron_expr, tag="统计校正")
+    scheduler.start()
+    print_success(f"已添加公众号统计校正任务: {job_id}")
@@ -45,6 +45,10 @@ if __name__ == '__main__':
         threading.Thread(target=start_all_task,daemon=False).start()
     else:
         print_warning("未开启定时任务")
+    from jobs.sqlite_maintenance import start_sqlite_maintenance
+    start_sqlite_maintenance()
+    from jobs.stats_reconcile import start_stats_reconcile
+    start_stats_reconcile()
     print("启动服务器")
     AutoReload=cfg.get("server.auto_reload",False)
     thread=cfg.get("server.threads",1)
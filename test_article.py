@@ -50,7 +50,7 @@ def testMarkDown():
     from core.models import Article
     from core.db import DB
     session=DB.get_session()
-    art=session.query(Article).filter(Article.content != None).order_by(Article.id.desc()).first()
+    art=session.query(Article).filter(~Article.content_missing()).order_by(Article.id.desc()).first()
     # print(art.content)
     from core.content_format import  format_content
     content= format_content(art.content,"markdown")
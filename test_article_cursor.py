@@ -0,0 +1,115 @@
+"""测试按发布时间的游标分页与偏移分页返回相同的文章
+
+publish_time 为空的文章无法编码进游标，两种翻页方式都不返回它们；
+这里在测试公众号下混入一篇没有发布时间的文章，逐页翻完并比较结果。
+在项目根目录执行: python test_article_cursor.py
+"""
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PREFIX = "test-cursor"
+MP_ID = f"MP_WXS_{PREFIX}"
+PUBLISH_TIMES = [4102444800, 4102444801, None, 4102444801, 4102444802, 4102444803]
+LIMIT = 2
+
+
+def seed():
+    from core.db import DB
+    from core.models import Feed
+    cleanup()
+    session = DB.get_session()
+    now = datetime.now()
+    session.add(Feed(id=MP_ID, mp_name=PREFIX, mp_cover="", mp_intro="", status=1, faker_id=PREFIX,
+                     created_at=now, updated_at=now))
+    session.commit()
+    for i, publish_time in enumerate(PUBLISH_TIMES):
+        DB.add_article({"id": str(i), "mp_id": MP_ID, "title": f"{PREFIX} {i}", "url": f"http://{PREFIX}/{i}",
+                        "pic_url": "", "description": f"摘要{i}", "content": f"<p>正文{i}</p>",
+                        "publish_time": publish_time})
+    # 入库时可能补全发布时间，这里直接置空
+    from core.models import Article
+    session.query(Article).filter(Article.id == f"{PREFIX}-2").update({Article.publish_time: None})
+    session.commit()
+
+
+def cleanup():
+    from core.db import DB
+    from core.models import Article, Feed
+    session = DB.get_session()
+    for article in session.query(Article).filter(Article.mp_id == MP_ID).all():
+        session.delete(article)
+    feed = session.get(Feed, MP_ID)
+    if feed is not None:
+        session.delete(feed)
+    session.commit()
+
+
+def expected(desc):
+    rows = [(t, f"{PREFIX}-{i}") for i, t in enumerate(PUBLISH_TIMES) if t is not None]
+    return [id for _t, id in sorted(rows, reverse=desc)]
+
+
+def pages(desc, use_cursor):
+    """逐页读取测试公众号的文章id"""
+    from core.db import DB
+    from core.models import Article
+    from apis.base import keyset_paginate, next_cursor
+    session = DB.get_session()
+    ids, cursor, offset = [], None, 0
+    while True:
+        query = session.query(Article).filter(Article.mp_id == MP_ID)
+        if use_cursor:
+            query = keyset_paginate(query, cursor, desc=desc)
+        else:
+            query = keyset_paginate(query, desc=desc).offset(offset)
+        rows = query.limit(LIMIT).all()
+        ids += [row.id for row in rows]
+        offset += LIMIT
+        cursor = next_cursor(rows, LIMIT)
+        if cursor is None or len(ids) > len(PUBLISH_TIMES):
+            return ids
+
+
+def test_cursor_matches_offset():
+    seed()
+    try:
+        for desc in (True, False):
+            by_offset = pages(desc, use_cursor=False)
+            by_cursor = pages(desc, use_cursor=True)
+            assert by_offset == expected(desc), f"偏移分页结果不对: {by_offset}"
+            assert by_cursor == by_offset, f"游标分页与偏移分页不一致: {by_cursor} != {by_offset}"
+    finally:
+        cleanup()
+
+
+def test_api_cursor_pages():
+    """文章列表接口按游标翻完所有有发布时间的文章"""
+    from fastapi.testclient import TestClient
+    import web
+    from core.auth import get_current_user_or_ak
+    web.app.dependency_overrides[get_current_user_or_ak] = lambda: {"username": "admin"}
+    seed()
+    try:
+        ids, cursor = [], None
+        with TestClient(web.app) as c:
+            while len(ids) <= len(PUBLISH_TIMES):
+                url = f"/api/v1/wx/articles?limit={LIMIT}&mp_id={MP_ID}" + (f"&cursor={cursor}" if cursor else "")
+                response = c.get(url)
+                assert response.status_code == 200, f"{url} 返回 {response.status_code}"
+                data = response.json()["data"]
+                ids += [article["id"] for article in data["list"]]
+                cursor = data["next_cursor"]
+                if not cursor:
+                    break
+        assert ids == expected(True), f"接口游标分页结果不对: {ids}"
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    test_cursor_matches_offset()
+    test_api_cursor_pages()
+    print("游标分页与偏移分页结果一致")
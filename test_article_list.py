@@ -0,0 +1,124 @@
+"""测试文章列表接口不读取正文（content / content_html）
+
+列表只加载 Article.LIST_FIELDS，正文在 article_contents 中按需读取；
+这里记录各列表接口执行的 SQL，断言没有读取 articles 的旧正文列，也没有读取正文表。
+在项目根目录执行: python test_article_list.py
+"""
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PREFIX = "test-list"
+MP_ID = f"MP_WXS_{PREFIX}"
+TAG_ID = f"{PREFIX}-tag"
+BODY_SQL = re.compile(r"\barticles\.content(_html)?\b|\barticle_contents\b")
+LIST_URLS = [
+    "/api/v1/wx/articles?limit=10",
+    f"/api/v1/wx/articles?limit=10&mp_id={MP_ID}",
+    f"/api/v1/wx/articles?limit=10&search={PREFIX}",
+    "/views/articles?limit=10",
+    f"/views/articles?limit=10&mp_id={MP_ID}",
+    f"/views/articles?limit=10&tag_id={TAG_ID}",
+    f"/views/tag/{TAG_ID}",
+]
+
+
+@contextmanager
+def capture_sql():
+    """记录期间所有引擎（含异步引擎）执行的 SQL"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(Engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record)
+
+
+def body_reads(statements):
+    return [s for s in statements if s.lstrip().upper().startswith(("SELECT", "WITH")) and BODY_SQL.search(s)]
+
+
+def seed():
+    """写入带摘要的测试文章（有摘要时列表不需要从正文生成），发布时间在最前，未筛选的列表第一页也能看到"""
+    import json
+    from core.db import DB
+    from core.models import Feed
+    from core.models.tags import Tags
+    cleanup()
+    session = DB.get_session()
+    now = datetime.now()
+    session.add(Feed(id=MP_ID, mp_name=PREFIX, mp_cover="", mp_intro="", status=1, faker_id=PREFIX,
+                     created_at=now, updated_at=now))
+    session.add(Tags(id=TAG_ID, name=PREFIX, mps_id=json.dumps([{"id": MP_ID}]), status=1,
+                     created_at=now, updated_at=now))
+    session.commit()
+    for i in range(5):
+        DB.add_article({"id": f"{PREFIX}-{i}", "mp_id": MP_ID, "title": f"{PREFIX} {i}", "url": f"http://{PREFIX}/{i}",
+                        "pic_url": "", "description": f"摘要{i}", "content": f"<p>正文{i}</p>",
+                        "publish_time": 4102444800 + i})
+
+
+def cleanup():
+    from core.db import DB
+    from core.models import Article, Feed
+    from core.models.tags import Tags
+    session = DB.get_session()
+    for article in session.query(Article).filter(Article.mp_id == MP_ID).all():
+        session.delete(article)
+    for model, id in ((Tags, TAG_ID), (Feed, MP_ID)):
+        obj = session.get(model, id)
+        if obj is not None:
+            session.delete(obj)
+    session.commit()
+
+
+def client():
+    from fastapi.testclient import TestClient
+    import web
+    from core.auth import get_current_user_or_ak
+    web.app.dependency_overrides[get_current_user_or_ak] = lambda: {"username": "admin"}
+    return TestClient(web.app)
+
+
+def test_list_endpoints_skip_bodies():
+    seed()
+    try:
+        with client() as c:
+            for url in LIST_URLS:
+                with capture_sql() as statements:
+                    response = c.get(url)
+                assert response.status_code == 200, f"{url} 返回 {response.status_code}"
+                assert PREFIX in response.text, f"{url} 没有返回测试文章"
+                reads = body_reads(statements)
+                assert not reads, f"{url} 读取了正文: {reads[0]}"
+    finally:
+        cleanup()
+
+
+def test_has_content_reads_bodies():
+    """对照：has_content=True 时才读取正文表，确认上面的检查能发现正文查询"""
+    seed()
+    try:
+        with client() as c, capture_sql() as statements:
+            response = c.get(f"/api/v1/wx/articles?limit=10&mp_id={MP_ID}&has_content=true")
+        assert response.status_code == 200
+        assert "正文0" in response.text
+        assert body_reads(statements), "has_content=True 时应读取正文表"
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    test_list_endpoints_skip_bodies()
+    test_has_content_reads_bodies()
+    print("文章列表接口未读取正文")
@@ -0,0 +1,103 @@
+"""测试全文索引回填未完成时搜索继续使用 LIKE
+
+回填中断后索引只包含部分文章，此时 SEARCH.available() 应返回False，
+搜索接口按标题 LIKE 匹配返回全部文章；回填完成后才切换到全文检索。
+在项目根目录执行: python test_search_backfill.py
+"""
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PREFIX = "test-backfill"
+MP_ID = f"MP_WXS_{PREFIX}"
+KEYWORD = "回填检索词"
+COUNT = 5
+
+
+class Interrupted(Exception):
+    pass
+
+
+def seed():
+    from core.db import DB
+    from core.models import Feed
+    cleanup()
+    session = DB.get_session()
+    now = datetime.now()
+    session.add(Feed(id=MP_ID, mp_name=PREFIX, mp_cover="", mp_intro="", status=1, faker_id=PREFIX,
+                     created_at=now, updated_at=now))
+    session.commit()
+    for i in range(COUNT):
+        DB.add_article({"id": str(i), "mp_id": MP_ID, "title": f"{KEYWORD} {i}", "url": f"http://{PREFIX}/{i}",
+                        "pic_url": "", "description": f"摘要{i}", "content": f"<p>正文{i}</p>",
+                        "publish_time": 4102444800 + i})
+
+
+def cleanup():
+    from core.db import DB
+    from core.models import Article, Feed
+    session = DB.get_session()
+    for article in session.query(Article).filter(Article.mp_id == MP_ID).all():
+        session.delete(article)
+    feed = session.get(Feed, MP_ID)
+    if feed is not None:
+        session.delete(feed)
+    session.commit()
+
+
+def interrupted_backfill():
+    """重建索引，写完第一批后中断，留下未完成的回填进度"""
+    from core.search import SEARCH
+
+    def progress(done, elapsed):
+        raise Interrupted()
+    try:
+        SEARCH.backfill(batch_size=1, rebuild=True, progress=progress)
+    except Interrupted:
+        pass
+
+
+def indexed_count():
+    from core.db import DB
+    from core.models import Article
+    from core.search import SEARCH
+    session = DB.get_session()
+    return session.query(Article).filter(Article.mp_id == MP_ID, SEARCH.condition(KEYWORD)).count()
+
+
+def search_ids(c):
+    response = c.get(f"/api/v1/wx/articles?limit=10&mp_id={MP_ID}&search={KEYWORD}")
+    assert response.status_code == 200, f"搜索返回 {response.status_code}"
+    return sorted(article["id"] for article in response.json()["data"]["list"])
+
+
+def test_partial_backfill_uses_like():
+    from fastapi.testclient import TestClient
+    import web
+    from core.auth import get_current_user_or_ak
+    from core.search import SEARCH
+    web.app.dependency_overrides[get_current_user_or_ak] = lambda: {"username": "admin"}
+    expected = sorted(f"{PREFIX}-{i}" for i in range(COUNT))
+    seed()
+    try:
+        interrupted_backfill()
+        assert SEARCH.writable(), "回填开始后应已建立索引表"
+        assert not SEARCH.available(), "回填未完成时不应使用全文检索"
+        assert indexed_count() < COUNT, "中断的回填应只索引了部分文章"
+        with TestClient(web.app) as c:
+            assert search_ids(c) == expected, "回填未完成时搜索应按 LIKE 返回全部文章"
+            SEARCH.backfill()
+            assert SEARCH.available(), "回填完成后应使用全文检索"
+            assert indexed_count() == COUNT
+            assert search_ids(c) == expected
+    finally:
+        cleanup()
+        if not SEARCH.available():
+            SEARCH.backfill()
+
+
+if __name__ == "__main__":
+    test_partial_backfill_uses_like()
+    print("回填未完成时搜索使用 LIKE")
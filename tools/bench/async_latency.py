@@ -0,0 +1,101 @@
+"""
+事件循环阻塞测试
+
+在同一个事件循环中持续发起重查询（LIKE 全表扫描的文章列表），同时请求一个轻量接口，
+对比同步会话（阻塞事件循环）与 AsyncDb（异步会话）下轻量接口的 p50/p99 延迟。
+
+用法（在项目根目录执行）:
+    python tools/bench/async_latency.py [文章数] [轻量请求数]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import httpx
+from fastapi import FastAPI
+from core.db import Db
+from core.async_db import AsyncDb
+from core.models import Article
+from core.models.base import Base
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+def heavy_query(session):
+    return session.query(Article.id).filter(Article.title.like("%不存在的关键词%")).count()
+
+
+def build_app(db: Db, adb: AsyncDb) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/heavy/sync")
+    async def heavy_sync():
+        return {"count": heavy_query(db.get_session())}
+
+    @app.get("/heavy/async")
+    async def heavy_async():
+        return {"count": await adb.run_sync(heavy_query)}
+
+    return app
+
+
+async def run(client, path, pings):
+    stop = asyncio.Event()
+
+    async def heavy():
+        while not stop.is_set():
+            await client.get(path)
+            # ASGITransport 在进程内完成请求，不会自然让出事件循环，模拟一次网络往返
+            await asyncio.sleep(0)
+
+    workers = [asyncio.create_task(heavy()) for _ in range(4)]
+    await asyncio.sleep(0.2)
+    # 按固定节拍发起轻量请求，延迟从计划时间算起，事件循环被占用的等待时间也计入
+    latencies = []
+    start = time.perf_counter()
+    for i in range(pings):
+        planned = start + i * 0.01
+        await asyncio.sleep(max(0.0, planned - time.perf_counter()))
+        await client.get("/ping")
+        latencies.append(time.perf_counter() - planned)
+    stop.set()
+    await asyncio.gather(*workers)
+    print(f"{path:<14} /ping p50={percentile(latencies, 0.5)*1000:.2f}ms p99={percentile(latencies, 0.99)*1000:.2f}ms")
+
+
+async def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    pings = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    db = Db(tag="bench", con_str=f"sqlite:///{tempfile.mkdtemp()}/async.db")
+    Base.metadata.create_all(db.engine)
+    session = db.get_session()
+    rows = [{"id": f"a-{i}", "mp_id": f"MP_WXS_{i % 50}", "title": f"标题{i}", "status": 1, "publish_time": i}
+            for i in range(n)]
+    for i in range(0, n, 5000):
+        session.execute(Article.__table__.insert(), rows[i:i + 5000])
+    session.commit()
+    adb = AsyncDb(db=db, tag="bench")
+
+    transport = httpx.ASGITransport(app=build_app(db, adb))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t = time.perf_counter()
+        await client.get("/heavy/async")
+        print(f"重查询单次耗时 {(time.perf_counter()-t)*1000:.1f}ms，文章数 {n}")
+        await run(client, "/heavy/sync", pings)
+        await run(client, "/heavy/async", pings)
+    await adb.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+正文压缩存储报告
+
+1. 不带参数：在临时SQLite库中按旧结构（正文存放在 articles 表）写入测试文章，
+   执行 data_sync 中的正文迁移，对比迁移前后的数据库大小、列表查询和详情查询耗时。
+2. 传入数据库连接：统计已有库中 article_contents 的压缩率（只读）。
+
+用法（在项目根目录执行）:
+    python tools/bench/content_store_report.py [文章数]
+    python tools/bench/content_store_report.py <db_url>
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import create_engine, func, select
+from core.db import Db
+from core.models import Article
+from core.models.article_content import ArticleContent
+from core.models.base import Base
+
+CHARS = [chr(c) for c in range(0x4e00, 0x4e00 + 3000)]
+
+
+def fake_html(rnd, paragraphs):
+    """模拟公众号正文：大量重复的内联样式包裹少量文字"""
+    style = ('style="margin: 0px 8px; padding: 0px; outline: 0px; max-width: 100%; box-sizing: border-box !important; '
+             'overflow-wrap: break-word !important; font-size: 15px; letter-spacing: 1px; line-height: 1.75em;"')
+    parts = []
+    for _ in range(paragraphs):
+        text = "".join(rnd.choices(CHARS, k=rnd.randint(40, 120)))
+        parts.append(f'<section {style}><span {style}>{text}</span></section>')
+        if rnd.random() < 0.2:
+            parts.append(f'<p {style}><img data-src="https://mmbiz.qpic.cn/mmbiz_jpg/{rnd.getrandbits(64):x}/640" '
+                         f'style="width: 100%;" /></p>')
+    return "".join(parts)
+
+
+def timed(func_, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func_()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def measure(session, ids):
+    def list_page():
+        session.expire_all()
+        session.query(Article).order_by(Article.publish_time.desc()).limit(50).all()
+
+    def detail():
+        session.expire_all()
+        article = session.query(Article).filter(Article.id == random.choice(ids)).first()
+        return len(article.content or "")
+
+    return timed(list_page), timed(detail)
+
+
+def legacy_list(engine):
+    """迁移前 session.query(Article) 会读出 articles 表的全部列"""
+    table = Article.__table__
+    with engine.connect() as conn:
+        return timed(lambda: conn.execute(select(table).order_by(table.c.publish_time.desc()).limit(50)).all())
+
+
+def db_size(engine, path):
+    """数据库文件大小（含 -wal 文件），测量前合并 WAL 并释放连接"""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    engine.dispose()
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def simulate(n):
+    from data_sync import DatabaseSynchronizer
+    path = os.path.join(tempfile.mkdtemp(), "content.db")
+    url = f"sqlite:///{path}"
+    db = Db(tag="bench", con_str=url)
+    Base.metadata.create_all(db.engine)
+    rnd = random.Random(7)
+    table = Article.__table__
+    with db.engine.begin() as conn:
+        for start in range(0, n, 500):
+            rows = []
+            for i in range(start, min(n, start + 500)):
+                html = fake_html(rnd, rnd.randint(10, 40))
+                rows.append({"id": f"a-{i}", "mp_id": f"MP_WXS_{i % 50}", "title": f"文章{i}", "status": 1,
+                             "publish_time": i, "content": html, "content_html": html.replace("data-src", "src")})
+            conn.execute(table.insert(), rows)
+    before_size = db_size(db.engine, path)
+    before_list = legacy_list(db.engine)
+
+    synchronizer = DatabaseSynchronizer(db_url=url)
+    synchronizer.engine = create_engine(url)
+    t = time.perf_counter()
+    synchronizer._migrate_article_contents()
+    migrate_seconds = time.perf_counter() - t
+    with synchronizer.engine.connect() as conn:
+        conn.exec_driver_sql("VACUUM")
+    db.engine.dispose()
+    after_size = db_size(synchronizer.engine, path)
+
+    session = db.get_session()
+    after_list, after_detail = measure(session, [f"a-{i}" for i in range(n)])
+    print(f"文章数 {n}，迁移耗时 {migrate_seconds:.1f}s")
+    change = after_size / before_size - 1
+    print(f"数据库大小   {before_size / 1048576:8.1f}MB -> {after_size / 1048576:8.1f}MB "
+          f"({abs(change) * 100:.0f}% {'增加' if change > 0 else '减少'})")
+    print(f"列表50条     {before_list:8.2f}ms -> {after_list:8.2f}ms")
+    print(f"详情(含解压)             {after_detail:8.2f}ms")
+
+
+def report(url):
+    engine = create_engine(url)
+    t = ArticleContent.__table__
+    stored = func.coalesce(func.length(t.c.content), 0) + func.coalesce(func.length(t.c.content_html), 0)
+    with engine.connect() as conn:
+        rows = conn.execute(select(t.c.codec, func.count(), func.sum(t.c.raw_size), func.sum(stored))
+                            .group_by(t.c.codec)).all()
+    for codec, count, raw, size in rows:
+        raw, size = raw or 0, size or 0
+        print(f"{codec:<6} {count:>8} 篇  原始 {raw / 1048576:10.1f}MB  压缩后 {size / 1048576:10.1f}MB  "
+              f"压缩率 {size / raw * 100 if raw else 0:.0f}%")
+
+
+if __name__ == "__main__":
+    arg = sys.argv[1] if len(sys.argv) > 1 else "2000"
+    if "://" in arg:
+        report(arg)
+    else:
+        simulate(int(arg))
@@ -0,0 +1,105 @@
+"""
+索引回归检查
+
+对热点查询执行 EXPLAIN，确认使用了 core/models 中声明的索引；
+标记 ordered 的查询还要求不出现额外排序（SQLite 的 TEMP B-TREE / MySQL 的 filesort）。
+
+用法（在项目根目录执行）:
+    python tools/bench/explain_indexes.py            # 临时SQLite库，自动生成测试数据
+    python tools/bench/explain_indexes.py <db_url>   # 检查已有数据库（不写入数据）
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import func
+from core.db import Db
+from core.models import Article, Feed
+from core.models.base import Base
+from core.models.cascade_task_allocation import CascadeTaskAllocation
+
+
+def seed(session, feeds=50, per_feed=200):
+    now = datetime.now()
+    session.execute(Feed.__table__.insert(), [
+        {"id": f"MP_WXS_{i}", "mp_name": f"feed{i}", "status": 1, "faker_id": f"fk{i}"} for i in range(feeds)])
+    rows = [{"id": f"{i}-{k}", "mp_id": f"MP_WXS_{i}", "title": "t", "url": f"http://x/{i}/{k}",
+             "status": 1 if k % 20 else 1000, "publish_time": 1700000000 + k * 60 + i}
+            for i in range(feeds) for k in range(per_feed)]
+    for i in range(0, len(rows), 1000):
+        session.execute(Article.__table__.insert(), rows[i:i + 1000])
+    session.execute(CascadeTaskAllocation.__table__.insert(), [
+        {"id": f"a{i}", "task_id": "t", "feed_ids": "[]", "node_id": None if i % 3 else f"n{i % 5}",
+         "status": ["pending", "completed", "failed"][i % 3], "dispatched_at": now - timedelta(minutes=i)}
+        for i in range(2000)])
+    session.commit()
+    session.connection().exec_driver_sql("ANALYZE")
+
+
+def checks(session):
+    """(名称, 查询, 期望使用的索引, 是否要求无额外排序)"""
+    mp_id = "MP_WXS_3"
+    return [
+        ("rss 单个公众号", session.query(Article).filter(Article.mp_id == mp_id)
+            .order_by(Article.publish_time.desc(), Article.id.desc()).limit(10), "ix_articles_mp_publish", True),
+        ("公众号文章计数", session.query(func.count(Article.id)).filter(
+            Article.mp_id == mp_id, Article.status == 1), "ix_articles_mp_status_publish", False),
+        ("相关文章", session.query(Article).filter(Article.mp_id == mp_id, Article.id != "3-1", Article.status == 1)
+            .order_by(Article.publish_time.desc()).limit(5), "ix_articles_mp_status_publish", True),
+        ("上一篇", session.query(Article.id, Article.title).filter(
+            Article.mp_id == mp_id, Article.publish_time < 1700006000, Article.status == 1)
+            .order_by(Article.publish_time.desc()).limit(1), "ix_articles_mp_status_publish", True),
+        ("下一篇", session.query(Article.id, Article.title).filter(
+            Article.mp_id == mp_id, Article.publish_time > 1700006000, Article.status == 1)
+            .order_by(Article.publish_time.asc()).limit(1), "ix_articles_mp_status_publish", True),
+        ("全部文章列表", session.query(Article.id, Article.title).filter(Article.status == 1)
+            .order_by(Article.publish_time.desc()).limit(20), "ix_articles_status_publish", True),
+        ("faker_id 查询", session.query(Feed).filter(Feed.faker_id == "fk3"), "ix_feeds_faker_id", False),
+        ("url 查重", session.query(Article.id).filter(Article.url == "http://x/3/5"), "ix_articles_url", False),
+        ("级联待认领任务", session.query(CascadeTaskAllocation).filter(
+            CascadeTaskAllocation.node_id == None, CascadeTaskAllocation.status == "pending")
+            .order_by(CascadeTaskAllocation.dispatched_at.asc()).limit(1),
+            "ix_cascade_task_allocations_status_node_dispatched", True),
+    ]
+
+
+def explain(session, query):
+    conn = session.connection()
+    dialect = conn.dialect.name
+    sql = str(query.statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        plan = "\n".join(str(r[-1]) for r in rows)
+        return plan, "TEMP B-TREE" in plan
+    rows = conn.exec_driver_sql(f"EXPLAIN {sql}").fetchall()
+    plan = "\n".join(" ".join(str(c) for c in r) for r in rows)
+    return plan, "filesort" in plan.lower() or "Sort " in plan
+
+
+def main():
+    if len(sys.argv) > 1:
+        db = Db(tag="explain", con_str=sys.argv[1])
+        session = db.get_session()
+    else:
+        db = Db(tag="explain", con_str=f"sqlite:///{tempfile.mkdtemp()}/explain.db")
+        Base.metadata.create_all(db.engine)
+        session = db.get_session()
+        seed(session)
+
+    failed = 0
+    for name, query, index, ordered in checks(session):
+        plan, sorted_ = explain(session, query)
+        ok = index in plan and not (ordered and sorted_)
+        failed += 0 if ok else 1
+        print(f"[{'OK' if ok else 'FAIL'}] {name}: 期望 {index}{'，无额外排序' if ordered else ''}")
+        if not ok:
+            print("    " + plan.replace("\n", "\n    "))
+    print(f"共 {len(checks(session))} 项，失败 {failed} 项")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+列表查询列检查
+
+在临时SQLite库上请求各个文章列表接口，记录执行的SQL，
+确认列表查询没有读取正文（article_contents 的正文列、articles 表的旧正文列）。
+有查询读取正文时以非0状态退出，可在修改列表查询后执行。
+没有摘要的文章需要从正文生成摘要，会按需读取正文，测试数据均带摘要。
+
+用法（在项目根目录执行）:
+    python tools/bench/list_query_columns.py
+"""
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+
+WORK = tempfile.mkdtemp()
+shutil.copy(os.path.join(ROOT, "config.example.yaml"), os.path.join(WORK, "config.yaml"))
+os.environ["DB"] = f"sqlite:///{WORK}/list.db"
+os.environ["DB_READ"] = ""
+os.environ["RSS_FULL_CONTEXT"] = "False"
+sys.argv[1:] = ["-config", os.path.join(WORK, "config.yaml")]
+# 缓存文件写到临时目录，模板仍从项目目录读取
+for name in ("public", "static"):
+    if os.path.exists(os.path.join(ROOT, name)):
+        os.symlink(os.path.join(ROOT, name), os.path.join(WORK, name))
+os.chdir(WORK)
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import cfg
+from core.db import DB
+from core.models import Article, Feed
+from core.models.base import Base
+from core.models.tags import Tags
+
+# 列表接口，RSS 在非全文模式下也不应读取正文（JSON 格式总是输出正文，不在检查范围内）
+URLS = [
+    "/views/home",
+    "/views/articles?limit=20",
+    "/views/articles?tag_id=t1",
+    "/views/mps",
+    "/views/tags",
+    "/views/tag/t1",
+    "/feed/all.rss",
+    "/feed/MP_WXS_0.atom",
+    "/feed/tag/t1.rss",
+    "/rss/MP_WXS_1",
+    "/api/v1/wx/articles?limit=20",
+    "/api/v1/wx/articles?limit=20&mp_id=MP_WXS_0",
+    "/api/v1/wx/cascade/feed-status",
+]
+BODY_COLUMNS = re.compile(r"articles\.content\b|articles\.content_html\b|article_contents\.content")
+
+
+def seed(session, feeds=3, per_feed=30):
+    now = datetime.now()
+    for i in range(feeds):
+        session.add(Feed(id=f"MP_WXS_{i}", mp_name=f"feed{i}", mp_cover="", mp_intro="", status=1,
+                         faker_id=f"fk{i}", created_at=now, updated_at=now))
+    session.add(Tags(id="t1", name="tag", mps_id=json.dumps([{"id": "MP_WXS_0"}, {"id": "MP_WXS_1"}]),
+                     status=1, created_at=now, updated_at=now))
+    session.commit()
+    for i in range(feeds * per_feed):
+        DB.add_article({"id": f"{i % feeds}-{i}", "mp_id": f"MP_WXS_{i % feeds}", "title": f"文章{i}",
+                        "url": f"http://x/{i}", "pic_url": "", "description": f"摘要{i}",
+                        "content": f"<p>正文{i}</p>", "publish_time": 1700000000 + i})
+
+
+def main():
+    if cfg.get("rss.full_context", False):
+        print("请关闭 rss.full_context 后再检查")
+        sys.exit(2)
+    Base.metadata.create_all(DB.get_engine())
+    seed(DB.get_session())
+
+    from fastapi.testclient import TestClient
+    import web
+    from core.auth import get_current_user, get_current_user_or_ak
+    web.app.dependency_overrides[get_current_user] = lambda: {"username": "admin"}
+    web.app.dependency_overrides[get_current_user_or_ak] = lambda: {"username": "admin"}
+    client = TestClient(web.app)
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    failed = False
+    for url in URLS:
+        statements.clear()
+        status = client.get(url).status_code
+        hits = [s for s in statements if s.lstrip().upper().startswith("SELECT") and BODY_COLUMNS.search(s)]
+        ok = status == 200 and not hits
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {status} {url:<48} SQL {len(statements):>3} 条，读取正文 {len(hits)} 条")
+        for s in hits:
+            print("     " + " ".join(s.split())[:200])
+    event.remove(Engine, "before_cursor_execute", record)
+    shutil.rmtree(WORK, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+RSS 缓存目录布局测试
+
+生成5万个缓存文件（默认2500个公众号 × 20个分页/格式），对比：
+    改动前：所有文件放在同一目录，清除公众号缓存时 os.listdir 全目录再按文件名子串匹配；
+    改动后：按公众号分目录（RSS(feed_id=...)），只处理该公众号自己的目录。
+分别测试清除单个公众号缓存和读取缓存文件的耗时。
+
+用法（在项目根目录执行）:
+    python tools/bench/rss_cache_layout.py [公众号数] [每个公众号的文件数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.rss import RSS
+
+EXTS = ("rss", "atom", "json", "rss.gz")
+
+
+def names(feed_id, per_feed):
+    for i in range(per_feed):
+        yield f"None_{feed_id}_{10 + i // len(EXTS)}_0.{EXTS[i % len(EXTS)]}"
+
+
+def clear_flat(cache_dir, mp_id):
+    """改动前的 clear_cache：遍历整个目录，文件名包含 '{mp_id}_' 的删除"""
+    for filename in os.listdir(cache_dir):
+        if f'{mp_id}_' not in filename:
+            continue
+        file_path = os.path.normpath(f"{cache_dir}/{filename}")
+        if os.path.isfile(file_path):
+            os.unlink(file_path)
+
+
+def main():
+    feeds = int(sys.argv[1]) if len(sys.argv) > 1 else 2500
+    per_feed = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    flat_dir, shard_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+    feed_ids = [f"MP_WXS_{i:06d}" for i in range(feeds)]
+    for feed_id in feed_ids:
+        shard_dir = RSS(name="x", cache_dir=shard_root, feed_id=feed_id).shard_dir(feed_id)
+        for name in names(feed_id, per_feed):
+            open(os.path.join(flat_dir, name), "w").close()
+            open(os.path.join(shard_dir, name), "w").close()
+    print(f"{feeds * per_feed} 个缓存文件（{feeds} 个公众号 × {per_feed}）")
+
+    targets = feed_ids[::max(1, feeds // 20)][:20]
+    start = time.perf_counter()
+    for feed_id in targets:
+        clear_flat(flat_dir, feed_id)
+    flat = (time.perf_counter() - start) * 1000 / len(targets)
+    rss = RSS(cache_dir=shard_root)
+    start = time.perf_counter()
+    for feed_id in targets:
+        rss.clear_cache(mp_id=feed_id)
+    sharded = (time.perf_counter() - start) * 1000 / len(targets)
+    print(f"清除单个公众号缓存   同一目录={flat:8.2f}ms 按公众号分目录={sharded:8.3f}ms")
+
+    cleared = set(targets)
+    lookups = [(feed_id, next(names(feed_id, 1))) for feed_id in feed_ids[1::max(1, feeds // 1000)] if feed_id not in cleared]
+    start = time.perf_counter()
+    for _feed_id, name in lookups:
+        with open(os.path.join(flat_dir, name), "rb") as f:
+            f.read()
+    flat = (time.perf_counter() - start) * 1e6 / len(lookups)
+    start = time.perf_counter()
+    for feed_id, name in lookups:
+        base, ext = name.split(".", 1)
+        RSS(name=base, cache_dir=shard_root, ext=ext, feed_id=feed_id).get_cache()
+    sharded = (time.perf_counter() - start) * 1e6 / len(lookups)
+    print(f"读取缓存文件         同一目录={flat:8.1f}us 按公众号分目录={sharded:8.1f}us（含创建RSS对象）")
+
+
+if __name__ == "__main__":
+    main()
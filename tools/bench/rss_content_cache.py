@@ -0,0 +1,72 @@
+"""
+文章内容缓存写入测试
+
+对比生成订阅时同步写入文章内容缓存（每篇一次 open/write）与后台写入（按版本去重、有界队列）
+在请求线程中的耗时：首次生成（全部新文章）、重复生成（版本未变）、新增1篇后生成，并输出写入/跳过计数。
+
+用法（在项目根目录执行）:
+    python tools/bench/rss_content_cache.py [条目数] [每篇正文KB]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.rss import RSS, CONTENT_CACHE_WRITER
+
+
+def contents(start, n, size_kb):
+    paragraph = "<p>这是一段用于测试的正文内容<img src='https://mmbiz.qpic.cn/a/640'>。</p>\n"
+    repeat = max(1, size_kb * 1024 // len(paragraph.encode("utf-8")))
+    return [(f"a-{i}", 1700000000000 + i, {"id": f"a-{i}", "title": f"文章{i}", "content": paragraph * repeat,
+                                           "publish_time": 1700000000 + i, "mp_id": "MP_WXS_1", "pic_url": "",
+                                           "mp_name": "公众号"}) for i in range(start + n - 1, start - 1, -1)]
+
+
+def write_sync(rss, rows):
+    """改动前的写法：在请求中逐篇处理图片地址并写文件"""
+    for content_id, _version, content in rows:
+        content = dict(content)
+        content["content"] = rss.add_logo_prefix_to_urls(content["content"])
+        with open(os.path.join(rss.content_cache_dir, f"{content_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(content, f, ensure_ascii=False, indent=2)
+
+
+def write_behind(rss, rows):
+    for content_id, version, content in rows:
+        rss.cache_content(content_id, dict(content), version=version)
+
+
+def measure(name, fn, rss, rows):
+    before = dict(CONTENT_CACHE_WRITER.stats())
+    start = time.perf_counter()
+    fn(rss, rows)
+    elapsed = (time.perf_counter() - start) * 1000
+    CONTENT_CACHE_WRITER.flush()
+    after = CONTENT_CACHE_WRITER.stats()
+    print(f"{name:<20} 请求线程耗时={elapsed:8.2f}ms 写入={after['written'] - before['written']:<4} "
+          f"跳过={after['skipped'] - before['skipped']:<4} 放弃={after['dropped'] - before['dropped']}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rss = RSS(name="bench", cache_dir=tempfile.mkdtemp())
+    rss.content_cache_dir = tempfile.mkdtemp()
+    before, after = contents(0, n, size_kb), contents(1, n, size_kb)
+    print(f"{n} 篇文章，每篇正文约 {size_kb}KB")
+    measure("同步写入 首次", write_sync, rss, before)
+    measure("同步写入 重复", write_sync, rss, before)
+    measure("同步写入 新增1篇", write_sync, rss, after)
+    rss.content_cache_dir = tempfile.mkdtemp()
+    measure("后台写入 首次", write_behind, rss, before)
+    measure("后台写入 重复", write_behind, rss, before)
+    measure("后台写入 新增1篇", write_behind, rss, after)
+    print(CONTENT_CACHE_WRITER.stats())
+
+
+if __name__ == "__main__":
+    main()
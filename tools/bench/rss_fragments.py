@@ -0,0 +1,77 @@
+"""
+RSS 条目片段缓存测试
+
+全文输出的100条订阅，在新增一篇文章（最旧的一篇移出列表）后重新生成：
+对比不使用片段缓存（每条重新渲染）与使用片段缓存（只渲染新文章）的生成耗时。
+条目带 version（文章 updated_at_millis），正文为合成的HTML。
+
+用法（在项目根目录执行）:
+    python tools/bench/rss_fragments.py [条目数] [每篇正文KB]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.cache import fragment_cache
+from core.config import cfg
+from core.rss import RSS
+
+
+def items(start, n, size_kb):
+    cst = timezone(timedelta(hours=8))
+    paragraph = "<p>这是一段用于测试的正文内容，包含<strong>加粗</strong>和<a href='https://example.com'>链接</a>。</p>\n"
+    repeat = max(1, size_kb * 1024 // len(paragraph.encode("utf-8")))
+    # 新文章在前
+    return [{
+        "id": f"a-{i}", "title": f"文章{i}", "link": f"https://mp.weixin.qq.com/s/{i}", "description": f"摘要{i}",
+        "content": f"<section><img src='https://img/{i}.jpg'>" + paragraph * repeat + "</section>",
+        "image": "", "mp_name": "公众号", "updated": datetime.fromtimestamp(1700000000 + i, tz=cst),
+        "version": 1700000000000 + i,
+        "feed": {"id": "MP_WXS_1", "name": "公众号", "cover": "", "intro": ""},
+    } for i in range(start + n - 1, start - 1, -1)]
+
+
+def render(rss, ext, rss_list, repeat=5):
+    """返回多次生成的平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _chunk in rss.iter_generate(iter(rss_list), ext=ext, title="bench"):
+            pass
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    cfg.config.setdefault("rss", {})["full_context"] = True
+    cache_dir = tempfile.mkdtemp()
+    before, after = items(0, n, size_kb), items(1, n, size_kb)
+    print(f"{n} 条全文条目，每篇正文约 {size_kb}KB，新增1篇后重新生成")
+    for ext in ("rss", "atom", "json"):
+        rss = RSS(name=f"bench_{ext}", cache_dir=cache_dir, ext=ext)
+        # 不使用片段缓存：每次生成前清空
+        start = time.perf_counter()
+        for _ in range(5):
+            fragment_cache.clear()
+            for _chunk in rss.iter_generate(iter(after), ext=ext, title="bench"):
+                pass
+        cold = (time.perf_counter() - start) * 1000 / 5
+        # 使用片段缓存：上一次生成的是新增前的列表，只有新文章需要渲染
+        fragment_cache.clear()
+        render(rss, ext, before, repeat=1)
+        start = time.perf_counter()
+        for _chunk in rss.iter_generate(iter(after), ext=ext, title="bench"):
+            pass
+        new_one = (time.perf_counter() - start) * 1000
+        # 全部命中
+        warm = render(rss, ext, after)
+        print(f"{ext:<5} 全部重新渲染={cold:8.1f}ms 新增1篇={new_one:8.1f}ms 全部命中={warm:8.1f}ms")
+    print(fragment_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
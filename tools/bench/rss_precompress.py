@@ -0,0 +1,86 @@
+"""
+RSS 预压缩测试
+
+生成一个全文订阅（默认30篇，每篇正文约20KB），对比每次请求的传输字节数和CPU耗时：
+    不压缩 / 每次请求压缩（相当于在 web.py 加压缩中间件） / 直接输出生成时写入的预压缩文件，
+以及生成时同时写入预压缩文件的额外耗时。未安装 Brotli 时只测试gzip。
+
+用法（在项目根目录执行）:
+    python tools/bench/rss_precompress.py [条目数] [每篇正文KB] [请求次数]
+"""
+import gzip
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.config import cfg
+from core.rss import RSS, GZIP_LEVEL, BROTLI_QUALITY, brotli
+
+
+def items(n, size_kb):
+    """合成正文：随机词组成的段落，压缩率接近真实文章"""
+    rnd = random.Random(1)
+    words = ["公众号", "文章", "数据", "订阅", "更新", "内容", "技术", "发布", "平台", "用户", "服务", "模型",
+             "the", "feed", "python", "release", "version", "search", "cache", "image"]
+    cst = timezone(timedelta(hours=8))
+    result = []
+    for i in range(n):
+        paragraphs, size = [], 0
+        while size < size_kb * 1024:
+            text = "".join(rnd.choice(words) + ("，" if rnd.random() < 0.1 else "") for _ in range(40))
+            p = f"<p style='margin:8px 0'>{text}<img src='https://mmbiz.qpic.cn/{rnd.getrandbits(64):x}/640'></p>\n"
+            paragraphs.append(p)
+            size += len(p.encode("utf-8"))
+        result.append({
+            "id": f"a-{i}", "title": f"文章{i}", "link": f"https://mp.weixin.qq.com/s/{i}", "description": f"摘要{i}",
+            "content": "".join(paragraphs), "image": "", "mp_name": "公众号",
+            "updated": datetime.fromtimestamp(1700000000 + i, tz=cst),
+            "feed": {"id": "MP_WXS_1", "name": "公众号", "cover": "", "intro": ""},
+        })
+    return result
+
+
+def per_request(name, fn, requests):
+    start = time.process_time()
+    for _ in range(requests):
+        size = len(fn())
+    cpu = (time.process_time() - start) * 1000 / requests
+    print(f"{name:<16} 传输={size / 1024:8.1f}KB CPU/请求={cpu:8.3f}ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    cfg.config.setdefault("rss", {})["full_context"] = True
+    rss = RSS(name="bench", cache_dir=tempfile.mkdtemp(), ext="rss")
+    rss_list = items(n, size_kb)
+
+    for precompress in (False, True):
+        cfg.config["rss"]["precompress"] = precompress
+        start = time.perf_counter()
+        rss.generate(rss_list, ext="rss", title="bench")
+        print(f"生成{'（含预压缩）' if precompress else '（不压缩）'}耗时 {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def read(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    print(f"{n} 条全文条目，每篇正文约 {size_kb}KB，每种方式 {requests} 次请求")
+    per_request("不压缩", lambda: read(rss.rss_file), requests)
+    per_request("gzip 每次压缩", lambda: gzip.compress(read(rss.rss_file), GZIP_LEVEL), requests)
+    per_request("gzip 预压缩", lambda: rss.get_cache_encoded("gzip"), requests)
+    if brotli is not None:
+        per_request("br 每次压缩", lambda: brotli.compress(read(rss.rss_file), quality=BROTLI_QUALITY), requests)
+        per_request("br 预压缩", lambda: rss.get_cache_encoded("br"), requests)
+    else:
+        print("未安装 Brotli，跳过br")
+
+
+if __name__ == "__main__":
+    main()
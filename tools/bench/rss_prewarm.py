@@ -0,0 +1,89 @@
+"""
+采集后订阅预热测试
+
+对当前配置的数据库模拟一次采集完成：更新公众号最新一篇文章的 updated_at_millis（数据版本变化）并清除其订阅缓存，
+然后由阅读器依次请求该公众号、全部文章（all）和包含它的标签的各格式订阅首页，
+对比不预热与预热（core.rss_prewarm，等待预热完成后再请求）时阅读器的请求耗时和缓存命中率，以及预热耗时。
+会修改数据库中该文章的 updated_at_millis。
+
+用法（在项目根目录执行，需要已有数据）:
+    python tools/bench/rss_prewarm.py [feed_id]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+
+def touch(feed_id):
+    """模拟采集：刷新公众号最新一篇文章的版本"""
+    from sqlalchemy import select, update
+    from core.db import DB
+    from core.models.article import Article
+    a = Article.__table__
+    with DB.get_session_factory()() as session:
+        article_id = session.execute(select(a.c.id).where(a.c.mp_id == feed_id)
+                                     .order_by(a.c.publish_time.desc()).limit(1)).scalar()
+        session.execute(update(a).where(a.c.id == article_id).values(updated_at_millis=int(time.time() * 1000)))
+        session.commit()
+
+
+def main():
+    import logging
+    import httpx
+    import web
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    from core.async_db import ADB
+    from core.db import DB
+    from core.rss import RSS
+    from core.rss_prewarm import RSS_PREWARM, _formats
+    from core.config import cfg
+    from core.models.article import Article
+    from core.tag_feeds import TAG_FEEDS
+
+    with DB.get_session_factory()() as session:
+        feed_id = sys.argv[1] if len(sys.argv) > 1 else session.query(Article.mp_id).limit(1).scalar()
+        tag_ids = TAG_FEEDS.owners(session, feed_id)
+    formats = _formats(cfg.get("rss.prewarm.formats", None))
+    paths = [f"/feed/{scope}.{ext}" for scope in [feed_id, "all"] + [f"tag/{tag_id}" for tag_id in tag_ids]
+             for ext in formats]
+    print(f"公众号 {feed_id}，标签 {len(tag_ids)} 个，阅读器请求 {len(paths)} 个订阅")
+
+    async def read(urls):
+        transport = httpx.ASGITransport(app=web.app)
+        timings = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for url in urls:
+                start = time.perf_counter()
+                response = await client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, (url, response.status_code)
+        # 异步引擎绑定在本次事件循环上
+        await ADB.dispose()
+        return timings
+
+    # 第一次请求记录站点地址，预热按它生成链接
+    asyncio.run(read(paths))
+    for label, prewarm in (("不预热", False), ("预热", True)):
+        touch(feed_id)
+        RSS().clear_cache(mp_id=feed_id)
+        prewarm_ms = 0.0
+        if prewarm:
+            start = time.perf_counter()
+            RSS_PREWARM.submit(feed_id)
+            RSS_PREWARM.flush()
+            prewarm_ms = (time.perf_counter() - start) * 1000
+        before = RSS_PREWARM.stats()
+        timings = asyncio.run(read(paths))
+        after = RSS_PREWARM.stats()
+        hits = after["reader_hits"] - before["reader_hits"]
+        misses = after["reader_misses"] - before["reader_misses"]
+        print(f"{label:<4} 预热耗时={prewarm_ms:7.1f}ms 阅读器: 命中率={hits / (hits + misses):.0%} "
+              f"平均={sum(timings) / len(timings):6.1f}ms 最大={max(timings):6.1f}ms 合计={sum(timings):7.1f}ms")
+    print(RSS_PREWARM.stats())
+
+
+if __name__ == "__main__":
+    main()
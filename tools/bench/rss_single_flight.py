@@ -0,0 +1,119 @@
+"""
+RSS 并发生成合并测试
+
+1. core.single_flight：同一键上100个线程和100个协程同时请求，模拟生成耗时50ms，统计实际生成次数；
+2. 接口：对当前配置的数据库，清除订阅缓存后用200个并发请求访问 /feed/<feed_id>.rss，
+   统计 RSS.iter_generate（查询文章并生成）的调用次数，对比关闭合并（等待时间为0）时的次数和耗时。
+
+用法（在项目根目录执行，第2项需要已有数据）:
+    python tools/bench/rss_single_flight.py [feed_id] [并发数]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.single_flight import SingleFlight
+
+
+def bench_primitive(concurrency, keys=1):
+    flights = SingleFlight(timeout=30)
+    renders = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency // 2 + 1)
+
+    def render(key):
+        with lock:
+            renders.append(key)
+        time.sleep(0.05)
+
+    def call_sync(i):
+        key = i % keys
+        barrier.wait()
+        flight, leader = flights.join(key)
+        if leader:
+            render(key)
+            flight.done(True)
+        else:
+            flight.wait(30)
+
+    async def call_async(i):
+        key = i % keys
+        flight, leader = flights.join(key)
+        if leader:
+            await asyncio.to_thread(render, key)
+            flight.done(True)
+        else:
+            await flight.wait_async(30)
+
+    async def run():
+        threads = [threading.Thread(target=call_sync, args=(i,)) for i in range(concurrency // 2)]
+        for t in threads:
+            t.start()
+        await asyncio.to_thread(barrier.wait)
+        await asyncio.gather(*(call_async(i) for i in range(concurrency - concurrency // 2)))
+        for t in threads:
+            t.join()
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    print(f"single_flight {concurrency}并发（线程+协程） 键数={keys} 生成次数={len(renders)} "
+          f"耗时={(time.perf_counter() - start) * 1000:.0f}ms {flights.stats()}")
+
+
+def bench_endpoint(feed_id, concurrency):
+    import logging
+    import httpx
+    import web
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    from core.async_db import ADB
+    from core.rss import RSS, RSS_FLIGHTS
+
+    renders = []
+    iter_generate = RSS.iter_generate
+
+    def counted(self, *args, **kwargs):
+        renders.append(self.rss_file)
+        return iter_generate(self, *args, **kwargs)
+
+    RSS.iter_generate = counted
+
+    async def run():
+        transport = httpx.ASGITransport(app=web.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            responses = await asyncio.gather(*(client.get(f"/feed/{feed_id}.rss") for _ in range(concurrency)))
+        # 异步引擎绑定在本次事件循环上
+        await ADB.dispose()
+        return responses
+
+    timeout = RSS_FLIGHTS.timeout
+    for label, flight_timeout in (("关闭合并", 0), ("合并生成", timeout)):
+        RSS().clear_cache(mp_id=feed_id if feed_id != "all" else "")
+        RSS_FLIGHTS.timeout = flight_timeout
+        renders.clear()
+        start = time.perf_counter()
+        responses = asyncio.run(run())
+        elapsed = (time.perf_counter() - start) * 1000
+        statuses = {}
+        for r in responses:
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+        bodies = len({r.content for r in responses if r.status_code == 200})
+        print(f"/feed/{feed_id}.rss {concurrency}并发 {label}: 生成次数={len(renders)} 状态={statuses} "
+              f"不同内容={bodies} 耗时={elapsed:.0f}ms")
+    RSS_FLIGHTS.timeout = timeout
+    RSS.iter_generate = iter_generate
+
+
+def main():
+    feed_id = sys.argv[1] if len(sys.argv) > 1 else "all"
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    bench_primitive(concurrency)
+    bench_primitive(concurrency, keys=4)
+    bench_endpoint(feed_id, concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+RSS 流式输出测试
+
+对比整体生成（RSS.generate：先生成全部条目，再拼成完整字符串）与流式生成（RSS.iter_generate + RSS.stream：
+条目按需生成，逐条输出并写入缓存文件）在全文输出时的峰值内存（tracemalloc）、首字节时间和总耗时。
+正文为合成的HTML，模拟逐条从数据库加载。
+
+用法（在项目根目录执行）:
+    python tools/bench/rss_stream.py [条目数] [每篇正文KB]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from core.config import cfg
+from core.rss import RSS
+
+
+def items(n, size_kb):
+    """按需生成条目，正文在生成时才构造，与 apis/rss.py 中逐批加载正文一致"""
+    cst = timezone(timedelta(hours=8))
+    paragraph = "<p>这是一段用于测试的正文内容，包含<strong>加粗</strong>和<a href='https://example.com'>链接</a>。</p>\n"
+    repeat = max(1, size_kb * 1024 // len(paragraph.encode("utf-8")))
+    for i in range(n):
+        yield {
+            "id": f"a-{i}", "title": f"文章{i}", "link": f"https://mp.weixin.qq.com/s/{i}", "description": f"摘要{i}",
+            "content": f"<section><img src='https://img/{i}.jpg'>" + paragraph * repeat + "</section>",
+            "image": "", "mp_name": "公众号", "updated": datetime.fromtimestamp(1700000000 + i, tz=cst),
+            "feed": {"id": "MP_WXS_1", "name": "公众号", "cover": "", "intro": ""},
+        }
+
+
+def measure(name, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first, size = fn(start)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} 大小={size / 1048576:6.1f}MB 峰值内存={peak / 1048576:7.1f}MB "
+          f"首字节={first * 1000:8.1f}ms 总耗时={elapsed * 1000:8.1f}ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    cfg.config.setdefault("rss", {})["full_context"] = True
+    cache_dir = tempfile.mkdtemp()
+    print(f"{n} 条全文条目，每篇正文约 {size_kb}KB")
+    for ext in ("rss", "atom", "json"):
+        rss = RSS(name=f"bench_{ext}", cache_dir=cache_dir, ext=ext)
+
+        def whole(start):
+            text = rss.generate(list(items(n, size_kb)), ext=ext, title="bench")
+            data = text.encode("utf-8")
+            return time.perf_counter() - start, len(data)
+
+        def streaming(start):
+            first, size = None, 0
+            for chunk in rss.stream(rss.iter_generate(items(n, size_kb), ext=ext, title="bench")):
+                if first is None:
+                    first = time.perf_counter() - start
+                size += len(chunk)
+            return first, size
+
+        measure(f"{ext} 整体", whole)
+        measure(f"{ext} 流式", streaming)
+
+
+if __name__ == "__main__":
+    main()
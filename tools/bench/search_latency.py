@@ -0,0 +1,96 @@
+"""
+搜索延迟测试
+
+生成指定数量的中文文章，建立全文索引，对比全文索引与 LIKE（仅标题 / 标题+正文）
+在不同命中率的关键词下统计总数并取第一页（与文章列表接口一致）的 p50/p99 延迟。
+
+用法（在项目根目录执行）:
+    python tools/bench/search_latency.py [文章数] [每个关键词的查询次数]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import or_
+from core.db import Db
+from core.models import Article
+from core.models.base import Base
+from core.search import SearchIndex
+
+# 关键词及其在文章中出现的比例，其余文字从常用汉字中随机生成
+KEYWORDS = {"大模型": 0.05, "新能源": 0.02, "Python": 0.01, "美联储": 0.005, "卫星互联网": 0.0005}
+QUERIES = ["大模型", "新能源 Python", "美联储", "卫星互联网", "不存在的词"]
+CHARS = [chr(c) for c in range(0x4e00, 0x4e00 + 2500)]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+def sentence(rnd, n):
+    words = ["".join(rnd.choices(CHARS, k=rnd.randint(2, 4))) for _ in range(n)]
+    for kw, ratio in KEYWORDS.items():
+        if rnd.random() < ratio:
+            words.insert(rnd.randrange(len(words) + 1), kw)
+    return "，".join(words) + "。"
+
+
+def seed(session, n):
+    rnd = random.Random(42)
+    for start in range(0, n, 5000):
+        session.execute(Article.__table__.insert(), [
+            {"id": f"a-{i}", "mp_id": f"MP_WXS_{i % 200}", "title": sentence(rnd, 4), "status": 1,
+             "description": sentence(rnd, 8), "content": f"<p>{sentence(rnd, 80)}</p>", "publish_time": i}
+            for i in range(start, min(n, start + 5000))])
+        session.commit()
+
+
+def measure(session, name, make_filter, repeats):
+    """与文章列表接口一致：统计总数并取第一页"""
+    for kw in QUERIES:
+        latencies, total = [], 0
+        for _ in range(repeats):
+            t = time.perf_counter()
+            query = session.query(Article.id).filter(make_filter(kw))
+            total = query.count()
+            query.order_by(Article.publish_time.desc()).limit(20).all()
+            latencies.append(time.perf_counter() - t)
+        print(f"{name:<10} {kw:<12} 总数{total:>7} p50={percentile(latencies, 0.5)*1000:8.2f}ms "
+              f"p99={percentile(latencies, 0.99)*1000:8.2f}ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    db = Db(tag="bench", con_str=f"sqlite:///{tempfile.mkdtemp()}/search.db")
+    Base.metadata.create_all(db.engine)
+    session = db.get_session()
+
+    t = time.perf_counter()
+    seed(session, n)
+    print(f"生成 {n} 篇文章耗时 {time.perf_counter()-t:.1f}s")
+
+    index = SearchIndex(db=db)
+    t = time.perf_counter()
+    index.backfill(batch_size=2000)
+    print(f"建立全文索引耗时 {time.perf_counter()-t:.1f}s")
+
+    def like_title(kw):
+        return or_(*[Article.title.like(f"%{w}%") for w in kw.split()])
+
+    def like_all(kw):
+        return or_(*[c.like(f"%{w}%") for w in kw.split()
+                     for c in (Article.title, Article.description, Article.legacy_content)])
+
+    measure(session, "全文索引", index.condition, repeats)
+    measure(session, "LIKE标题", like_title, repeats)
+    measure(session, "LIKE全文", like_all, max(1, repeats // 4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+SQLite并发读写测试
+
+模拟采集任务持续批量写入文章的同时，多个线程执行文章列表查询，
+对比默认连接参数与 SQLite 优化参数（WAL等）下的读延迟和 "database is locked" 次数。
+
+用法（在项目根目录执行）:
+    python tools/bench/sqlite_concurrency.py [秒数] [读线程数]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker, scoped_session
+from core.db import Db
+from core.models import Article
+from core.models.base import Base
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+def seed(session, n=20000):
+    rows = [{"id": f"seed-{i}", "mp_id": f"MP_WXS_{i % 50}", "title": f"标题{i}", "url": f"http://x/{i}",
+             "status": 1, "publish_time": 1700000000 + i, "content": "<p>" + "内容" * 200 + "</p>"}
+            for i in range(n)]
+    for i in range(0, n, 1000):
+        session.execute(Article.__table__.insert(), rows[i:i + 1000])
+    session.commit()
+
+
+def run(name, Session, seconds, readers):
+    stop = threading.Event()
+    latencies, errors, written = [], [0], [0]
+    lock = threading.Lock()
+
+    def writer():
+        n = 0
+        session = Session()
+        while not stop.is_set():
+            rows = [{"id": f"w-{n}-{k}", "mp_id": f"MP_WXS_{k % 50}", "title": "t", "url": "u", "status": 1,
+                     "publish_time": 1800000000 + n, "content": "<p>" + "内容" * 500 + "</p>"} for k in range(20)]
+            try:
+                session.execute(Article.__table__.insert(), rows)
+                session.commit()
+                written[0] += len(rows)
+            except OperationalError:
+                session.rollback()
+                with lock:
+                    errors[0] += 1
+            n += 1
+        Session.remove()
+
+    def reader():
+        session = Session()
+        while not stop.is_set():
+            t = time.perf_counter()
+            try:
+                session.query(Article.id, Article.title).filter(Article.status == 1) \
+                    .order_by(Article.publish_time.desc()).limit(20).all()
+                session.query(Article).filter(Article.mp_id == "MP_WXS_3").count()
+                with lock:
+                    latencies.append(time.perf_counter() - t)
+            except OperationalError:
+                session.rollback()
+                with lock:
+                    errors[0] += 1
+        Session.remove()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    print(f"{name:<10} reads={len(latencies)} p50={percentile(latencies, 0.5)*1000:.2f}ms "
+          f"p99={percentile(latencies, 0.99)*1000:.2f}ms written={written[0]} locked={errors[0]}")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    tmp = tempfile.mkdtemp()
+
+    # 旧配置：默认journal模式，无PRAGMA
+    legacy = create_engine(f"sqlite:///{tmp}/legacy.db", isolation_level="AUTOCOMMIT",
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(legacy)
+    LegacySession = scoped_session(sessionmaker(bind=legacy))
+    seed(LegacySession())
+    LegacySession.remove()
+
+    db = Db(tag="bench", con_str=f"sqlite:///{tmp}/tuned.db")
+    Base.metadata.create_all(db.engine)
+    seed(db.get_session())
+    db.Session.remove()
+
+    run("legacy", LegacySession, seconds, readers)
+    run("profile", db.Session, seconds, readers)
+
+
+if __name__ == "__main__":
+    main()
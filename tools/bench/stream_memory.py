@@ -0,0 +1,119 @@
+"""
+大表扫描内存测试
+
+在合成数据库（默认50万篇文章）上对比全量读取文章的几种方式的峰值内存（tracemalloc）和耗时：
+    .all() 一次性读取 / OFFSET 翻页 / core.db.stream_batches 流式分批，
+以及重复文章清理的旧写法（读取全部重复标题的文章对象）与流式扫描。
+流式方式的峰值内存只与批大小相关，不随文章数增长。
+
+用法（在项目根目录执行）:
+    python tools/bench/stream_memory.py [文章数] [批大小]
+"""
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import func, select
+from core.db import Db, stream_batches
+from core.models import Article, Feed
+from core.models.base import Base
+
+
+def seed(session, n, feeds=200):
+    session.execute(Feed.__table__.insert(), [{"id": f"MP_WXS_{i}", "mp_name": f"feed{i}", "status": 1}
+                                              for i in range(feeds)])
+    # 每10篇中有1篇是前一篇的重复（同一公众号、同一标题）
+    for start in range(0, n, 10000):
+        session.execute(Article.__table__.insert(), [
+            {"id": f"a-{i}", "mp_id": f"MP_WXS_{(i - 1 if i % 10 == 5 else i) % feeds}",
+             "title": f"标题{i - 1 if i % 10 == 5 else i}",
+             "description": "摘要" * 60, "url": f"https://mp.weixin.qq.com/s/{i:012d}", "status": 1,
+             "publish_time": 1600000000 + i * 30} for i in range(start, min(n, start + 10000))])
+    session.commit()
+
+
+def measure(name, fn):
+    gc.collect()
+    tracemalloc.start()
+    t = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<20} 行数={count:<8} 峰值内存={peak / 1048576:8.1f}MB 耗时={elapsed:6.2f}s")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    db = Db(tag="bench", con_str=f"sqlite:///{tempfile.mkdtemp()}/stream.db")
+    Base.metadata.create_all(db.engine)
+    session = db.get_session()
+    t = time.perf_counter()
+    seed(session, n)
+    print(f"生成 {n} 篇文章耗时 {time.perf_counter() - t:.1f}s，批大小 {batch}")
+
+    def query():
+        return session.query(Article).options(Article.lite()).filter(Article.status == 1) \
+            .order_by(Article.publish_time.desc(), Article.id.desc())
+
+    def read_all():
+        count = len(query().all())
+        session.expunge_all()
+        return count
+
+    def read_offset():
+        count = page = 0
+        while True:
+            rows = query().offset(page * batch).limit(batch).all()
+            if not rows:
+                return count
+            count += len(rows)
+            page += 1
+
+    def read_stream():
+        return sum(len(rows) for rows in stream_batches(query(), batch))
+
+    def read_stream_core():
+        a = Article.__table__
+        with db.engine.connect() as conn:
+            return sum(len(rows) for rows in stream_batches(select(a.c.id, a.c.title), batch, conn=conn))
+
+    measure("all()", read_all)
+    if n <= 100000 or "--offset" in sys.argv:
+        measure("OFFSET翻页", read_offset)
+    else:
+        print("OFFSET翻页           跳过（耗时随页数平方增长，加 --offset 执行）")
+    measure("stream_batches", read_stream)
+    measure("stream_batches(Core)", read_stream_core)
+
+    titles = select(Article.title).group_by(Article.title).having(func.count(Article.id) > 1)
+
+    def clean_all():
+        titles_list = [row[0] for row in session.execute(titles)]
+        count = len(session.query(Article).filter(Article.title.in_(titles_list)).options(Article.brief()).all())
+        session.expunge_all()
+        return count
+
+    def clean_stream():
+        duplicates, last_key = [], None
+        q = session.query(Article.id, Article.title, Article.mp_id).filter(Article.title.in_(titles)) \
+            .order_by(Article.title, Article.mp_id, Article.created_at, Article.id)
+        for rows in stream_batches(q, batch):
+            for article_id, title, mp_id in rows:
+                if (title, mp_id) == last_key:
+                    duplicates.append(article_id)
+                last_key = (title, mp_id)
+        return len(duplicates)
+
+    measure("去重(读取全部)", clean_all)
+    measure("去重(流式扫描)", clean_stream)
+
+
+if __name__ == "__main__":
+    main()
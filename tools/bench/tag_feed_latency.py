@@ -0,0 +1,109 @@
+"""
+标签文章分页延迟测试
+
+对比按标签筛选文章的几种写法（解析 mps_id JSON 后 IN 列表 / JOIN tag_feeds / EXISTS tag_feeds /
+tag_feeds 读出的 IN 列表 / TAG_FEEDS.article_filter 按占比自动选择），以单个公众号的分页为基准，
+统计第一页和深分页的 p50/p99 延迟，并输出查询计划。
+标签内公众号数较少（如5）和较多（如300）时分别执行一次。
+
+用法（在项目根目录执行）:
+    python tools/bench/tag_feed_latency.py [文章数] [公众号数] [标签内公众号数]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import and_, exists
+from core.db import Db
+from core.feed_stats import FeedStatsStore
+from core.models import Article, Feed, TagFeed
+from core.models.base import Base
+from core.models.tags import Tags
+from core.tag_feeds import TAG_FEEDS, parse_mps_id
+
+PAGE = 20
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+def seed(session, n, feeds, members):
+    rnd = random.Random(3)
+    session.execute(Feed.__table__.insert(), [{"id": f"MP_WXS_{i}", "mp_name": f"feed{i}", "status": 1}
+                                              for i in range(feeds)])
+    mps = [{"id": f"MP_WXS_{i}", "mp_name": f"feed{i}"} for i in rnd.sample(range(feeds), members)]
+    session.add(Tags(id="tag", name="tag", status=1, mps_id=json.dumps(mps)))
+    session.flush()
+    for start in range(0, n, 5000):
+        session.execute(Article.__table__.insert(), [
+            {"id": f"a-{i}", "mp_id": f"MP_WXS_{rnd.randrange(feeds)}", "title": f"t{i}", "status": 1 if i % 50 else 1000,
+             "publish_time": 1600000000 + i * 30} for i in range(start, min(n, start + 5000))])
+    session.commit()
+    session.connection().exec_driver_sql("ANALYZE")
+    session.commit()
+
+
+def variants(session):
+    def json_in(q):
+        mps_json = session.query(Tags.mps_id).filter(Tags.id == "tag").scalar()
+        return q.filter(Article.mp_id.in_(parse_mps_id(mps_json)))
+
+    def join(q):
+        return q.join(TagFeed, and_(TagFeed.feed_id == Article.mp_id, TagFeed.tag_id == "tag"))
+
+    def exists_(q):
+        return q.filter(exists().where(TagFeed.tag_id == "tag", TagFeed.feed_id == Article.mp_id))
+
+    def ids_in(q):
+        return q.filter(Article.mp_id.in_(TAG_FEEDS.feed_ids(session, "tag")))
+
+    def auto(q):
+        return q.filter(TAG_FEEDS.article_filter(session, "tag"))
+
+    def single(q):
+        return q.filter(Article.mp_id == "MP_WXS_1")
+
+    return [("单个公众号", single), ("JSON IN列表", json_in), ("JOIN", join), ("EXISTS", exists_),
+            ("关联表IN列表", ids_in), ("自动选择", auto)]
+
+
+def page_query(session, apply, offset):
+    q = apply(session.query(Article.id, Article.title, Article.publish_time).filter(Article.status == 1))
+    return q.order_by(Article.publish_time.desc(), Article.id.desc()).offset(offset).limit(PAGE)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    feeds = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    members = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    db = Db(tag="bench", con_str=f"sqlite:///{tempfile.mkdtemp()}/tag.db")
+    Base.metadata.create_all(db.engine)
+    session = db.get_session()
+    t = time.perf_counter()
+    seed(session, n, feeds, members)
+    FeedStatsStore(db=db).rebuild()
+    print(f"生成 {n} 篇文章、{feeds} 个公众号（标签含 {members} 个）耗时 {time.perf_counter() - t:.1f}s")
+
+    for name, apply in variants(session):
+        for offset in (0, PAGE * 50):
+            latencies = []
+            for _ in range(30):
+                t = time.perf_counter()
+                page_query(session, apply, offset).all()
+                latencies.append(time.perf_counter() - t)
+            print(f"{name:<10} offset={offset:<5} p50={percentile(latencies, 0.5) * 1000:8.2f}ms "
+                  f"p99={percentile(latencies, 0.99) * 1000:8.2f}ms")
+        sql = str(page_query(session, apply, 0).statement.compile(compile_kwargs={"literal_binds": True}))
+        plan = session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql).all()
+        print("    " + " | ".join(row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    main()
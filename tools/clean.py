@@ -1,47 +1,41 @@
 from core.models.article import Article
-from sqlalchemy import func
+from sqlalchemy import func, select
 import core.db as db
 DB=db.Db(tag="文章清理")
-def clean_duplicate_articles():
+def clean_duplicate_articles(batch_size: int = 500):
     """
-    清理重复的文章
+    清理重复的文章（同一公众号下标题相同的文章，保留最早采集的一篇）
+    按标题、公众号顺序流式扫描，只记录待删除文章的id，再分批删除
     """
+    duplicates = []
     try:
         session = DB.get_session()
         
-        # 查询所有文章的标题，并统计重复的标题
-        duplicate_titles = session.query(
-            Article.title,
-            func.count(Article.id).label('count')
-        ).group_by(Article.title).having(func.count(Article.id) > 1).all()
+        # 标题重复的文章，按标题、公众号、采集时间排序，相邻且标题和公众号相同的即为重复
+        duplicate_titles = select(Article.title).group_by(Article.title).having(func.count(Article.id) > 1)
+        query = session.query(Article.id, Article.title, Article.mp_id).filter(
+            Article.title.in_(duplicate_titles)
+        ).order_by(Article.title, Article.mp_id, Article.created_at, Article.id)
         
-        # 如果没有重复的标题，直接返回
-        if not duplicate_titles:
-            return "没有找到重复的文章"
+        last_key = None
+        for rows in db.stream_batches(query, batch_size):
+            for article_id, title, mp_id in rows:
+                if (title, mp_id) == last_key:
+                    duplicates.append(article_id)
+                last_key = (title, mp_id)
         
-        # 获取所有重复的标题列表
-        titles = [item[0] for item in duplicate_titles]
+        # 如果没有重复的文章，直接返回
+        if not duplicates:
+            return ("没有找到重复的文章", 0)
         
-        # 查询这些标题对应的所有文章
-        articles = session.query(Article).filter(Article.title.in_(titles)).all()
-        
-        # 用于存储已检查的文章标题和mp_id组合
-        seen_articles = set()
-        duplicates = []
-        
-        # 检查重复文章
-        for article in articles:
-            article_key = (article.title, article.mp_id)
-            if article_key in seen_articles:
-                duplicates.append(article)
-            else:
-                seen_articles.add(article_key)
-        
-        # 删除重复文章
-        for duplicate in duplicates:
-            print(f"删除重复文章: {duplicate.title}")
-            session.delete(duplicate)
-        session.commit()
+        # 分批删除重复文章（逐个 delete 以触发统计、正文等映射事件）
+        for i in range(0, len(duplicates), batch_size):
+            articles = session.query(Article).options(Article.brief()).filter(
+                Article.id.in_(duplicates[i:i + batch_size])).all()
+            for duplicate in articles:
+                print(f"删除重复文章: {duplicate.title}")
+                session.delete(duplicate)
+            session.commit()
     except:
         session.rollback()
     return (f"已清理 {len(duplicates)} 篇重复文章", len(duplicates))
@@ -0,0 +1,52 @@
+"""
+公众号统计重建
+
+按文章表重新统计 feed_stats（文章数、有效文章数、最新发布时间、最近采集时间），
+用于修复直接改库或批量语句造成的统计偏差，可重复执行。
+
+用法（在项目根目录执行）:
+    python tools/feed_stats_rebuild.py [--check]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.db import DB
+from core.feed_stats import FEED_STATS, EMPTY
+from core.print import print_info, print_success, print_warning
+
+
+def check() -> int:
+    """对比统计表与文章表，返回有偏差的公众号数"""
+    session = DB.get_session()
+    conn = session.connection()
+    actual = FEED_STATS.aggregate(conn)
+    stored = {row.mp_id: dict(row._mapping) for row in conn.execute(FEED_STATS.table.select())}
+    drift = 0
+    for mp_id in set(actual) | set(stored):
+        want, have = actual.get(mp_id, EMPTY), stored.get(mp_id, EMPTY)
+        diff = {k: (have.get(k), want.get(k)) for k in ("article_count", "active_count", "content_count", "latest_publish_time")
+                if (have.get(k) or 0) != (want.get(k) or 0)}
+        if diff:
+            drift += 1
+            print_warning(f"{mp_id}: " + ", ".join(f"{k} {a} -> {b}" for k, (a, b) in diff.items()))
+    return drift
+
+
+def main():
+    parser = argparse.ArgumentParser(description="公众号统计重建")
+    parser.add_argument("--check", action="store_true", help="只检查偏差，不重建")
+    args, _ = parser.parse_known_args()
+
+    if args.check:
+        drift = check()
+        print_info(f"有偏差的公众号: {drift}")
+        sys.exit(1 if drift else 0)
+    total = FEED_STATS.rebuild()
+    print_success(f"公众号统计重建完成，共 {total} 个公众号")
+
+
+if __name__ == "__main__":
+    main()
@@ -108,37 +108,29 @@ def process_articles(session, mp_id=None,doc_id=None, page_size=10, page_count=1
     处理文章数据的核心函数
     返回处理的文章数量
     """
+    from core.content_store import load_bodies
+    from core.db import stream_batches
     record_count = 0
-    i = 0
-    is_break=False
-    while True:
-        if is_break:
-            break
-        if page_count != 0 and i >= page_count:
-            break
-            
-        query = session.query(Article).filter(Article.content != None).where(Article.status == 1)
-        if mp_id:
-            query = query.where(Article.mp_id.in_(mp_id.split(",")))
-        if doc_id:
-            query = query.where(Article.id.in_(doc_id))
-            is_break=True   
+    query = session.query(Article).options(Article.lite()).filter(~Article.content_missing()).where(Article.status == 1)
+    if mp_id:
+        query = query.where(Article.mp_id.in_(mp_id.split(",")))
+    if doc_id:
+        query = query.where(Article.id.in_(doc_id))
+    query = query.order_by(Article.publish_time.desc(), Article.id.desc())
+    # 按 page_size * page_count 限制导出数量，page_count 为 0 或指定文档时导出全部
+    if not doc_id and page_count != 0:
+        query = query.limit(page_size * page_count)
+
+    # 流式读取文章，不再用 OFFSET 翻页；正文在另一个连接上按批加载，不占用读取文章的游标
+    with DB.get_engine().connect() as conn:
+        for arts in stream_batches(query, batch_size=max(page_size, 100)):
+            load_bodies(arts, conn=conn)
+            for art in arts:
+                if process_single_article(art, add_title, remove_images, remove_links,
+                                        export_md, export_docx, export_json, export_csv,
+                                        export_pdf, docx_path, writer):
+                    record_count += 1
 
-        query = query.order_by(Article.publish_time.desc(), Article.id.desc())
-        if is_break==False:
-            query=query.offset(i * page_size).limit(page_size)
-        i = i + 1
-        arts = query.all()
-        
-        if arts is None or len(arts) == 0:
-            break
-            
-        for art in arts:
-            if process_single_article(art, add_title, remove_images, remove_links, 
-                                    export_md, export_docx, export_json, export_csv, 
-                                    export_pdf, docx_path, writer):
-                record_count += 1
-    
     return record_count
 
 def export_md_to_doc(mp_id:str=None,doc_id:list=None,page_size:int=10,page_count:int=1,add_title=True,remove_images:bool=True,remove_links:bool=False
@@ -0,0 +1,34 @@
+"""
+全文索引回填
+
+为已有文章建立全文索引，按文章id分批处理，每批完成后记录进度，中断后再次执行从上次的进度继续。
+
+用法（在项目根目录执行）:
+    python tools/search_backfill.py [--rebuild] [--batch 1000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.print import print_info, print_success
+from core.search import SEARCH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="全文索引回填")
+    parser.add_argument("--rebuild", action="store_true", help="删除现有索引后完整重建")
+    parser.add_argument("--batch", type=int, default=1000, help="每批处理的文章数")
+    args, _ = parser.parse_known_args()
+
+    def progress(done, elapsed):
+        if done % (args.batch * 10) == 0:
+            print_info(f"已索引 {done} 篇，耗时 {elapsed:.1f}s，{done / max(elapsed, 1e-6):.0f} 篇/秒")
+
+    total = SEARCH.backfill(batch_size=args.batch, rebuild=args.rebuild, progress=progress)
+    print_success(f"全文索引回填完成，共 {total} 篇文章")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ from core.models.article import Article
 from core.models.feed import Feed
 from core.models.tags import Tags
 from apis.base import format_search_kw
+from core.content_store import load_bodies
 from core.lax.template_parser import TemplateParser
 from views.config import base
 from driver.wxarticle import Web
@@ -50,7 +51,8 @@ async def article_detail_view(
             Article.mp_id == article.mp_id,
             Article.id != article_id,
             Article.status == 1
-        ).order_by(Article.publish_time.desc()).limit(5).all()
+        ).options(Article.lite()).order_by(Article.publish_time.desc()).limit(5).all()
+        load_bodies([article] + [rel for rel in related_articles if not rel.description])
         
         # 获取上一个和下一个文章ID
         prev_article = session.query(Article.id,Article.title).filter(
@@ -5,16 +5,20 @@ import os
 from datetime import datetime
 import re
 import json
-from views.base import _render_template_with_error
+from starlette.concurrency import run_in_threadpool
+from views.base import _render_template_with_error, render_page
 from core.db import DB
+from core.async_db import ADB
+from core.content_store import load_bodies
 from core.models.article import Article
 from core.models.feed import Feed
 from core.models.tags import Tags
-from apis.base import format_search_kw
+from core.tag_feeds import TAG_FEEDS
+from apis.base import format_search_kw, order_by_relevance, keyset_paginate, next_cursor
 from core.lax.template_parser import TemplateParser
 from views.config import base
 from driver.wxarticle import Web
-from core.cache import cache_view, clear_cache_pattern, data_cache
+from core.cache import cache_view, clear_cache_pattern, data_cache, count_cache
 
 
 
@@ -30,16 +34,18 @@ async def articles_view(
     mp_id: Optional[str] = Query(None, description="公众号ID筛选"),
     tag_id: Optional[str] = Query(None, description="标签ID筛选"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
-    sort: str = Query("publish_time", description="排序方式: publish_time, created_at"),
-    order: str = Query("desc", description="排序顺序: asc, desc")
+    sort: str = Query("publish_time", description="排序方式: publish_time, created_at, relevance（仅搜索时有效）"),
+    order: str = Query("desc", description="排序顺序: asc, desc"),
+    cursor: Optional[str] = Query(None, description="分页游标，按发布时间排序时可用")
 ):
     """
     文章列表页面，支持筛选、搜索和排序
     """
-    session = DB.get_session()
-    try:
+    def _load(session):
+        """查询页面数据，返回模板上下文"""
+        nonlocal cursor, order, sort
         # 验证排序参数
-        valid_sort_fields = {"publish_time", "created_at"}
+        valid_sort_fields = {"publish_time", "created_at", "relevance"}
         valid_orders = {"asc", "desc"}
         
         if sort not in valid_sort_fields:
@@ -49,46 +55,55 @@ async def articles_view(
         
         # 预处理标签筛选的mp_ids
         mps_ids = []
-        if tag_id:
-            tag = session.query(Tags.mps_id).filter(Tags.id == tag_id, Tags.status == 1).scalar()
-            if tag:
-                try:
-                    mps_data = json.loads(tag)
-                    mps_ids = [str(mp['id']) for mp in mps_data] if isinstance(mps_data, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    mps_ids = []
+        tag_filter = None
+        if tag_id and session.query(Tags.id).filter(Tags.id == tag_id, Tags.status == 1).scalar():
+            mps_ids = TAG_FEEDS.feed_ids(session, tag_id)
+            tag_filter = TAG_FEEDS.article_filter(session, tag_id, mps_ids)
         
         # 构建基础查询条件
         base_conditions = [Article.status == 1]
         if mp_id:
             base_conditions.append(Article.mp_id == mp_id)
-        if mps_ids:
-            base_conditions.append(Article.mp_id.in_(mps_ids))
+        if tag_filter is not None:
+            base_conditions.append(tag_filter)
         if keyword and keyword.strip():
             search_filter = format_search_kw(keyword.strip())
             if search_filter is not None:
                 base_conditions.append(search_filter)
         
         # 使用单一查询获取文章和Feed信息
-        from sqlalchemy import and_
-        
-        # 构建排序
-        if sort == "publish_time":
-            order_clause = Article.publish_time.desc() if order == "desc" else Article.publish_time.asc()
-        else:  # created_at
-            order_clause = Article.created_at.desc() if order == "desc" else Article.created_at.asc()
+        from sqlalchemy import and_, func
         
         # 主查询：一次性获取文章和Feed信息
         query = session.query(Article, Feed).join(
             Feed, Article.mp_id == Feed.id, isouter=True
-        ).filter(and_(*base_conditions)).order_by(order_clause)
-        
-        # 获取总数
-        total = query.count()
+        ).filter(and_(*base_conditions)).options(Article.lite())
+        
+        # 获取总数（带缓存）
+        total = count_cache.get_or_count("articles", {"status": 1, "mp_id": mp_id, "mps_ids": mps_ids, "keyword": keyword},
+                                         session.query(func.count(Article.id)).filter(and_(*base_conditions)).scalar,
+                                         mp_ids=([mp_id] if mp_id else []) + mps_ids or None)
+        
+        # 构建排序，按发布时间排序时支持游标分页；按相关度排序仅在搜索且已建立全文索引时生效
+        ranked = None
+        if sort == "relevance" and keyword and keyword.strip():
+            ranked = order_by_relevance(query, keyword.strip())
+        if ranked is not None:
+            cursor = None
+            query = ranked
+        elif sort == "created_at":
+            cursor = None
+            query = query.order_by(Article.created_at.desc() if order == "desc" else Article.created_at.asc())
+        else:
+            sort = "publish_time"
+            query = keyset_paginate(query, cursor, desc=(order == "desc"))
         
         # 分页查询
-        offset = (page - 1) * limit
-        articles_data = query.offset(offset).limit(limit).all()
+        if not cursor:
+            query = query.offset((page - 1) * limit)
+        articles_data = query.limit(limit).all()
+        # 没有摘要的文章需要从正文生成，一次性加载这些文章的正文
+        load_bodies([article for article, _ in articles_data if not article.description])
         
         # 处理文章数据
         article_list = []
@@ -139,21 +154,8 @@ async def articles_view(
         cache_key_popular = "popular_mps_top10"
         mp_options = data_cache.get(cache_key_popular)
         if mp_options is None:
-            from sqlalchemy import func
-            
-            popular_mps = session.query(
-                Feed.id, Feed.mp_name,
-                func.count(Article.id).label('article_count')
-            ).join(
-                Article, Feed.id == Article.mp_id
-            ).filter(
-                Article.status == 1,
-                Feed.status == 1
-            ).group_by(
-                Feed.id, Feed.mp_name
-            ).order_by(
-                func.count(Article.id).desc()
-            ).limit(10).all()
+            from core.feed_stats import FEED_STATS
+            popular_mps = FEED_STATS.popular(session, limit=10)
             
             mp_options = [{"id": str(row[0]), "name": row[1]} for row in popular_mps]
             data_cache.set(cache_key_popular, mp_options)  # 使用默认TTL（1小时）
@@ -168,11 +170,6 @@ async def articles_view(
         # 构建面包屑
         breadcrumb = [{"name": "文章列表", "url": "/views/articles"}]
         
-        # 读取模板文件
-        template_path = base.articles_template
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
         feed_info = feed_dict.get(mp_id) if mp_id else None
         info = {
             "mp_name": feed_info.mp_name if feed_info else "",
@@ -181,8 +178,7 @@ async def articles_view(
             "mp_id": mp_id,
         } if feed_info else {}
         
-        parser = TemplateParser(template_content, template_dir=base.public_dir)
-        html_content = parser.render({
+        return {
             "site": base.site,
             "articles": article_list,
             "current_page": page,
@@ -193,6 +189,7 @@ async def articles_view(
             "has_next": has_next,
             "prev_page": prev_page,
             "next_page": next_page,
+            "next_cursor": next_cursor([article for article, _ in articles_data], limit) if sort == "publish_time" else None,
             "base_url": "/views/articles?mp_id={mp_id}&tag_id={tag_id}",
             "filter_info": filter_info,
             "tag_options": tag_options,
@@ -206,10 +203,11 @@ async def articles_view(
                 "order": order
             },
             "breadcrumb": breadcrumb
-        })
-        
-        return HTMLResponse(content=html_content)
-        
+        }
+
+    try:
+        # 在异步会话上执行查询，模板在线程池中渲染，都不阻塞事件循环
+        return await run_in_threadpool(render_page, base.articles_template, await ADB.run_sync(_load))
     except Exception as e:
         print(f"获取文章列表错误: {str(e)}")
         return _render_template_with_error(
@@ -217,5 +215,3 @@ async def articles_view(
             f"加载数据时出现错误: {str(e)}",
             [{"name": "文章列表", "url": "/views/articles"}]
         )
-    finally:
-        session.close()
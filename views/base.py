@@ -1,6 +1,7 @@
 from math import e
 from fastapi import APIRouter, Request, Depends, Query, HTTPException
 from core.lax.template_parser import TemplateParser
+from views.config import base
 from fastapi.responses import HTMLResponse
 from core.db import DB
 from core.models.feed import Feed
@@ -8,13 +9,16 @@ from core.models.article import Article
 from driver.wxarticle import Web
 from datetime import datetime
 from core.models.tags import Tags
+from core.feed_stats import FEED_STATS
+from core.tag_feeds import TAG_FEEDS
 import json
 #获取公众号视图数据
 def get_mps_view(
     page: int ,
-    limit: int 
+    limit: int ,
+    session=None
 ): 
-    session = DB.get_session()
+    session = session or DB.get_read_session()
     data={}
     try:
         # 查询标签总数
@@ -26,17 +30,17 @@ def get_mps_view(
         # 查询公众号列表
         feeds = session.query(Feed).filter(Feed.status == 1).order_by(Feed.created_at.desc()).offset(offset).limit(limit).all()
         
+        # 一次读取本页公众号的文章统计
+        stats = FEED_STATS.get_many(session, [feed.id for feed in feeds])
+        
         # 处理公众号数据
         feed_list = []
         for feed in feeds:
             # 对于 Feed 表，id 就是公众号的 ID
             mp_id = feed.id
             
-            # 统计该公众号的文章数量
-            article_count = session.query(Article).filter(
-                Article.mp_id == mp_id,
-                Article.status == 1
-            ).count()
+            # 该公众号的有效文章数量
+            article_count = stats[mp_id]["active_count"]
             
             feed_data = {
                 "id": feed.id,
@@ -81,12 +85,13 @@ def get_mps_view(
 #显示所有标签，支持分页
 def get_tags_view(
     page: int ,
-    limit: int 
+    limit: int ,
+    session=None
 ):
     """
     显示所有标签，支持分页
     """
-    session = DB.get_session()
+    session = session or DB.get_read_session()
     data={}
     try:
         # 查询标签总数
@@ -98,25 +103,18 @@ def get_tags_view(
         # 查询标签列表
         tags = session.query(Tags).filter(Tags.status == 1).order_by(Tags.created_at.desc()).offset(offset).limit(limit).all()
         
+        # 一次读取本页标签关联的公众号
+        members = TAG_FEEDS.feed_map(session, [tag.id for tag in tags])
+        
         # 处理标签数据
         tag_list = []
         for tag in tags:
-            # 解析mps_id JSON
-            mps_ids = []
-            if tag.mps_id:
-                try:
-                    mps_data = json.loads(tag.mps_id)
-                    mps_ids = [str(mp['id']) for mp in mps_data] if isinstance(mps_data, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    mps_ids = []
+            mps_ids = members[tag.id]
             
             # 统计文章数量
             article_count = 0
             if mps_ids:
-                article_count = session.query(Article).filter(
-                    Article.mp_id.in_(mps_ids),
-                    Article.status == 1
-                ).count()
+                article_count = FEED_STATS.active_count(session, mps_ids)
             
             # 获取关联的公众号数量
             mp_count = len(mps_ids) if mps_ids else 0
@@ -160,6 +158,13 @@ def get_tags_view(
         session.close()
     return data
 
+def render_page(template_path: str, context: dict) -> HTMLResponse:
+    """读取模板并渲染页面；在异步接口中通过 run_in_threadpool 调用，渲染不占用事件循环"""
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template_content = f.read()
+    parser = TemplateParser(template_content, template_dir=base.public_dir)
+    return HTMLResponse(content=parser.render(context))
+
 def _render_template_with_error(template_path: str, error_msg: str, breadcrumb: list) -> HTMLResponse:
     """渲染错误页面的辅助函数"""
     try:
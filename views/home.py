@@ -5,6 +5,7 @@ from apis.tags import get_tags
 from core.lax.template_parser import TemplateParser
 from views.config import base
 from core.cache import cache_view, clear_cache_pattern
+from core.async_db import ADB
 from views.base import get_tags_view,get_mps_view
 # 创建路由器
 router = APIRouter(tags=["首页"])
@@ -20,7 +21,9 @@ async def home_view(
     首页显示所有标签，支持分页
     """
     try:
-        data={"site": base.site,"tags":get_tags_view(page, limit),"mps":get_mps_view(page, limit)}
+        data={"site": base.site,
+              "tags":await ADB.run_sync(lambda session: get_tags_view(page, limit, session=session)),
+              "mps":await ADB.run_sync(lambda session: get_mps_view(page, limit, session=session))}
         # 读取模板文件
         template_path = base.home_template
         with open(template_path, 'r', encoding='utf-8') as f:
@@ -6,6 +6,7 @@ from core.db import DB
 from core.lax.template_parser import TemplateParser
 from views.config import base
 from core.cache import cache_view, clear_cache_pattern
+from core.async_db import ADB
 from views.base import get_mps_view
 # 创建路由器
 router = APIRouter(tags=["公众号"])
@@ -21,7 +22,7 @@ async def mps_view(
     首页显示所有公众号，支持分页
     """
     try:
-        data=get_mps_view(page, limit)
+        data=await ADB.run_sync(lambda session: get_mps_view(page, limit, session=session))
         # 读取模板文件
         template_path = base.mps_template
         with open(template_path, 'r', encoding='utf-8') as f:
@@ -3,16 +3,23 @@ from fastapi.responses import HTMLResponse
 from typing import Optional
 import os
 import json
+from sqlalchemy import false, func
 from datetime import datetime
 
 from core.db import DB
+from core.async_db import ADB
+from core.content_store import load_bodies
 from core.models.tags import Tags
 from core.models.feed import Feed
 from core.models.article import Article
 from core.lax.template_parser import TemplateParser
 from views.config import base
 from driver.wxarticle import Web
-from core.cache import cache_view, clear_cache_pattern
+from core.cache import cache_view, clear_cache_pattern, count_cache
+from core.feed_stats import FEED_STATS
+from core.tag_feeds import TAG_FEEDS
+from starlette.concurrency import run_in_threadpool
+from views.base import render_page
 # 创建路由器
 router = APIRouter(tags=["标签"])
 
@@ -26,8 +33,8 @@ async def tags_view(
     """
     首页显示所有标签，支持分页
     """
-    session = DB.get_session()
-    try:
+    def _load(session):
+        """查询页面数据，返回模板上下文"""
         # 查询标签总数
         total = session.query(Tags).filter(Tags.status == 1).count()
         
@@ -37,25 +44,18 @@ async def tags_view(
         # 查询标签列表
         tags = session.query(Tags).filter(Tags.status == 1).order_by(Tags.created_at.desc()).offset(offset).limit(limit).all()
         
+        # 一次读取本页标签关联的公众号
+        members = TAG_FEEDS.feed_map(session, [tag.id for tag in tags])
+        
         # 处理标签数据
         tag_list = []
         for tag in tags:
-            # 解析mps_id JSON
-            mps_ids = []
-            if tag.mps_id:
-                try:
-                    mps_data = json.loads(tag.mps_id)
-                    mps_ids = [str(mp['id']) for mp in mps_data] if isinstance(mps_data, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    mps_ids = []
+            mps_ids = members[tag.id]
             
             # 统计文章数量
             article_count = 0
             if mps_ids:
-                article_count = session.query(Article).filter(
-                    Article.mp_id.in_(mps_ids),
-                    Article.status == 1
-                ).count()
+                article_count = FEED_STATS.active_count(session, mps_ids)
             
             # 获取关联的公众号数量
             mp_count = len(mps_ids) if mps_ids else 0
@@ -82,14 +82,7 @@ async def tags_view(
             {"name": "标签", "url": "/views/tags"}
         ]
         
-        # 读取模板文件
-        template_path = base.tags_template
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        # 使用模板引擎渲染
-        parser = TemplateParser(template_content, template_dir=base.public_dir)
-        render_context = {
+        return {
             "site": base.site,
             "tags": tag_list,
             "current_page": page,
@@ -104,10 +97,10 @@ async def tags_view(
             "base_url": "/views/tags",
             "item_name": "个标签"
         }
-        html_content = parser.render(render_context)
-        
-        return HTMLResponse(content=html_content)
-        
+
+    try:
+        # 在异步会话上执行查询，模板在线程池中渲染，都不阻塞事件循环
+        return await run_in_threadpool(render_page, base.tags_template, await ADB.run_sync(_load))
     except Exception as e:
         print(f"获取首页数据错误: {str(e)}")
         # 读取模板文件
@@ -123,8 +116,6 @@ async def tags_view(
         })
         
         return HTMLResponse(content=html_content)
-    finally:
-        session.close()
 
 
 @router.get("/tag/{tag_id}", response_class=HTMLResponse, summary="标签详情页")
@@ -138,21 +129,15 @@ async def tag_detail_view(
     """
     显示标签详情和关联的文章列表
     """
-    session = DB.get_session()
-    try:
+    def _load(session):
+        """查询页面数据，返回模板上下文"""
         # 查询标签信息
         tag = session.query(Tags).filter(Tags.id == tag_id, Tags.status == 1).first()
         if not tag:
             raise HTTPException(status_code=404, detail="标签不存在")
         
-        # 解析mps_id JSON
-        mps_ids = []
-        if tag.mps_id:
-            try:
-                mps_data = json.loads(tag.mps_id)
-                mps_ids = [str(mp['id']) for mp in mps_data] if isinstance(mps_data, list) else []
-            except (json.JSONDecodeError, TypeError):
-                mps_ids = []
+        # 标签关联的公众号
+        mps_ids = TAG_FEEDS.feed_ids(session, tag_id)
         
         # 获取关联的公众号信息
         mps_info = []
@@ -161,7 +146,7 @@ async def tag_detail_view(
         
         # 构建基础查询条件
         base_conditions = [
-            Article.mp_id.in_(mps_ids),
+            TAG_FEEDS.article_filter(session, tag_id, mps_ids) if mps_ids else false(),
             Article.status == 1
         ]
         
@@ -172,8 +157,11 @@ async def tag_detail_view(
         
         # 查询文章总数
         total = 0
-        if mps_ids:
-            total = session.query(Article).filter(*base_conditions).count()
+        if mps_ids and not (keyword and keyword.strip()):
+            total = FEED_STATS.active_count(session, mps_ids)
+        elif mps_ids:
+            total = count_cache.get_or_count("articles", {"status": 1, "mps_ids": mps_ids, "keyword": keyword},
+                                             session.query(func.count(Article.id)).filter(*base_conditions).scalar, mp_ids=mps_ids)
         
         # 计算偏移量
         offset = (page - 1) * limit
@@ -183,7 +171,9 @@ async def tag_detail_view(
         if mps_ids:
             articles_query = session.query(Article, Feed).join(
                 Feed, Article.mp_id == Feed.id
-            ).filter(*base_conditions).order_by(Article.publish_time.desc()).offset(offset).limit(limit).all()
+            ).filter(*base_conditions).options(Article.lite()).order_by(Article.publish_time.desc()).offset(offset).limit(limit).all()
+            # 没有摘要的文章需要从正文生成，一次性加载这些文章的正文
+            load_bodies([article for article, _ in articles_query if not article.description])
             
             for article, feed in articles_query:
                 article_data = {
@@ -221,13 +211,7 @@ async def tag_detail_view(
             {"name": tag.name, "url": None}
         ]
         
-        # 读取模板文件
-        template_path = base.tags_articles_template
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        parser = TemplateParser(template_content, template_dir=base.public_dir)
-        html_content = parser.render({
+        return {
             "site": base.site,
             "tag": tag_data,
             "articles": articles,
@@ -243,10 +227,11 @@ async def tag_detail_view(
             "keyword": keyword,
             "prev_page": page - 1,
             "next_page": page + 1
-        })
-        
-        return HTMLResponse(content=html_content)
-        
+        }
+
+    try:
+        # 在异步会话上执行查询，模板在线程池中渲染，都不阻塞事件循环
+        return await run_in_threadpool(render_page, base.tags_articles_template, await ADB.run_sync(_load))
     except HTTPException:
         raise
     except Exception as e:
@@ -263,6 +248,4 @@ async def tag_detail_view(
             "breadcrumb": [{"name": "首页", "url": "/views/home"}]
         })
         
-        return HTMLResponse(content=html_content)
-    finally:
-        session.close()
\ No newline at end of file
+        return HTMLResponse(content=html_content)
\ No newline at end of file
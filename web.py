@@ -25,6 +25,7 @@ import apis
 import os
 from core.config import cfg,VERSION,API_BASE
 from starlette.middleware.base import BaseHTTPMiddleware
+from contextlib import asynccontextmanager
 
 class AKMiddleware(BaseHTTPMiddleware):
     """Access Key 认证中间件"""
@@ -37,7 +38,15 @@ class AKMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         return response
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 关闭异步引擎：aiosqlite 的连接线程不是守护线程，不关闭进程无法退出
+    from core.async_db import ADB
+    await ADB.dispose()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="WeRSS API",
     description="微信公众号RSS生成服务API文档",
     version="1.0.0",
@@ -69,6 +78,18 @@ app.add_middleware(
 # AK认证中间件
 app.add_middleware(AKMiddleware)
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """读己之写：请求在主库写入后用 Cookie/响应头返回写入时间，客户端随后的请求在 sticky 时间内读取主库"""
+    from core.db import DB, WRITE_COOKIE, WRITE_HEADER, begin_client_writes, sticky_seconds
+    writes = begin_client_writes(request.headers.get(WRITE_HEADER) or request.cookies.get(WRITE_COOKIE))
+    response = await call_next(request)
+    if writes.wrote and DB.read_connection_str and DB.read_connection_str != DB.connection_str:
+        value = f"{writes.at:.3f}"
+        response.headers[WRITE_HEADER] = value
+        response.set_cookie(WRITE_COOKIE, value, max_age=int(sticky_seconds()) + 1, httponly=True, samesite="lax")
+    return response
+
 @app.middleware("http")
 async def add_custom_header(request: Request, call_next):
     response = await call_next(request)